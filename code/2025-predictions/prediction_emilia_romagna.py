@@ -1,74 +1,15 @@
-import fastf1
-import pandas as pd
-import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import GradientBoostingRegressor
-from sklearn.metrics import mean_absolute_error
+"""2025 Emilia Romagna GP prediction from 2024 race pace and 2025 qualifying."""
+import os
+import sys
 
-# Enable FastF1 caching
-fastf1.Cache.enable_cache("f1_cache")
+# Make the shared yuki package importable
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-# Load 2024 Emilia Romagna GP race session
-session_2024 = fastf1.get_session(2024, "Emilia Romagna", "R")
-session_2024.load()
+from yuki.cli import print_prediction
 
-# Extract lap and sector times
-laps_2024 = session_2024.laps[["Driver", "LapTime", "Sector1Time", "Sector2Time", "Sector3Time"]].copy()
-laps_2024.dropna(inplace=True)
+YEAR = 2025
+GRAND_PRIX = "Emilia Romagna"
+MODEL = "advanced"
 
-# Convert times to seconds
-for col in ["LapTime", "Sector1Time", "Sector2Time", "Sector3Time"]:
-    laps_2024[f"{col} (s)"] = laps_2024[col].dt.total_seconds()
-
-# Group by driver to get average sector times per driver
-sector_times_2024 = laps_2024.groupby("Driver")[["Sector1Time (s)", "Sector2Time (s)", "Sector3Time (s)"]].mean().reset_index()
-
-# 2025 Qualifying Data Emilia Romagna GP
-qualifying_2025 = pd.DataFrame({
-    "Driver": ["Oscar Piastri", "George Russell", "Lando Norris", "Max Verstappen", "Lewis Hamilton",
-               "Charles Leclerc", "Isack Hadjar", "Andrea Kimi Antonelli", "Yuki Tsunoda", "Alexander Albon",
-               "Esteban Ocon", "Nico Hülkenberg", "Fernando Alonso", "Lance Stroll", "Carlos Sainz Jr.",
-               "Pierre Gasly", "Oliver Bearman", "Jack Doohan", "Gabriel Bortoleto", "Liam Lawson"],
-    "QualifyingTime (s)": [75.641, 75.723, 75.793, 75.817, 75.927,
-                           76.021, 76.079, 76.103, 76.638, 76.706,
-                           76.625, 76.632, 76.688, 76.773, 76.840,
-                           76.992, 77.018, 77.092, 77.141, 77.174]
-})
-
-# Map full names to FastF1 3-letter codes
-driver_mapping = {
-    "Oscar Piastri": "PIA", "George Russell": "RUS", "Lando Norris": "NOR", "Max Verstappen": "VER",
-    "Lewis Hamilton": "HAM", "Charles Leclerc": "LEC", "Isack Hadjar": "HAD", "Andrea Kimi Antonelli": "ANT",
-    "Yuki Tsunoda": "TSU", "Alexander Albon": "ALB", "Esteban Ocon": "OCO", "Nico Hülkenberg": "HUL",
-    "Fernando Alonso": "ALO", "Lance Stroll": "STR", "Carlos Sainz Jr.": "SAI", "Pierre Gasly": "GAS",
-    "Oliver Bearman": "BEA", "Jack Doohan": "DOO", "Gabriel Bortoleto": "BOR", "Liam Lawson": "LAW"
-}
-
-qualifying_2025["DriverCode"] = qualifying_2025["Driver"].map(driver_mapping)
-
-# Merge qualifying data with sector times
-merged_data = qualifying_2025.merge(sector_times_2024, left_on="DriverCode", right_on="Driver", how="left")
-
-# Define feature set (Qualifying + Sector Times)
-X = merged_data[["QualifyingTime (s)", "Sector1Time (s)", "Sector2Time (s)", "Sector3Time (s)"]].fillna(0)
-y = laps_2024.groupby("Driver")["LapTime (s)"].mean().reset_index()["LapTime (s)"]
-
-# Train Gradient Boosting Model
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=38)
-model = GradientBoostingRegressor(n_estimators=200, learning_rate=0.1, random_state=38)
-model.fit(X_train, y_train)
-
-# Predict race times using 2025 qualifying and sector data
-predicted_race_times = model.predict(X)
-qualifying_2025["PredictedRaceTime (s)"] = predicted_race_times
-
-# Rank drivers by predicted race time
-qualifying_2025 = qualifying_2025.sort_values(by="PredictedRaceTime (s)")
-
-# Print final predictions
-print("\n🏁 Predicted 2025 Emilia Romagna GP Winner with New Drivers and Sector Times 🏁\n")
-print(qualifying_2025[["Driver", "PredictedRaceTime (s)"]])
-
-# Evaluate Model
-y_pred = model.predict(X_test)
-print(f"\n🔍 Model Error (MAE): {mean_absolute_error(y_test, y_pred):.2f} seconds")
+if __name__ == "__main__":
+    print_prediction(YEAR, GRAND_PRIX, MODEL)
@@ -1,48 +1,48 @@
-import fastf1
-import pandas as pd
-from datetime import datetime
-import re
+import os
+import sys
 
-# Enable FastF1 caching
-fastf1.Cache.enable_cache("f1_cache")
+# Make the shared yuki package importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from yuki.radio import DEFAULT_STORE_DIR, ingest_session, radio_stats, read_messages
+from yuki.radio_index import update_index
+
+YUKI = "TSU"
 
 def get_yuki_radio_messages(year, gp_name):
     """
-    Fetch Yuki's radio messages for a specific Grand Prix.
-    
+    Ingest a Grand Prix's radio messages and print Yuki's.
+
     Args:
         year (int): The year of the race
         gp_name (str): The name of the Grand Prix (e.g., "Australia", "Japan")
     """
     print(f"\n🎤 Fetching Yuki's radio messages from {year} {gp_name} GP 🎤\n")
-    
-    """
-    TODO - get the data...
-    """
-    
+
+    count = ingest_session(year, gp_name)
+    yuki_radio = read_messages(year, gp_name, driver=YUKI, columns=["Timestamp", "Message", "Angry"])
+
     # Print messages with some fun formatting
     print("📻 Yuki's Radio Messages 📻")
     print("=" * 50)
-    
-    for _, message in yuki_radio.iterrows():
+
+    for timestamp, message, angry in yuki_radio.itertuples(index=False):
         # Add some fun emojis based on message content
-        emoji = "😡" if any(word in message['Message'].lower() for word in ['what', 'hell', 'fuck', 'shit']) else "🏎️"
-        print(f"\n{emoji} {message['Timestamp']} - {message['Message']}")
-    
+        emoji = "😡" if angry else "🏎️"
+        print(f"\n{emoji} {timestamp} - {message}")
+
     # Some fun statistics
     total_messages = len(yuki_radio)
-    angry_messages = len(yuki_radio[yuki_radio['Message'].str.contains('what|hell|fuck|shit', case=False, regex=True)])
-    
+    angry_messages = int(yuki_radio["Angry"].sum())
+
     print("\n📊 Radio Statistics 📊")
     print("=" * 50)
     print(f"Total messages: {total_messages}")
     print(f"Angry messages: {angry_messages}")
-    print(f"Anger ratio: {(angry_messages/total_messages)*100:.1f}%")
-    
-    # Save to CSV for future reference
-    filename = f"yuki_radio_{year}_{gp_name.lower().replace(' ', '_')}.csv"
-    yuki_radio.to_csv(filename, index=False)
-    print(f"\n💾 Messages saved to {filename}")
+    if total_messages:
+        print(f"Anger ratio: {(angry_messages/total_messages)*100:.1f}%")
+
+    print(f"\n💾 {count} messages saved to {DEFAULT_STORE_DIR}")
 
 def main():
     # Example usage
@@ -52,12 +52,23 @@ def main():
         (2023, "Japan"),
         (2023, "Singapore")
     ]
-    
+
     for year, gp in races:
         try:
             get_yuki_radio_messages(year, gp)
         except Exception as e:
             print(f"Error fetching data for {year} {gp}: {str(e)}")
 
+    # Index new or changed sessions for full-text search (python -m yuki radio ...)
+    print(f"\n🔎 Indexed {len(update_index())} sessions for radio search")
+
+    # Career statistics straight from the store
+    try:
+        print("\n📈 Yuki's Career Radio Statistics 📈")
+        print("=" * 50)
+        print(radio_stats(driver=YUKI))
+    except Exception as e:
+        print(f"Error reading radio statistics: {str(e)}")
+
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -40,44 +40,56 @@ export default function DashboardMetrics() {
   useEffect(() => {
     const fetchMetrics = async () => {
       try {
-        const response = await fetch('/predictions/all_predictions.json');
-        const data = await response.json();
+        // The index summarises every race without downloading the per-race shards,
+        // and the positions matrix carries each driver's precomputed finishing position
+        const [indexResponse, positionsResponse] = await Promise.all([
+          fetch('/predictions/index.json'),
+          fetch('/predictions/positions.json')
+        ]);
+        const data = await indexResponse.json();
+        const positionMatrix = await positionsResponse.json();
         
         // Process model metrics
         const metrics: ModelMetrics[] = [];
         const driverStats: { [key: string]: { positions: number[], count: number } } = {};
         
-        Object.entries(data).forEach(([race, raceData]: [string, any]) => {
-          Object.entries(raceData).forEach(([modelType, modelData]: [string, any]) => {
+        data.races.forEach((race: any) => {
+          Object.entries(race.models).forEach(([modelType, modelData]: [string, any]) => {
             if (modelData.error) return;
             
             const existingMetric = metrics.find(m => m.model_type === modelType);
             if (existingMetric) {
               existingMetric.average_error += modelData.model_error;
-              existingMetric.predictions_count += modelData.predictions.length;
+              existingMetric.predictions_count += modelData.predictions_count;
             } else {
               metrics.push({
                 model_type: modelType,
                 average_error: modelData.model_error,
-                predictions_count: modelData.predictions.length,
+                predictions_count: modelData.predictions_count,
                 last_updated: modelData.timestamp
               });
             }
+          });
+        });
 
-            // Process driver performance
-            modelData.predictions.forEach((pred: any, index: number) => {
-              if (!driverStats[pred.Driver]) {
-                driverStats[pred.Driver] = { positions: [], count: 0 };
+        // Process driver performance
+        Object.values(positionMatrix.positions).forEach((racePositions: any) => {
+          racePositions.forEach((row: (number | null)[]) => {
+            row.forEach((position, driverIndex) => {
+              if (position === null) return;
+              const driver = positionMatrix.drivers[driverIndex];
+              if (!driverStats[driver]) {
+                driverStats[driver] = { positions: [], count: 0 };
               }
-              driverStats[pred.Driver].positions.push(index + 1);
-              driverStats[pred.Driver].count++;
+              driverStats[driver].positions.push(position);
+              driverStats[driver].count++;
             });
           });
         });
 
         // Calculate averages
         metrics.forEach(metric => {
-          metric.average_error /= Object.keys(data).length;
+          metric.average_error /= data.races.length;
         });
 
         // Process driver performance data
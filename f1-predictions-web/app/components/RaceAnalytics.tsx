@@ -21,6 +21,7 @@ import RaceResults from './RaceResults';
 interface RacePrediction {
   Driver: string;
   'PredictedRaceTime (s)': number;
+  PredictedPosition: number;
 }
 
 interface RaceData {
@@ -46,6 +47,23 @@ interface RaceData {
   };
 }
 
+interface LivePrediction extends RacePrediction {
+  DriverCode: string;
+  LapsCompleted: number;
+  Retired: boolean;
+}
+
+interface LiveData {
+  lap: number;
+  total_laps: number;
+  predictions: LivePrediction[];
+  changes: { Driver: string; From: number | null; To: number }[];
+  timestamp: string;
+}
+
+// How often a race page checks for a new live lap
+const LIVE_POLL_MS = 5000;
+
 interface DriverComparison {
   driver: string;
   basic: number;
@@ -56,15 +74,18 @@ interface DriverComparison {
 
 export default function RaceAnalytics({ raceName }: { raceName: string }) {
   const [raceData, setRaceData] = useState<RaceData | null>(null);
+  const [liveData, setLiveData] = useState<LiveData | null>(null);
   const [loading, setLoading] = useState(true);
   const [selectedModel, setSelectedModel] = useState<'basic' | 'advanced' | 'nochange' | 'olddrivers'>('advanced');
 
   useEffect(() => {
     const fetchRaceData = async () => {
       try {
-        const response = await fetch('/predictions/all_predictions.json');
+        // Each race has its own shard, so a race page only downloads its own predictions
+        const slug = raceName.toLowerCase().replace(/ /g, '-');
+        const response = await fetch(`/predictions/races/${slug}.json`);
         const data = await response.json();
-        setRaceData(data[raceName]);
+        setRaceData(data);
         setLoading(false);
       } catch (error) {
         console.error('Error fetching race data:', error);
@@ -75,6 +96,23 @@ export default function RaceAnalytics({ raceName }: { raceName: string }) {
     fetchRaceData();
   }, [raceName]);
 
+  useEffect(() => {
+    // live_race.py rewrites this file after every lap; it only exists while a race is being followed
+    const slug = raceName.toLowerCase().replace(/ /g, '-');
+    const fetchLiveData = async () => {
+      try {
+        const response = await fetch(`/predictions/races/${slug}.live.json`, { cache: 'no-store' });
+        setLiveData(response.ok ? await response.json() : null);
+      } catch {
+        setLiveData(null);
+      }
+    };
+
+    fetchLiveData();
+    const interval = setInterval(fetchLiveData, LIVE_POLL_MS);
+    return () => clearInterval(interval);
+  }, [raceName]);
+
   if (loading || !raceData) {
     return (
       <div className="flex justify-center items-center min-h-[400px]">
@@ -123,6 +161,36 @@ export default function RaceAnalytics({ raceName }: { raceName: string }) {
         <p className="text-gray-400">Model predictions and performance analysis</p>
       </div>
 
+      {/* Live Order */}
+      {liveData && (
+        <div className="bg-f1-card rounded-lg shadow-lg overflow-hidden">
+          <div className="p-6 border-b border-gray-700">
+            <div className="flex items-center">
+              <div className="h-6 w-1.5 bg-[var(--f1-red)] mr-3"></div>
+              <h2 className="text-2xl font-bold">Live Predicted Order</h2>
+              <span className="ml-auto text-gray-400">Lap {liveData.lap}/{liveData.total_laps}</span>
+            </div>
+          </div>
+          <div className="p-6 grid grid-cols-1 md:grid-cols-2 gap-2">
+            {liveData.predictions.map((prediction) => {
+              const change = liveData.changes.find((c) => c.Driver === prediction.Driver);
+              const gained = change && change.From !== null ? change.From - change.To : 0;
+              return (
+                <div key={prediction.Driver} className="flex items-center bg-[var(--f1-dark-gray)] px-4 py-2 rounded-md">
+                  <span className="w-8 font-bold">{prediction.PredictedPosition}</span>
+                  <span className={prediction.Retired ? 'text-gray-500 line-through' : ''}>{prediction.Driver}</span>
+                  {gained !== 0 && (
+                    <span className={`ml-auto text-sm ${gained > 0 ? 'text-green-400' : 'text-red-400'}`}>
+                      {gained > 0 ? `+${gained}` : gained}
+                    </span>
+                  )}
+                </div>
+              );
+            })}
+          </div>
+        </div>
+      )}
+
       {/* Model Selection */}
       <div className="flex flex-wrap justify-center gap-4">
         {(['basic', 'advanced', 'nochange', 'olddrivers'] as const).map((model) => (
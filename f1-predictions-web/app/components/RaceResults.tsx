@@ -31,6 +31,7 @@ interface RaceResult {
 interface RacePrediction {
   Driver: string;
   'PredictedRaceTime (s)': number;
+  PredictedPosition?: number;
 }
 
 interface ChampionshipStanding {
@@ -73,13 +74,10 @@ export default function RaceResults({ raceName, selectedModel, predictions }: Ra
 
         // 3. Calculate championship impact of the predictions
         if (predictions && predictions.length) {
-          const orderedPredictions = [...predictions].sort(
-            (a, b) => a['PredictedRaceTime (s)'] - b['PredictedRaceTime (s)']
-          );
-
+          // Predictions arrive already ordered by the precompute
           const newStandings = calculatePredictedStandings(
             liveStandings,
-            orderedPredictions,
+            predictions,
             mockResults
           );
 
@@ -260,9 +258,7 @@ export default function RaceResults({ raceName, selectedModel, predictions }: Ra
     );
   }
 
-  const sortedPredictions = predictions
-    ? [...predictions].sort((a, b) => a['PredictedRaceTime (s)'] - b['PredictedRaceTime (s)'])
-    : [];
+  const sortedPredictions = predictions ?? [];
 
   return (
     <div className="bg-f1-card rounded-lg shadow-lg overflow-hidden">
@@ -300,7 +296,7 @@ export default function RaceResults({ raceName, selectedModel, predictions }: Ra
               <TableBody>
                 {sortedPredictions.map((prediction, index) => (
                   <TableRow key={prediction.Driver} className="hover:bg-gray-700">
-                    <TableCell sx={{ color: 'white' }}>{index + 1}</TableCell>
+                    <TableCell sx={{ color: 'white' }}>{prediction.PredictedPosition ?? index + 1}</TableCell>
                     <TableCell sx={{ color: 'white' }}>{prediction.Driver}</TableCell>
                     <TableCell align="right" sx={{ color: 'white' }}>
                       {formatTime(prediction['PredictedRaceTime (s)'])}
@@ -0,0 +1,51 @@
+import imageManifest from '../../public/images/manifest.json';
+
+interface ImageEntry {
+  // Size of the largest width emitted, which is the src
+  width: number;
+  height: number;
+  widths: number[];
+  src: string;
+  srcset: Record<string, string>;
+}
+
+interface ResponsiveImageProps {
+  // Manifest key from scripts/build_responsive_images.py, e.g. "tracks/bahrain"
+  name: string;
+  alt: string;
+  sizes: string;
+  className?: string;
+  priority?: boolean;
+}
+
+const manifest = imageManifest as Record<string, ImageEntry>;
+
+// Serves the AVIF/WebP/JPEG widths built by scripts/build_responsive_images.py,
+// letting the browser pick the smallest file that fits the rendered size
+export default function ResponsiveImage({ name, alt, sizes, className, priority = false }: ResponsiveImageProps) {
+  const entry = manifest[name];
+  if (!entry) return null;
+
+  const fallbackType = 'image/jpeg';
+
+  return (
+    <picture>
+      {Object.entries(entry.srcset)
+        .filter(([type]) => type !== fallbackType)
+        .map(([type, srcSet]) => (
+          <source key={type} type={type} srcSet={srcSet} sizes={sizes} />
+        ))}
+      <img
+        src={entry.src}
+        srcSet={entry.srcset[fallbackType]}
+        sizes={sizes}
+        width={entry.width}
+        height={entry.height}
+        alt={alt}
+        loading={priority ? 'eager' : 'lazy'}
+        decoding="async"
+        className={className}
+      />
+    </picture>
+  );
+}
@@ -1,11 +1,11 @@
 'use client';
 
 import { useState } from 'react';
-import Image from 'next/image';
 import Link from 'next/link';
 import dynamic from 'next/dynamic';
 import DashboardMetrics from './components/DashboardMetrics';
 import AboutSection from './components/AboutSection';
+import ResponsiveImage from './components/ResponsiveImage';
 
 // Use dynamic import with ssr:false for components with Plotly
 const ModelAnalysis = dynamic(
@@ -14,30 +14,30 @@ const ModelAnalysis = dynamic(
 );
 
 const TRACKS = [
-  { name: 'Bahrain', image: '/tracks/bahrain.jpg' },
-  { name: 'Saudi Arabia', image: '/tracks/saudi-arabia.jpg' },
-  { name: 'Australia', image: '/tracks/australia.jpg' },
-  { name: 'Japan', image: '/tracks/japan.jpg' },
-  { name: 'China', image: '/tracks/china.jpg' },
-  { name: 'Miami', image: '/tracks/miami.jpg' },
-  { name: 'Emilia Romagna', image: '/tracks/emilia-romagna.jpg' },
-  { name: 'Monaco', image: '/tracks/monaco.jpg' },
-  { name: 'Canada', image: '/tracks/canada.jpg' },
-  { name: 'Spain', image: '/tracks/spain.jpg' },
-  { name: 'Austria', image: '/tracks/austria.jpg' },
-  { name: 'Great Britain', image: '/tracks/great-britain.jpg' },
-  { name: 'Hungary', image: '/tracks/hungary.jpg' },
-  { name: 'Belgium', image: '/tracks/belgium.jpg' },
-  { name: 'Netherlands', image: '/tracks/netherlands.jpg' },
-  { name: 'Italy', image: '/tracks/italy.jpg' },
-  { name: 'Azerbaijan', image: '/tracks/azerbaijan.jpg' },
-  { name: 'Singapore', image: '/tracks/singapore.jpg' },
-  { name: 'United States', image: '/tracks/united-states.jpg' },
-  { name: 'Mexico', image: '/tracks/mexico.jpg' },
-  { name: 'Brazil', image: '/tracks/brazil.jpg' },
-  { name: 'Las Vegas', image: '/tracks/las-vegas.jpg' },
-  { name: 'Qatar', image: '/tracks/qatar.jpg' },
-  { name: 'Abu Dhabi', image: '/tracks/abu-dhabi.jpg' },
+  { name: 'Bahrain', image: 'tracks/bahrain' },
+  { name: 'Saudi Arabia', image: 'tracks/saudi-arabia' },
+  { name: 'Australia', image: 'tracks/australia' },
+  { name: 'Japan', image: 'tracks/japan' },
+  { name: 'China', image: 'tracks/china' },
+  { name: 'Miami', image: 'tracks/miami' },
+  { name: 'Emilia Romagna', image: 'tracks/emilia-romagna' },
+  { name: 'Monaco', image: 'tracks/monaco' },
+  { name: 'Canada', image: 'tracks/canada' },
+  { name: 'Spain', image: 'tracks/spain' },
+  { name: 'Austria', image: 'tracks/austria' },
+  { name: 'Great Britain', image: 'tracks/great-britain' },
+  { name: 'Hungary', image: 'tracks/hungary' },
+  { name: 'Belgium', image: 'tracks/belgium' },
+  { name: 'Netherlands', image: 'tracks/netherlands' },
+  { name: 'Italy', image: 'tracks/italy' },
+  { name: 'Azerbaijan', image: 'tracks/azerbaijan' },
+  { name: 'Singapore', image: 'tracks/singapore' },
+  { name: 'United States', image: 'tracks/united-states' },
+  { name: 'Mexico', image: 'tracks/mexico' },
+  { name: 'Brazil', image: 'tracks/brazil' },
+  { name: 'Las Vegas', image: 'tracks/las-vegas' },
+  { name: 'Qatar', image: 'tracks/qatar' },
+  { name: 'Abu Dhabi', image: 'tracks/abu-dhabi' },
 ];
 
 export default function Home() {
@@ -47,7 +47,13 @@ export default function Home() {
       <div className="relative overflow-hidden">
         <div className="absolute inset-0 bg-gradient-to-r from-black via-black/80 to-transparent z-10"></div>
         <div className="absolute inset-0 overflow-hidden">
-          <div className="absolute inset-0 bg-[url('/hero-background.jpg')] bg-cover bg-center opacity-50"></div>
+          <ResponsiveImage
+            name="hero-background"
+            alt=""
+            sizes="100vw"
+            priority
+            className="absolute inset-0 h-full w-full object-cover object-center opacity-50"
+          />
           <div className="absolute inset-0 bg-gradient-to-b from-transparent to-[var(--f1-black)]"></div>
         </div>
         <div className="relative z-20 max-w-7xl mx-auto pt-20 pb-16 px-6">
@@ -99,11 +105,11 @@ export default function Home() {
                   className="group bg-f1-card rounded-lg overflow-hidden shadow-lg hover:shadow-xl transition-all duration-300 transform hover:-translate-y-1"
                 >
                   <div className="aspect-video relative">
-                    <Image
-                      src={track.image}
+                    <ResponsiveImage
+                      name={track.image}
                       alt={`${track.name} Grand Prix Track`}
-                      fill
-                      className="object-cover group-hover:scale-105 transition-transform duration-500"
+                      sizes="(min-width: 1280px) 300px, (min-width: 1024px) 33vw, (min-width: 640px) 50vw, 100vw"
+                      className="absolute inset-0 h-full w-full object-cover group-hover:scale-105 transition-transform duration-500"
                     />
                     <div className="absolute inset-0 bg-gradient-to-t from-black/80 to-transparent" />
                     <div className="absolute bottom-0 left-0 right-0 p-4">
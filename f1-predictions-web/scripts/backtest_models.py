@@ -0,0 +1,40 @@
+import argparse
+import os
+import sys
+import time
+
+# Add the parent directory to the path so we can import our prediction modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from yuki import f1cache
+from yuki.backtest import run_backtest
+from yuki.prediction import MODEL_TYPES
+
+from visualise_errors import BACKTEST_PATH
+
+def main():
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of every model type across past seasons.")
+    parser.add_argument("--years", type=int, nargs="+", default=[2022, 2023, 2024], help="seasons to replay (default: 2022 2023 2024)")
+    parser.add_argument("--races", nargs="+", metavar="GP", help="Grands Prix to replay (default: each season's calendar)")
+    parser.add_argument("--models", nargs="+", default=MODEL_TYPES, choices=MODEL_TYPES, help="model types to compare")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes (default: one per core)")
+    parser.add_argument("--min-train-events", type=int, default=3, help="earlier events a race needs before it is scored (default: 3)")
+    parser.add_argument("--offline", action="store_true", default=f1cache.OFFLINE,
+                        help="only use sessions already in the FastF1 cache (default: $YUKI_OFFLINE)")
+    args = parser.parse_args()
+
+    f1cache.enable(offline=args.offline)
+
+    start = time.perf_counter()
+    results = run_backtest(args.years, args.races, args.models, args.workers, args.min_train_events)
+    elapsed = time.perf_counter() - start
+
+    results.to_csv(BACKTEST_PATH, index=False)
+    print(f"Scored {results['Grand Prix'].count() // max(len(args.models), 1)} races in {elapsed:.1f}s")
+    print("\nBacktest Error by Model Type and Season:")
+    print(results.pivot_table(index="Season", columns="Model Type", values="Error (seconds)", aggfunc="mean").round(3))
+    print(f"\nBacktest results saved to {BACKTEST_PATH}")
+    print("Run visualise_errors.py --backtest to chart them and refresh error_data.csv")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to the path so we can import our prediction modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from yuki.data import DRIVER_MAPPING
+from yuki.features import TIME_COLUMNS, _feature_path, _write_table, build_lap_table, driver_aggregates
+from yuki.model_store import ModelStore
+from yuki.prediction import MODEL_TYPES, load_race_features, run_prediction
+
+import generate_race_analytics
+import visualise_errors
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_results")
+
+# Bump when stages or the synthetic data change so old results are not compared against new ones
+BENCHMARK_VERSION = 1
+
+# Predictions are made for this season from synthetic laps of the season before
+PREDICTION_YEAR = 2025
+
+def synthetic_laps(rng, laps_per_driver=57):
+    """
+    Generate a race's laps in the shape of FastF1's session.laps.
+
+    Args:
+        rng (np.random.Generator): Source of randomness
+        laps_per_driver (int): Number of laps each driver completes
+
+    Returns:
+        pd.DataFrame: Driver plus LapTime and sector times as timedeltas, with a few missing values
+    """
+    drivers = np.repeat(list(DRIVER_MAPPING.values()), laps_per_driver)
+    pace = np.repeat(rng.normal(0, 0.4, len(DRIVER_MAPPING)), laps_per_driver)
+    sectors = rng.normal([28.0, 33.0, 29.0], 0.3, (len(drivers), 3)) + pace[:, None] / 3
+
+    laps = pd.DataFrame({"Driver": drivers})
+    for i, col in enumerate(TIME_COLUMNS[1:]):
+        laps[col] = pd.to_timedelta(sectors[:, i], unit="s")
+    laps["LapTime"] = laps["Sector1Time"] + laps["Sector2Time"] + laps["Sector3Time"]
+
+    # Pit laps and lap 1 have missing sector times in real sessions
+    missing = rng.random(len(laps)) < 0.05
+    laps.loc[missing, "Sector1Time"] = pd.NaT
+    return laps[["Driver"] + TIME_COLUMNS]
+
+def stage_feature_build(state):
+    """Clean each race's laps and write them to the feature cache, as after session.load()."""
+    for gp, laps in state["laps"].items():
+        lap_table = build_lap_table(laps)
+        _write_table(lap_table, _feature_path(PREDICTION_YEAR - 1, gp, "R", "laps", state["feature_dir"]))
+        _write_table(driver_aggregates(lap_table), _feature_path(PREDICTION_YEAR - 1, gp, "R", "drivers", state["feature_dir"]))
+
+def stage_load_features(state):
+    """Read each race's driver aggregates back and merge them with qualifying."""
+    state["features"] = {gp: load_race_features(PREDICTION_YEAR, gp, state["feature_dir"]) for gp in state["laps"]}
+
+def _predict_all(state):
+    state["predictions"] = {
+        gp: {model_type: run_prediction(PREDICTION_YEAR, gp, model_type, features, state["store"]) for model_type in MODEL_TYPES}
+        for gp, features in state["features"].items()
+    }
+
+def stage_fit_predict(state):
+    """Fit and predict every model type on an empty model store."""
+    _predict_all(state)
+
+def stage_predict_cached(state):
+    """Predict every model type again, reusing the stored fits."""
+    _predict_all(state)
+
+def stage_serialize(state):
+    """Write each race's predictions as a compact JSON shard."""
+    for gp, results in state["predictions"].items():
+        with open(os.path.join(state["tmp_dir"], f"{gp}.json"), "w") as f:
+            json.dump(results, f, separators=(",", ":"))
+
+def stage_analytics(state):
+    """Run the race analytics aggregations."""
+    df = generate_race_analytics.flatten_predictions(state["predictions"])
+    generate_race_analytics.calculate_driver_stats(df)
+    generate_race_analytics.calculate_model_comparison(df)
+    generate_race_analytics.calculate_race_trends(df)
+
+def stage_render(state):
+    """Render every error panel in this process."""
+    df, pivot_df, correlation = visualise_errors.build_error_frames(state["predictions"])
+    frames = {"errors": df, "pivot": pivot_df, "correlation": correlation}
+    for name, (_, source, _) in visualise_errors.PANELS.items():
+        visualise_errors.render_panel(name, frames[source])
+
+# Stages in pipeline order; each builds on the state left by the ones before it
+STAGES = [
+    ("feature_build", stage_feature_build),
+    ("load_features", stage_load_features),
+    ("fit_predict", stage_fit_predict),
+    ("predict_cached", stage_predict_cached),
+    ("serialize", stage_serialize),
+    ("analytics", stage_analytics),
+    ("render", stage_render)
+]
+
+def run_pipeline(races, laps_per_driver, seed, trace):
+    """
+    Run every stage once on fresh synthetic data in an empty temporary directory.
+
+    Args:
+        races (int): Number of synthetic races
+        laps_per_driver (int): Laps per driver in each race
+        seed (int): Seed for the synthetic data
+        trace (bool): Record tracemalloc peaks, which slows the stages down
+
+    Returns:
+        dict: Wall time in seconds, and peak traced memory in bytes when tracing, per stage
+    """
+    rng = np.random.default_rng(seed)
+    measurements = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        panels_dir = visualise_errors.PANELS_DIR
+        visualise_errors.PANELS_DIR = tmp_dir
+        state = {
+            "tmp_dir": tmp_dir,
+            "feature_dir": os.path.join(tmp_dir, "features"),
+            "store": ModelStore(os.path.join(tmp_dir, "models")),
+            "laps": {f"Synthetic {i + 1:02d}": synthetic_laps(rng, laps_per_driver) for i in range(races)}
+        }
+        try:
+            for name, stage in STAGES:
+                if trace:
+                    tracemalloc.start()
+                start = time.perf_counter()
+                stage(state)
+                wall = time.perf_counter() - start
+                if trace:
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+                    measurements[name] = {"wall_s": wall, "peak_bytes": peak}
+                else:
+                    measurements[name] = {"wall_s": wall}
+        finally:
+            visualise_errors.PANELS_DIR = panels_dir
+    return measurements
+
+def git_commit():
+    """Short hash of the checked-out commit, or None outside a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmark(races=24, laps_per_driver=57, repeat=3, seed=0):
+    """
+    Benchmark the prediction pipeline on synthetic FastF1-shaped data, without network access.
+
+    Wall times are the median of `repeat` untraced runs; peak memory comes
+    from one extra run under tracemalloc.
+
+    Args:
+        races (int): Number of synthetic races
+        laps_per_driver (int): Laps per driver in each race
+        repeat (int): Number of timed runs
+        seed (int): Seed for the synthetic data
+
+    Returns:
+        dict: Run metadata and per-stage wall time, peak memory and races per second
+    """
+    runs = [run_pipeline(races, laps_per_driver, seed, trace=False) for _ in range(repeat)]
+    traced = run_pipeline(races, laps_per_driver, seed, trace=True)
+
+    stages = {}
+    for name, _ in STAGES:
+        walls = [run[name]["wall_s"] for run in runs]
+        median = statistics.median(walls)
+        stages[name] = {
+            "wall_s": median,
+            "wall_min_s": min(walls),
+            "peak_mb": traced[name]["peak_bytes"] / 1e6,
+            "races_per_s": races / median if median else None
+        }
+
+    return {
+        "version": BENCHMARK_VERSION,
+        "timestamp": datetime.now().isoformat(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "config": {"races": races, "laps_per_driver": laps_per_driver, "repeat": repeat, "seed": seed},
+        "stages": stages
+    }
+
+def print_results(results, baseline=None):
+    """Print one line per stage, with the change against a baseline run when given."""
+    print(f"\n{'Stage':<16}{'Wall (s)':>10}{'Peak (MB)':>11}{'Races/s':>10}{'vs base':>9}")
+    for name, stage in results["stages"].items():
+        change = ""
+        if baseline and name in baseline.get("stages", {}):
+            change = f"{stage['wall_s'] / baseline['stages'][name]['wall_s']:.2f}x"
+        print(f"{name:<16}{stage['wall_s']:>10.3f}{stage['peak_mb']:>11.1f}{stage['races_per_s']:>10.1f}{change:>9}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the prediction pipeline on synthetic data.")
+    parser.add_argument("--races", type=int, default=24, help="number of synthetic races (default: 24)")
+    parser.add_argument("--laps", type=int, default=57, help="laps per driver in each race (default: 57)")
+    parser.add_argument("--repeat", type=int, default=3, help="number of timed runs (default: 3)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="results file (default: benchmark_results/<timestamp>.json)")
+    parser.add_argument("--compare", metavar="BASELINE", help="earlier results file to compare wall times against")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.races, args.laps, args.repeat, args.seed)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        workload = {key: value for key, value in results["config"].items() if key != "repeat"}
+        if baseline.get("version") != BENCHMARK_VERSION or \
+                {key: value for key, value in baseline.get("config", {}).items() if key != "repeat"} != workload:
+            print("Baseline was recorded with a different benchmark version or configuration; not comparing")
+            baseline = None
+    print_results(results, baseline)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nBenchmark results saved to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from PIL import Image, UnidentifiedImageError, features
+
+PUBLIC_DIR = "f1-predictions-web/public"
+OUTPUT_DIR = os.path.join(PUBLIC_DIR, "images")
+
+# srcset entries read by the Next.js components
+MANIFEST_PATH = os.path.join(OUTPUT_DIR, "manifest.json")
+
+# Bump when the manifest entry layout changes so every image is rebuilt
+MANIFEST_VERSION = 2
+
+# Source hashes and settings from the last build, so unchanged images are skipped
+STATE_PATH = "f1-predictions-web/scripts/responsive_images_state.json"
+
+# State value prefix for sources that failed to decode, followed by their fingerprint
+FAILED_PREFIX = "failed:"
+
+# Output widths in pixels; widths above the source width are replaced by the source width
+WIDTHS = [320, 640, 960, 1280, 1920]
+
+# Pillow format, file extension, MIME type and encoder options, best compression first
+FORMATS = [
+    ("AVIF", "avif", "image/avif", {"quality": 50}),
+    ("WEBP", "webp", "image/webp", {"quality": 80, "method": 6}),
+    ("JPEG", "jpg", "image/jpeg", {"quality": 82, "optimize": True, "progressive": True})
+]
+
+def available_formats():
+    """Formats this Pillow build can encode; JPEG is always kept as the fallback."""
+    return [fmt for fmt in FORMATS if fmt[0] == "JPEG" or features.check(fmt[0].lower())]
+
+def find_sources():
+    """Source images, relative to PUBLIC_DIR: the hero background and every track image."""
+    tracks_dir = os.path.join(PUBLIC_DIR, "tracks")
+    tracks = sorted(name for name in os.listdir(tracks_dir) if name.endswith(".jpg")) if os.path.isdir(tracks_dir) else []
+    return ["hero-background.jpg"] + [os.path.join("tracks", name) for name in tracks]
+
+def image_name(source):
+    """Manifest key for a source, e.g. "tracks/bahrain" for tracks/bahrain.jpg."""
+    return os.path.splitext(source)[0].replace(os.sep, "/")
+
+def source_fingerprint(source, formats):
+    """Hash of a source image's bytes and the build settings applied to it."""
+    digest = hashlib.sha256(json.dumps([MANIFEST_VERSION, WIDTHS, [fmt[:2] + (fmt[3],) for fmt in formats]]).encode("utf-8"))
+    with open(os.path.join(PUBLIC_DIR, source), "rb") as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+def build_image(source, formats):
+    """
+    Write every width and format of one source image.
+
+    Args:
+        source (str): Path of the source image, relative to PUBLIC_DIR
+        formats (list): Entries of FORMATS to encode
+
+    Returns:
+        dict: Manifest entry with the size of the largest emitted width, the widths emitted,
+            a JPEG src and a srcset per MIME type
+    """
+    name = image_name(source)
+    with Image.open(os.path.join(PUBLIC_DIR, source)) as img:
+        img = img.convert("RGB")
+        widths = sorted({min(width, img.width) for width in WIDTHS})
+
+        srcsets = {mime: [] for _, _, mime, _ in formats}
+        heights = []
+        for width in widths:
+            height = round(img.height * width / img.width)
+            heights.append(height)
+            resized = img if width == img.width else img.resize((width, height), Image.Resampling.LANCZOS)
+            for pil_format, ext, mime, options in formats:
+                path = os.path.join(OUTPUT_DIR, f"{name}-{width}.{ext}")
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                resized.save(path, pil_format, **options)
+                srcsets[mime].append(f"/images/{name}-{width}.{ext} {width}w")
+
+        return {
+            "width": widths[-1],
+            "height": heights[-1],
+            "widths": widths,
+            "src": f"/images/{name}-{widths[-1]}.jpg",
+            "srcset": {mime: ", ".join(entries) for mime, entries in srcsets.items()}
+        }
+
+def load_json(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+def build_all(sources=None, workers=None, force=False):
+    """
+    Build responsive variants of every source image across processes.
+
+    Args:
+        sources (list, optional): Source images relative to PUBLIC_DIR, find_sources() if omitted
+        workers (int, optional): Number of processes, one per core if omitted
+        force (bool): Rebuild every image even if its source is unchanged
+
+    Returns:
+        dict: Outcome per image: "built", "unchanged" or "failed" (also for unchanged sources that failed before)
+    """
+    sources = find_sources() if sources is None else sources
+    formats = available_formats()
+    if len(formats) < len(FORMATS):
+        print(f"Skipping unsupported formats: {', '.join(fmt[0] for fmt in FORMATS if fmt not in formats)}")
+
+    manifest = load_json(MANIFEST_PATH)
+    state = {} if force else load_json(STATE_PATH)
+    outcomes = {}
+
+    fingerprints = {source: source_fingerprint(source, formats) for source in sources}
+    # Sources that could not be decoded are recorded as failed and not retried until they change
+    failed = [source for source in sources if state.get(source) == f"{FAILED_PREFIX}{fingerprints[source]}"]
+    stale = [
+        source for source in sources
+        if source not in failed and (state.get(source) != fingerprints[source] or image_name(source) not in manifest)
+    ]
+    outcomes.update({source: "unchanged" for source in sources if source not in stale and source not in failed})
+    outcomes.update({source: "failed" for source in failed})
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(build_image, source, formats): source for source in stale}
+        for future in as_completed(futures):
+            source = futures[future]
+            try:
+                manifest[image_name(source)] = future.result()
+            except (OSError, UnidentifiedImageError) as e:
+                outcomes[source] = "failed"
+                state[source] = f"{FAILED_PREFIX}{fingerprints[source]}"
+                print(f"Error processing {source}: {str(e)}")
+                continue
+            state[source] = fingerprints[source]
+            outcomes[source] = "built"
+            print(f"Built responsive images for {source}")
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    with open(MANIFEST_PATH, "w") as f:
+        json.dump({name: manifest[name] for name in sorted(manifest)}, f, indent=2)
+    with open(STATE_PATH, "w") as f:
+        json.dump({source: state[source] for source in sorted(state)}, f, indent=2)
+
+    return outcomes
+
+def main():
+    parser = argparse.ArgumentParser(description="Build multi-width AVIF/WebP/JPEG variants of the site images.")
+    parser.add_argument("--workers", type=int, default=None, help="number of processes (default: one per core)")
+    parser.add_argument("--force", action="store_true", help="rebuild every image")
+    args = parser.parse_args()
+
+    outcomes = build_all(workers=args.workers, force=args.force)
+    built = sum(outcome == "built" for outcome in outcomes.values())
+    failed = sorted(source for source, outcome in outcomes.items() if outcome == "failed")
+    print(f"Built {built} of {len(outcomes)} images{'; failed: ' + ', '.join(failed) if failed else ''}")
+
+if __name__ == "__main__":
+    main()
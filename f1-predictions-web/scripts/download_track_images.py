@@ -1,10 +1,18 @@
+import argparse
+import hashlib
+import json
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from PIL import Image
 from io import BytesIO
 
-# Create directories if they don't exist
-os.makedirs("f1-predictions-web/public/tracks", exist_ok=True)
+OUTPUT_DIR = "f1-predictions-web/public/tracks"
+
+# Validators (ETag/Last-Modified) and content hashes from the last successful download of each image
+MANIFEST_PATH = "f1-predictions-web/scripts/track_images_manifest.json"
 
 # Track image URLs (replace with actual URLs)
 TRACK_IMAGES = {
@@ -34,31 +42,135 @@ TRACK_IMAGES = {
     "abu-dhabi": "https://media.formula1.com/image/upload/f_auto/q_auto/v1677245035/content/dam/fom-website/2018-redesign-assets/Track%20icons%204x3/Abu%20Dhabi.png.transform/3col/image.png"
 }
 
-def download_and_resize_image(url, filename, size=(800, 450)):
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        
-        # Open image from response content
-        img = Image.open(BytesIO(response.content))
-        
-        # Convert to RGB if necessary
-        if img.mode in ('RGBA', 'P'):
-            img = img.convert('RGB')
-        
-        # Resize image
-        img = img.resize(size, Image.Resampling.LANCZOS)
-        
-        # Save image
-        img.save(f"f1-predictions-web/public/tracks/{filename}.jpg", "JPEG", quality=85)
-        print(f"Successfully downloaded and processed {filename}")
-        
-    except Exception as e:
-        print(f"Error processing {filename}: {str(e)}")
+def make_session(pool_size):
+    """
+    Create an HTTP session whose connection pool is shared by every download.
+    
+    Args:
+        pool_size (int): Maximum number of pooled connections per host
+    
+    Returns:
+        requests.Session: Session with pooling and retries on transient errors
+    """
+    session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def download_and_resize_image(session, url, filename, entry=None, size=(800, 450), output_dir=OUTPUT_DIR):
+    """
+    Download a track image and resize it, unless it is unchanged since the last run.
+    
+    The request is conditional on the validators recorded in the manifest, so
+    an unchanged image costs one 304 response and no resize. Servers that send
+    no validators are caught by comparing the content hash instead.
+    
+    Args:
+        session (requests.Session): Shared HTTP session
+        url (str): Image URL
+        filename (str): Output name, without extension
+        entry (dict, optional): This image's manifest entry from the last run
+        size (tuple): Output size in pixels
+        output_dir (str): Directory the JPEG is written to
+    
+    Returns:
+        tuple: ("updated" or "unchanged", manifest entry for this image)
+    """
+    path = os.path.join(output_dir, f"{filename}.jpg")
+    
+    # Only revalidate when the previous output is still there and was made the same way
+    headers = {}
+    reusable = entry is not None and os.path.exists(path) and entry.get("url") == url and entry.get("size") == list(size)
+    if reusable:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    
+    response = session.get(url, headers=headers, timeout=30)
+    if response.status_code == 304 and reusable:
+        return "unchanged", entry
+    response.raise_for_status()
+    
+    new_entry = {
+        "url": url,
+        "size": list(size),
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "sha256": hashlib.sha256(response.content).hexdigest()
+    }
+    if reusable and entry.get("sha256") == new_entry["sha256"]:
+        return "unchanged", new_entry
+    
+    # Open image from response content
+    img = Image.open(BytesIO(response.content))
+    
+    # Convert to RGB if necessary
+    if img.mode in ('RGBA', 'P'):
+        img = img.convert('RGB')
+    
+    # Resize image
+    img = img.resize(size, Image.Resampling.LANCZOS)
+    
+    # Save image
+    img.save(path, "JPEG", quality=85)
+    return "updated", new_entry
+
+def load_manifest(manifest_path):
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, "r") as f:
+        return json.load(f)
+
+def download_all(images=None, output_dir=OUTPUT_DIR, manifest_path=MANIFEST_PATH, workers=8):
+    """
+    Download every track image over a pooled session with bounded concurrency.
+    
+    Args:
+        images (dict, optional): Output name to URL, TRACK_IMAGES if omitted
+        output_dir (str): Directory the JPEGs are written to
+        manifest_path (str): Where the validators of each download are recorded
+        workers (int): Maximum number of concurrent downloads
+    
+    Returns:
+        dict: Outcome per image: "updated", "unchanged" or "failed"
+    """
+    images = TRACK_IMAGES if images is None else images
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = load_manifest(manifest_path)
+    outcomes = {}
+    
+    with make_session(workers) as session, ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(download_and_resize_image, session, url, track, manifest.get(track), output_dir=output_dir): track
+            for track, url in images.items()
+        }
+        for future in as_completed(futures):
+            track = futures[future]
+            try:
+                outcomes[track], manifest[track] = future.result()
+            except Exception as e:
+                outcomes[track] = "failed"
+                print(f"Error processing {track}: {str(e)}")
+                continue
+            if outcomes[track] == "updated":
+                print(f"Successfully downloaded and processed {track}")
+    
+    with open(manifest_path, "w") as f:
+        json.dump({track: manifest[track] for track in sorted(manifest)}, f, indent=2)
+    
+    return outcomes
 
 def main():
-    for track, url in TRACK_IMAGES.items():
-        download_and_resize_image(url, track)
+    parser = argparse.ArgumentParser(description="Download and resize the track images.")
+    parser.add_argument("--workers", type=int, default=8, help="maximum number of concurrent downloads")
+    args = parser.parse_args()
+    
+    outcomes = download_all(workers=args.workers)
+    unchanged = sum(outcome == "unchanged" for outcome in outcomes.values())
+    print(f"{unchanged} of {len(outcomes)} track images unchanged")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -4,136 +4,105 @@ import pandas as pd
 from datetime import datetime
 import os
 
+PREDICTIONS_DIR = os.path.join('../public', 'predictions')
+
+STATS = ['mean', 'std', 'min', 'max']
+
 def load_predictions() -> Dict:
-    """Load predictions from the JSON file."""
-    predictions_path = os.path.join('../public', 'predictions', 'all_predictions.json')
+    """Load predictions from the per-race shards, falling back to the aggregate JSON file."""
+    index_path = os.path.join(PREDICTIONS_DIR, 'index.json')
+    if os.path.exists(index_path):
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+        predictions = {}
+        for race in index['races']:
+            with open(os.path.join(PREDICTIONS_DIR, race['shard']), 'r') as f:
+                predictions[race['name']] = json.load(f)
+        return predictions
+
+    predictions_path = os.path.join(PREDICTIONS_DIR, 'all_predictions.json')
     with open(predictions_path, 'r') as f:
         return json.load(f)
 
-def calculate_driver_stats(predictions: Dict) -> Dict:
+def flatten_predictions(predictions: Dict) -> pd.DataFrame:
+    """
+    Flatten {gp: {model_type: {predictions: [...]}}} into one row per driver prediction.
+
+    Models that failed to run are skipped. Each row carries its model's error
+    and the driver's predicted position within that race and model, ranked here
+    for older outputs that predate the precomputed PredictedPosition.
+    """
+    rows = [
+        (gp, model_type, pred['Driver'], pred['PredictedRaceTime (s)'], pred.get('PredictedPosition'), result['model_error'])
+        for gp, models in predictions.items()
+        for model_type, result in models.items()
+        if 'error' not in result
+        for pred in result['predictions']
+    ]
+    df = pd.DataFrame(
+        rows, columns=['Grand Prix', 'Model Type', 'Driver', 'Predicted_Time', 'Predicted_Position', 'Model_Error']
+    )
+    ranked = df.groupby(['Grand Prix', 'Model Type'])['Predicted_Time'].rank(method='dense')
+    df['Predicted_Position'] = df['Predicted_Position'].fillna(ranked).astype(int)
+    return df
+
+def _flatten_columns(stats: pd.DataFrame) -> pd.DataFrame:
+    """Turn ('Predicted_Time', 'mean') style column pairs into 'Predicted_Time_mean'."""
+    stats.columns = [f'{column}_{stat}' for column, stat in stats.columns]
+    return stats
+
+def _to_records(stats: pd.DataFrame) -> Dict:
+    """Convert a stats frame to a JSON-ready dict, with undefined values (e.g. std of one value) as null."""
+    return json.loads(stats.to_json(orient='index'))
+
+def calculate_driver_stats(df: pd.DataFrame) -> Dict:
     """Calculate driver-specific statistics across all races."""
-    driver_stats = {}
-    
-    for race, race_predictions in predictions.items():
-        for pred in race_predictions:
-            driver = pred['driver']
-            if driver not in driver_stats:
-                driver_stats[driver] = {
-                    'Predicted_Time': [],
-                    'Predicted_Position': []
-                }
-            
-            driver_stats[driver]['Predicted_Time'].append(pred['predicted_time'])
-            driver_stats[driver]['Predicted_Position'].append(pred['predicted_position'])
-    
-    # Calculate statistics for each driver
-    for driver in driver_stats:
-        stats = driver_stats[driver]
-        stats['Predicted_Time_mean'] = sum(stats['Predicted_Time']) / len(stats['Predicted_Time'])
-        stats['Predicted_Time_std'] = pd.Series(stats['Predicted_Time']).std()
-        stats['Predicted_Time_min'] = min(stats['Predicted_Time'])
-        stats['Predicted_Time_max'] = max(stats['Predicted_Time'])
-        
-        stats['Predicted_Position_mean'] = sum(stats['Predicted_Position']) / len(stats['Predicted_Position'])
-        stats['Predicted_Position_std'] = pd.Series(stats['Predicted_Position']).std()
-        stats['Predicted_Position_min'] = min(stats['Predicted_Position'])
-        stats['Predicted_Position_max'] = max(stats['Predicted_Position'])
-        
-        # Remove raw data lists
-        del stats['Predicted_Time']
-        del stats['Predicted_Position']
-    
-    return driver_stats
-
-def calculate_model_comparison(predictions: Dict) -> Dict:
-    """Calculate model comparison statistics."""
-    model_stats = {}
-    
-    for race, race_predictions in predictions.items():
-        for pred in race_predictions:
-            model_type = pred['model_type']
-            if model_type not in model_stats:
-                model_stats[model_type] = {
-                    'Mean_Error': [],
-                    'Prediction_Count': 0
-                }
-            
-            # Calculate error (difference between predicted and actual time)
-            # For now, we'll use a placeholder error calculation
-            error = abs(pred['predicted_time'] - 90)  # Assuming 90s as a baseline
-            model_stats[model_type]['Mean_Error'].append(error)
-            model_stats[model_type]['Prediction_Count'] += 1
-    
-    # Calculate statistics for each model
-    for model in model_stats:
-        stats = model_stats[model]
-        stats['Mean_Error_mean'] = sum(stats['Mean_Error']) / len(stats['Mean_Error'])
-        stats['Mean_Error_std'] = pd.Series(stats['Mean_Error']).std()
-        stats['Mean_Error_min'] = min(stats['Mean_Error'])
-        stats['Mean_Error_max'] = max(stats['Mean_Error'])
-        
-        # Remove raw data lists
-        del stats['Mean_Error']
-    
-    return model_stats
-
-def calculate_race_trends(predictions: Dict) -> List[Dict]:
+    stats = df.groupby('Driver')[['Predicted_Time', 'Predicted_Position']].agg(STATS)
+    return _to_records(_flatten_columns(stats))
+
+def calculate_model_comparison(df: pd.DataFrame) -> Dict:
+    """Calculate model comparison statistics from each race's model error."""
+    per_race = df.groupby(['Model Type', 'Grand Prix']).agg(
+        Mean_Error=('Model_Error', 'first'),
+        Prediction_Count=('Driver', 'size')
+    )
+
+    stats = _flatten_columns(per_race.groupby('Model Type')[['Mean_Error']].agg(STATS))
+    stats.insert(0, 'Prediction_Count', per_race.groupby('Model Type')['Prediction_Count'].sum())
+    return _to_records(stats)
+
+def calculate_race_trends(df: pd.DataFrame) -> List[Dict]:
     """Calculate race-specific trends and statistics."""
-    race_trends = []
-    
-    for race, race_predictions in predictions.items():
-        race_data = {
-            'Grand Prix': race,
-            'Best Model': '',
-            'Worst Model': '',
-            'Prediction Spread': 0,
-            'Last Updated': datetime.now().isoformat()
-        }
-        
-        # Calculate model performance for this race
-        model_performance = {}
-        for pred in race_predictions:
-            model_type = pred['model_type']
-            if model_type not in model_performance:
-                model_performance[model_type] = []
-            
-            # Use the same error calculation as in model comparison
-            error = abs(pred['predicted_time'] - 90)
-            model_performance[model_type].append(error)
-        
-        # Find best and worst models
-        model_means = {model: sum(errors) / len(errors) 
-                      for model, errors in model_performance.items()}
-        
-        if model_means:
-            race_data['Best Model'] = min(model_means.items(), key=lambda x: x[1])[0]
-            race_data['Worst Model'] = max(model_means.items(), key=lambda x: x[1])[0]
-        
-        # Calculate prediction spread
-        times = [pred['predicted_time'] for pred in race_predictions]
-        race_data['Prediction Spread'] = max(times) - min(times)
-        
-        race_trends.append(race_data)
-    
-    return race_trends
+    races = df['Grand Prix'].unique()
+    model_errors = df.groupby(['Grand Prix', 'Model Type'])['Model_Error'].first().unstack().reindex(races)
+    times = df.groupby('Grand Prix')['Predicted_Time'].agg(['min', 'max']).reindex(races)
+
+    trends = pd.DataFrame({
+        'Grand Prix': model_errors.index,
+        'Best Model': model_errors.idxmin(axis=1).to_numpy(),
+        'Worst Model': model_errors.idxmax(axis=1).to_numpy(),
+        'Prediction Spread': (times['max'] - times['min']).to_numpy(),
+        'Last Updated': datetime.now().isoformat()
+    })
+    return trends.to_dict('records')
 
 def generate_race_analytics():
     """Generate comprehensive race analytics data."""
-    predictions = load_predictions()
-    
+    df = flatten_predictions(load_predictions())
+
     analytics = {
-        'driver_stats': calculate_driver_stats(predictions),
-        'model_comparison': calculate_model_comparison(predictions),
-        'race_trends': calculate_race_trends(predictions),
+        'driver_stats': calculate_driver_stats(df),
+        'model_comparison': calculate_model_comparison(df),
+        'race_trends': calculate_race_trends(df),
         'last_updated': datetime.now().isoformat()
     }
-    
+
     # Save analytics to JSON file
-    analytics_path = os.path.join('../public', 'predictions', 'race_analytics.json')
+    analytics_path = os.path.join(PREDICTIONS_DIR, 'race_analytics.json')
     with open(analytics_path, 'w') as f:
         json.dump(analytics, f, indent=2)
-    
+
     print(f"Race analytics generated and saved to {analytics_path}")
 
 if __name__ == '__main__':
-    generate_race_analytics() 
\ No newline at end of file
+    generate_race_analytics()
@@ -0,0 +1,52 @@
+import argparse
+import os
+import sys
+import time
+
+# Add the parent directory to the path so we can import our prediction modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from yuki import f1cache
+from yuki.data import race_calendar
+from yuki.live import LiveRace, lap_records, replay
+from yuki.model_store import ModelStore
+from yuki.prediction import MODEL_TYPES, fit_race_model, load_race_features
+
+from precompute_predictions import PREDICTION_YEAR, SHARD_DIR, race_slug, write_json
+
+def live_shard_path(gp_name):
+    """Live shard next to the race's precomputed shard, polled by its race page."""
+    return os.path.join(SHARD_DIR, f"{race_slug(gp_name)}.live.json")
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a race from the FastF1 cache and push the live predicted order to its shard.")
+    parser.add_argument("gp", choices=race_calendar(PREDICTION_YEAR - 1), metavar="GP", help='name of the Grand Prix, e.g. "Bahrain"')
+    parser.add_argument("--replay-year", type=int, default=PREDICTION_YEAR - 1,
+                        help=f"season whose race is replayed (default: {PREDICTION_YEAR - 1})")
+    parser.add_argument("--model", default="advanced", choices=MODEL_TYPES)
+    parser.add_argument("--speed", type=float, default=0,
+                        help="replay speed relative to real time, e.g. 10; 0 replays as fast as possible (default: 0)")
+    parser.add_argument("--offline", action="store_true", default=f1cache.OFFLINE,
+                        help="only use sessions already in the FastF1 cache (default: $YUKI_OFFLINE)")
+    args = parser.parse_args()
+
+    f1cache.enable(offline=args.offline)
+    os.makedirs(SHARD_DIR, exist_ok=True)
+
+    # The model is fitted once up front; each lap only re-scores it
+    features = load_race_features(PREDICTION_YEAR, args.gp)
+    model, mae = fit_race_model(args.gp, args.model, features, ModelStore())
+    laps = f1cache.load_session(args.replay_year, args.gp, "R").laps
+    live_race = LiveRace(args.gp, args.model, model, features, int(laps["LapNumber"].max()))
+
+    for result in replay(live_race, lap_records(laps), args.speed):
+        start = time.perf_counter()
+        write_json({**result, "model_error": mae}, live_shard_path(args.gp))
+        leader = result["predictions"][0]["Driver"]
+        print(f"Lap {result['lap']}/{result['total_laps']}: {len(result['changes'])} position changes, "
+              f"projected winner {leader} (pushed in {(time.perf_counter() - start) * 1000:.1f} ms)")
+
+    print(f"Live predictions saved to {live_shard_path(args.gp)}")
+
+if __name__ == "__main__":
+    main()
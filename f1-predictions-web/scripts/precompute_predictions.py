@@ -1,145 +1,414 @@
+import argparse
+import hashlib
 import json
+import multiprocessing
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
-import fastf1
 import pandas as pd
-import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import GradientBoostingRegressor
-from sklearn.metrics import mean_absolute_error
 
 # Add the parent directory to the path so we can import our prediction modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-# Enable FastF1 caching
-fastf1.Cache.enable_cache("f1_cache")
+from yuki import f1cache
+from yuki.data import race_calendar
+from yuki.instrument import StageLog, activate, active_log, stage, summarise
+from yuki.prediction import FEATURE_COLUMNS, MODEL_PARAMS, MODEL_TYPES, load_race_features
+from yuki.prediction import run_prediction as run_model
 
-# List of all 2024 F1 races
-RACES_2024 = [
-    "Bahrain", "Saudi Arabia", "Australia", "Japan", "China", "Miami",
-    "Emilia Romagna", "Monaco", "Canada", "Spain", "Austria", "Great Britain",
-    "Hungary", "Belgium", "Netherlands", "Italy", "Azerbaijan", "Singapore",
-    "United States", "Mexico", "Brazil", "Las Vegas", "Qatar", "Abu Dhabi"
-]
+# Shared FastF1 cache (YUKI_F1_CACHE, or f1_cache/ at the repository root), enabled in main and in each worker
+CACHE_DIR = f1cache.DEFAULT_CACHE_DIR
 
-def run_prediction(gp_name, model_type="advanced"):
+# Predictions are for the 2025 season, trained on the 2024 race at each Grand Prix
+PREDICTION_YEAR = 2025
+
+# Bump when the manifest layout, the fingerprinted inputs or the result schema change,
+# so shards written by an older run are recomputed rather than reused
+# (version 2: every prediction carries PredictedPosition)
+MANIFEST_VERSION = 2
+
+PREDICTIONS_DIR = "../public/predictions"
+SHARD_DIR = os.path.join(PREDICTIONS_DIR, "races")
+INDEX_PATH = os.path.join(PREDICTIONS_DIR, "index.json")
+POSITIONS_PATH = os.path.join(PREDICTIONS_DIR, "positions.json")
+OUTPUT_PATH = os.path.join(PREDICTIONS_DIR, "all_predictions.json")
+MANIFEST_PATH = os.path.join(PREDICTIONS_DIR, "all_predictions.manifest.json")
+
+# JSON-lines record of every stage of every run: durations, row counts, memory peaks and cache hits
+STAGE_LOG_PATH = "precompute_stages.jsonl"
+
+def error_result(gp_name, model_type, error):
+    """Build the JSON entry recorded for a model that failed to run."""
+    return {
+        "gp_name": gp_name,
+        "model_type": model_type,
+        "error": str(error),
+        "timestamp": datetime.now().isoformat()
+    }
+
+def run_prediction(gp_name, model_type="advanced", features=None):
     """
     Run predictions for a specific Grand Prix using the specified model type.
     
     Args:
         gp_name (str): Name of the Grand Prix
         model_type (str): Type of model to use ("basic", "advanced", "nochange", "olddrivers")
+        features (dict, optional): Output of load_race_features, loaded on demand if omitted
     
     Returns:
-        dict: Prediction results
+        dict: Prediction results, or the error if the model could not run
     """
     try:
-        # Load the race session
-        session = fastf1.get_session(2024, gp_name, "R")
-        session.load()
-        
-        # Extract lap and sector times
-        laps = session.laps[["Driver", "LapTime", "Sector1Time", "Sector2Time", "Sector3Time"]].copy()
-        laps.dropna(inplace=True)
-        
-        # Convert times to seconds
-        for col in ["LapTime", "Sector1Time", "Sector2Time", "Sector3Time"]:
-            laps[f"{col} (s)"] = laps[col].dt.total_seconds()
-        
-        # Group by driver to get average sector times
-        sector_times = laps.groupby("Driver")[["Sector1Time (s)", "Sector2Time (s)", "Sector3Time (s)"]].mean().reset_index()
+        # Fitted models come from the default model store, reused while their training data is unchanged
+        return run_model(PREDICTION_YEAR, gp_name, model_type, features)
+    except Exception as e:
+        return error_result(gp_name, model_type, e)
+
+def _hash_frame(frame):
+    """Content hash of a DataFrame or Series, independent of its index."""
+    return hashlib.sha256(pd.util.hash_pandas_object(frame, index=False).values.tobytes()).hexdigest()
+
+def _hash_json(value):
+    """Content hash of a JSON-serialisable value."""
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode("utf-8")).hexdigest()
+
+def fingerprint_inputs(features, model_type):
+    """
+    Fingerprint everything a model's predictions depend on.
+    
+    Args:
+        features (dict): Output of load_race_features
+        model_type (str): Type of model the fingerprint is for
+    
+    Returns:
+        dict: Separate hashes for the session data, qualifying table, feature set and hyperparameters
+    """
+    return {
+        "session": _hash_json([_hash_frame(features["sector_times"]), _hash_frame(features["lap_times"])]),
+        "qualifying": _hash_frame(features["qualifying"]),
+        "features": _hash_json(FEATURE_COLUMNS[model_type]),
+        "params": _hash_json(MODEL_PARAMS)
+    }
+
+def predict_race(gp_name, previous_results=None, previous_fingerprints=None):
+    """
+    Run every model type for a Grand Prix on a single session load.
+    
+    Model types whose input fingerprint matches the previous run are not
+    refitted; their previous result is reused as-is.
+    
+    Args:
+        gp_name (str): Name of the Grand Prix
+        previous_results (dict, optional): Last run's results for this race, keyed by model type
+        previous_fingerprints (dict, optional): Last run's manifest entries for this race
+    
+    Returns:
+        tuple: (results keyed by model type, fingerprints keyed by model type, number of reused results)
+    """
+    previous_results = previous_results or {}
+    previous_fingerprints = previous_fingerprints or {}
+    
+    with stage("race", gp=gp_name) as record:
+        try:
+            features = load_race_features(PREDICTION_YEAR, gp_name)
+        except Exception as e:
+            record["error"] = str(e)
+            return {model_type: error_result(gp_name, model_type, e) for model_type in MODEL_TYPES}, {}, 0
         
-        # 2025 Qualifying Data
-        qualifying_2025 = pd.DataFrame({
-            "Driver": ["Oscar Piastri", "George Russell", "Lando Norris", "Max Verstappen", "Lewis Hamilton",
-                      "Charles Leclerc", "Isack Hadjar", "Andrea Kimi Antonelli", "Yuki Tsunoda", "Alexander Albon",
-                      "Esteban Ocon", "Nico Hülkenberg", "Fernando Alonso", "Lance Stroll", "Carlos Sainz Jr.",
-                      "Pierre Gasly", "Oliver Bearman", "Jack Doohan", "Gabriel Bortoleto", "Liam Lawson"],
-            "QualifyingTime (s)": [75.641, 75.723, 75.793, 75.817, 75.927,
-                                  76.021, 76.079, 76.103, 76.638, 76.706,
-                                  76.625, 76.632, 76.688, 76.773, 76.840,
-                                  76.992, 77.018, 77.092, 77.141, 77.174]
-        })
+        results = {}
+        fingerprints = {}
+        reused = 0
+        for model_type in MODEL_TYPES:
+            fingerprint = fingerprint_inputs(features, model_type)
+            previous = previous_results.get(model_type)
+            if previous and "error" not in previous and previous_fingerprints.get(model_type) == fingerprint:
+                results[model_type] = previous
+                reused += 1
+            else:
+                results[model_type] = run_prediction(gp_name, model_type, features)
+            
+            # Failed runs are left out of the manifest so they are retried next time
+            if "error" not in results[model_type]:
+                fingerprints[model_type] = fingerprint
         
-        # Map full names to FastF1 3-letter codes
-        driver_mapping = {
-            "Oscar Piastri": "PIA", "George Russell": "RUS", "Lando Norris": "NOR", "Max Verstappen": "VER",
-            "Lewis Hamilton": "HAM", "Charles Leclerc": "LEC", "Isack Hadjar": "HAD", "Andrea Kimi Antonelli": "ANT",
-            "Yuki Tsunoda": "TSU", "Alexander Albon": "ALB", "Esteban Ocon": "OCO", "Nico Hülkenberg": "HUL",
-            "Fernando Alonso": "ALO", "Lance Stroll": "STR", "Carlos Sainz Jr.": "SAI", "Pierre Gasly": "GAS",
-            "Oliver Bearman": "BEA", "Jack Doohan": "DOO", "Gabriel Bortoleto": "BOR", "Liam Lawson": "LAW"
+        record["reused"] = reused
+        record["failed"] = sum("error" in result for result in results.values())
+        return results, fingerprints, reused
+
+def _init_worker(cache_dir, offline, stage_log=None):
+    """
+    Give each worker process its own handle on the shared FastF1 cache.
+    
+    Args:
+        cache_dir (str): FastF1 cache directory
+        offline (bool): Serve only cached sessions, as in the parent
+        stage_log (tuple, optional): (path, trace_memory, run_id) of the parent's stage log
+    """
+    f1cache.enable(cache_dir, offline)
+    if stage_log:
+        activate(StageLog(*stage_log))
+
+def predict_races_serial(races, previous_fingerprints):
+    """
+    Run predict_race for each Grand Prix in turn.
+    
+    Yields:
+        tuple: (Grand Prix, predict_race output), in calendar order
+    """
+    for gp in races:
+        print(f"Computing predictions for {gp}...")
+        yield gp, predict_race(gp, load_shard(gp), previous_fingerprints.get(gp))
+
+def predict_races_parallel(races, workers, previous_fingerprints):
+    """
+    Run predict_race for each Grand Prix across a pool of worker processes.
+    
+    Workers are spawned rather than forked so none of them inherits the
+    parent's open cache connections, and each race is handled by exactly one
+    worker so no two processes write the same session files in the cache.
+    
+    Args:
+        races (list): Names of the Grands Prix to compute
+        workers (int): Number of worker processes
+        previous_fingerprints (dict): Last run's manifest entries keyed by Grand Prix
+    
+    Yields:
+        tuple: (Grand Prix, predict_race output), in completion order
+    """
+    context = multiprocessing.get_context("spawn")
+    log = active_log()
+    stage_log = (os.path.abspath(log.path), log.trace_memory, log.run_id) if log else None
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=(CACHE_DIR, f1cache.is_offline(), stage_log)) as executor:
+        futures = {
+            executor.submit(predict_race, gp, load_shard(gp), previous_fingerprints.get(gp)): gp
+            for gp in races
         }
-        
-        qualifying_2025["DriverCode"] = qualifying_2025["Driver"].map(driver_mapping)
-        
-        # Merge qualifying data with sector times
-        merged_data = qualifying_2025.merge(sector_times, left_on="DriverCode", right_on="Driver", how="left")
-        
-        # Define feature set based on model type
-        if model_type == "basic":
-            X = merged_data[["QualifyingTime (s)"]]
-        else:
-            X = merged_data[["QualifyingTime (s)", "Sector1Time (s)", "Sector2Time (s)", "Sector3Time (s)"]].fillna(0)
-        
-        y = laps.groupby("Driver")["LapTime (s)"].mean().reset_index()["LapTime (s)"]
-        
-        # Train model with train_test_split
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=38)
-        model = GradientBoostingRegressor(n_estimators=200, learning_rate=0.1, random_state=38)
-        model.fit(X_train, y_train)
-        
-        # Make predictions
-        predicted_times = model.predict(X)
-        qualifying_2025["PredictedRaceTime (s)"] = predicted_times
-        
-        # Sort by predicted time
-        qualifying_2025 = qualifying_2025.sort_values(by="PredictedRaceTime (s)")
-        
-        # Calculate model error
-        y_pred = model.predict(X_test)
-        mae = mean_absolute_error(y_test, y_pred)
-        
-        # Convert to list of dictionaries for JSON serialization
-        results = qualifying_2025[["Driver", "PredictedRaceTime (s)"]].to_dict('records')
-        
-        return {
-            "gp_name": gp_name,
-            "model_type": model_type,
-            "predictions": results,
-            "model_error": mae,
-            "timestamp": datetime.now().isoformat()
+        for future in as_completed(futures):
+            gp = futures[future]
+            print(f"Computed predictions for {gp}")
+            yield gp, future.result()
+
+def predict_races_batch(races, workers):
+    """
+    Fit every selected race and model type in one batched sweep.
+    
+    Batch mode always refits the selected races, but still records their
+    fingerprints so later incremental runs can skip them.
+    
+    Args:
+        races (list): Names of the Grands Prix to compute
+        workers (int): Number of joblib worker processes
+    
+    Returns:
+        dict: predict_race-style output keyed by Grand Prix
+    """
+    from yuki.batch import build_batch, fit_batch
+    
+    batch = build_batch(PREDICTION_YEAR, races)
+    results = fit_batch(batch, MODEL_TYPES, n_jobs=workers)
+    
+    outputs = {}
+    for gp in races:
+        if gp in batch["errors"]:
+            error = batch["errors"][gp]
+            outputs[gp] = ({model_type: error_result(gp, model_type, error) for model_type in MODEL_TYPES}, {}, 0)
+            continue
+        fingerprints = {
+            model_type: fingerprint_inputs(batch["features"][gp], model_type)
+            for model_type in MODEL_TYPES if "error" not in results[gp][model_type]
         }
-        
-    except Exception as e:
-        return {
-            "gp_name": gp_name,
-            "model_type": model_type,
-            "error": str(e),
-            "timestamp": datetime.now().isoformat()
+        outputs[gp] = (results[gp], fingerprints, 0)
+    return outputs
+
+def race_slug(gp_name):
+    """URL slug for a Grand Prix, matching the web app's /race/[slug] routes."""
+    return gp_name.lower().replace(" ", "-")
+
+def shard_path(gp_name):
+    return os.path.join(SHARD_DIR, f"{race_slug(gp_name)}.json")
+
+def write_json(value, path):
+    """Write compact JSON via a temporary file so readers never see a partial file."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(value, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+def load_shard(gp_name):
+    """Load a race's predictions from its shard, or None if it has not been computed."""
+    try:
+        with open(shard_path(gp_name), "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def index_entry(gp_name, results):
+    """
+    Summarise a race's predictions for the index file.
+    
+    Args:
+        gp_name (str): Name of the Grand Prix
+        results (dict): Prediction results keyed by model type
+    
+    Returns:
+        dict: Shard location plus per-model error, timestamp and number of predictions
+    """
+    models = {}
+    for model_type, result in results.items():
+        if "error" in result:
+            models[model_type] = {"error": result["error"], "timestamp": result["timestamp"]}
+        else:
+            models[model_type] = {
+                "model_error": result["model_error"],
+                "timestamp": result["timestamp"],
+                "predictions_count": len(result["predictions"])
+            }
+    return {"name": gp_name, "slug": race_slug(gp_name), "shard": f"races/{race_slug(gp_name)}.json", "models": models}
+
+def write_positions(races):
+    """
+    Write the race x driver matrix of predicted positions for every model type.
+    
+    Shards are read one at a time. Drivers missing from a race, and models that
+    failed, are null.
+    """
+    drivers = []
+    race_positions = []
+    for gp in races:
+        positions = {}
+        for model_type, result in load_shard(gp).items():
+            if "error" in result:
+                continue
+            positions[model_type] = {
+                prediction["Driver"]: prediction["PredictedPosition"] for prediction in result["predictions"]
+            }
+            drivers.extend(driver for driver in positions[model_type] if driver not in drivers)
+        race_positions.append(positions)
+    
+    write_json({
+        "races": races,
+        "drivers": drivers,
+        "positions": {
+            model_type: [[positions.get(model_type, {}).get(driver) for driver in drivers] for positions in race_positions]
+            for model_type in MODEL_TYPES
         }
+    }, POSITIONS_PATH)
+
+def write_aggregate(races):
+    """Stream the race shards into the monolithic all_predictions.json, one race at a time."""
+    tmp_path = f"{OUTPUT_PATH}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write("{")
+        for i, gp in enumerate(races):
+            with open(shard_path(gp), "r") as shard:
+                f.write(f"{',' if i else ''}{json.dumps(gp)}:{shard.read()}")
+        f.write("}")
+    os.replace(tmp_path, OUTPUT_PATH)
+
+def load_previous_fingerprints():
+    """
+    Load the last run's manifest entries, if the manifest exists and matches.
+    
+    Returns:
+        dict: Manifest entries keyed by Grand Prix, or None if there is no manifest of this version
+    """
+    if not os.path.exists(MANIFEST_PATH):
+        return None
+    
+    with open(MANIFEST_PATH, "r") as f:
+        manifest = json.load(f)
+    
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest.get("entries", {})
 
 def main():
-    # Create predictions directory if it doesn't exist
-    os.makedirs("../public/predictions", exist_ok=True)
+    # Grands Prix of the training season, from the season store once it is ingested
+    calendar = race_calendar(PREDICTION_YEAR - 1)
     
-    # Run predictions for all races and model types
-    all_predictions = {}
+    parser = argparse.ArgumentParser(description="Precompute predictions for every race and model type.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of worker processes to spread races across (default: 1, serial)")
+    parser.add_argument("--races", nargs="+", choices=calendar, metavar="GP",
+                        help="only recheck these Grands Prix and keep the rest from the previous run")
+    parser.add_argument("--full", action="store_true",
+                        help="ignore the manifest and recompute every race and model type")
+    parser.add_argument("--batch", action="store_true",
+                        help="refit the selected races in one batched sweep across --workers processes")
+    parser.add_argument("--no-aggregate", dest="aggregate", action="store_false",
+                        help="only write the per-race shards and index, not all_predictions.json")
+    parser.add_argument("--stage-log", default=STAGE_LOG_PATH,
+                        help=f"JSON-lines file the per-stage timings are appended to (default: {STAGE_LOG_PATH})")
+    parser.add_argument("--no-trace-memory", dest="trace_memory", action="store_false",
+                        help="skip tracemalloc peaks, which slow the run down")
+    parser.add_argument("--summary", action="store_true",
+                        help="print a per-stage timing table at the end of the run")
+    parser.add_argument("--offline", action="store_true", default=f1cache.OFFLINE,
+                        help="only use sessions already in the FastF1 cache and fail fast on the rest (default: $YUKI_OFFLINE)")
+    args = parser.parse_args()
     
-    for gp in RACES_2024:
-        print(f"Computing predictions for {gp}...")
-        all_predictions[gp] = {
-            "basic": run_prediction(gp, "basic"),
-            "advanced": run_prediction(gp, "advanced"),
-            "nochange": run_prediction(gp, "nochange"),
-            "olddrivers": run_prediction(gp, "olddrivers")
-        }
+    f1cache.enable(CACHE_DIR, args.offline)
+    
+    log = StageLog(args.stage_log, args.trace_memory)
+    activate(log)
+    
+    # Create predictions directories if they don't exist
+    os.makedirs(SHARD_DIR, exist_ok=True)
+    
+    previous_fingerprints = None if args.full else load_previous_fingerprints()
+    
+    # Races outside --races are carried over, unless the previous run never produced them or its
+    # shards predate this manifest version
+    full = previous_fingerprints is None
+    previous_fingerprints = previous_fingerprints or {}
+    races = [gp for gp in calendar
+             if full or not args.races or gp in args.races or not os.path.exists(shard_path(gp))]
+    
+    # Run predictions for the selected races and all model types
+    if args.batch:
+        race_outputs = predict_races_batch(races, args.workers).items()
+    elif args.workers > 1:
+        race_outputs = predict_races_parallel(races, args.workers, previous_fingerprints)
+    else:
+        race_outputs = predict_races_serial(races, previous_fingerprints)
+    
+    # Write each race's shard as soon as it is done, keeping only its summary in memory
+    index = {}
+    entries = {}
+    reused = 0
+    for gp, (results, fingerprints, race_reused) in race_outputs:
+        with stage("serialize", gp=gp, rows=sum(len(result.get("predictions", [])) for result in results.values())):
+            write_json(results, shard_path(gp))
+        index[gp] = index_entry(gp, results)
+        entries[gp] = fingerprints
+        reused += race_reused
+    
+    for gp in calendar:
+        if gp not in index:
+            index[gp] = index_entry(gp, load_shard(gp))
+            entries[gp] = previous_fingerprints.get(gp, {})
+    
+    print(f"Reused {reused} of {len(races) * len(MODEL_TYPES)} model results with unchanged inputs")
+    
+    # Keep the calendar order regardless of which worker finished first
+    write_json({"races": [index[gp] for gp in calendar]}, INDEX_PATH)
+    with open(MANIFEST_PATH, "w") as f:
+        json.dump({"version": MANIFEST_VERSION, "entries": {gp: entries[gp] for gp in calendar}}, f, indent=2)
+    write_positions(calendar)
+    print("Predictions saved to public/predictions/races/, index.json and positions.json")
     
-    # Save to JSON file
-    with open("../public/predictions/all_predictions.json", "w") as f:
-        json.dump(all_predictions, f, indent=2)
+    if args.aggregate:
+        with stage("aggregate"):
+            write_aggregate(calendar)
+        print("Predictions saved to public/predictions/all_predictions.json")
     
-    print("Predictions saved to public/predictions/all_predictions.json")
+    print(f"Stage timings appended to {args.stage_log}")
+    if args.summary:
+        print("\nStage Summary:")
+        print(summarise(args.stage_log, log.run_id).round(3).to_string())
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import json
+import os
+import sys
+import time
+import zlib
+from datetime import datetime
+import numpy as np
+
+# Add the parent directory to the path so we can import our prediction modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from yuki.simulation import iter_simulations, probability_table, residual_scale
+
+from generate_race_analytics import PREDICTIONS_DIR, load_predictions
+
+OUTPUT_PATH = os.path.join(PREDICTIONS_DIR, "probabilities.json")
+
+def simulate_predictions(predictions, n_simulations=100_000, seed=0, progress=False):
+    """
+    Simulate every race and model type around its point predictions.
+
+    Noise is normal with the spread implied by each model's mean absolute error.
+    Each race and model gets its own child seed of `seed`, so results do not
+    depend on which other races are simulated.
+
+    Args:
+        predictions (dict): Predictions keyed by Grand Prix and model type
+        n_simulations (int): Simulated races per Grand Prix and model type
+        seed (int): Root seed
+        progress (bool): Print the running favourite after each batch
+
+    Returns:
+        dict: Probability tables keyed by Grand Prix and model type
+    """
+    root = np.random.SeedSequence(seed)
+    tables = {}
+    for gp, models in predictions.items():
+        tables[gp] = {}
+        for model_type, result in sorted(models.items()):
+            if "error" in result:
+                continue
+            drivers = [prediction["Driver"] for prediction in result["predictions"]]
+            times = [prediction["PredictedRaceTime (s)"] for prediction in result["predictions"]]
+            race_seed = np.random.SeedSequence(root.entropy, spawn_key=(zlib.crc32(f"{gp}/{model_type}".encode("utf-8")),))
+
+            for partial in iter_simulations(times, n_simulations, scale=residual_scale(result["model_error"]), seed=race_seed):
+                if progress:
+                    leader = int(np.argmax(partial["win"]))
+                    print(f"{gp} {model_type}: {partial['simulations']}/{n_simulations}, "
+                          f"favourite {drivers[leader]} ({partial['win'][leader]:.1%})")
+            tables[gp][model_type] = {
+                "model_error": result["model_error"],
+                "drivers": probability_table(drivers, partial)
+            }
+    return tables
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate every race to estimate win, podium and points probabilities.")
+    parser.add_argument("--simulations", type=int, default=100_000, help="simulated races per race and model (default: 100000)")
+    parser.add_argument("--seed", type=int, default=0, help="root seed for reproducible results (default: 0)")
+    parser.add_argument("--progress", action="store_true", help="print running results after each batch")
+    args = parser.parse_args()
+    if args.simulations < 1:
+        parser.error("--simulations must be at least 1")
+
+    start = time.perf_counter()
+    tables = simulate_predictions(load_predictions(), args.simulations, args.seed, args.progress)
+    elapsed = time.perf_counter() - start
+
+    with open(OUTPUT_PATH, "w") as f:
+        json.dump({
+            "simulations": args.simulations,
+            "seed": args.seed,
+            "races": tables,
+            "last_updated": datetime.now().isoformat()
+        }, f, separators=(",", ":"))
+    print(f"Simulated {args.simulations} races for {len(tables)} Grands Prix in {elapsed:.1f}s")
+    print(f"Probabilities saved to {OUTPUT_PATH}")
+
+if __name__ == "__main__":
+    main()
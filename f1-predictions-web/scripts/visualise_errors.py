@@ -1,90 +1,245 @@
+import argparse
+import hashlib
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
 import numpy as np
 
-def load_predictions():
-    """Load predictions from the JSON file"""
-    with open("../public/predictions/all_predictions.json", "r") as f:
-        return json.load(f)
-
-def create_error_visualisations():
-    """Create visualisations of model errors across races"""
-    predictions = load_predictions()
-    
-    # Create a DataFrame to store errors
-    error_data = []
-    for gp, models in predictions.items():
-        for model_type, data in models.items():
-            if "model_error" in data:
-                error_data.append({
-                    "Grand Prix": gp,
-                    "Model Type": model_type,
-                    "Error (seconds)": data["model_error"]
-                })
-    
-    df = pd.DataFrame(error_data)
-    
+PREDICTIONS_DIR = "../public/predictions"
+PANELS_DIR = os.path.join(PREDICTIONS_DIR, "panels")
+
+# Rewritten by every precompute run, unlike all_predictions.json under --no-aggregate
+INDEX_PATH = os.path.join(PREDICTIONS_DIR, "index.json")
+PANELS_MANIFEST_PATH = os.path.join(PANELS_DIR, "manifest.json")
+
+# Per-season walk-forward errors written by backtest_models.py
+BACKTEST_PATH = os.path.join(PREDICTIONS_DIR, "backtest.csv")
+
+# Bump when panel styling changes so every panel is re-rendered
+PANEL_VERSION = 1
+
+# Web panel sizes in inches at PANEL_DPI, and the formats written for each panel
+PANEL_DPI = 100
+PANEL_FORMATS = ["png", "webp"]
+
+def load_model_errors():
+    """Per-model error entries keyed by Grand Prix and model type, from the predictions index"""
+    with open(INDEX_PATH, "r") as f:
+        index = json.load(f)
+    return {race["name"]: race["models"] for race in index["races"]}
+
+def load_backtest_errors(path=BACKTEST_PATH):
+    """Walk-forward backtest errors, averaged over seasons per Grand Prix and model type."""
+    results = pd.read_csv(path)
+    return results.groupby(["Grand Prix", "Model Type"], sort=False)["Error (seconds)"].mean().reset_index()
+
+def build_error_frames(predictions=None, backtest=False):
+    """
+    Build the error data used by every chart.
+
+    Args:
+        predictions (dict, optional): Results or index entries with a model_error, keyed by Grand Prix and model type;
+            read from index.json if omitted
+        backtest (bool): Use the walk-forward backtest errors instead of each model's held-out split error
+
+    Returns:
+        tuple: (long error DataFrame, race x model pivot, model correlation matrix)
+    """
+    if backtest:
+        df = load_backtest_errors()
+    else:
+        if predictions is None:
+            predictions = load_model_errors()
+
+        # Create a DataFrame to store errors
+        error_data = []
+        for gp, models in predictions.items():
+            for model_type, data in models.items():
+                if "model_error" in data:
+                    error_data.append({
+                        "Grand Prix": gp,
+                        "Model Type": model_type,
+                        "Error (seconds)": data["model_error"]
+                    })
+
+        df = pd.DataFrame(error_data)
+    pivot_df = df.pivot(index="Grand Prix", columns="Model Type", values="Error (seconds)")
+    correlation = pivot_df.corr()
+    return df, pivot_df, correlation
+
+def draw_box(ax, df):
+    sns.boxplot(data=df, x="Model Type", y="Error (seconds)", ax=ax)
+    ax.set_title('Distribution of Prediction Errors by Model Type', fontsize=14)
+    ax.tick_params(axis='x', labelrotation=45)
+
+def draw_lines(ax, df):
+    for model_type in df["Model Type"].unique():
+        model_data = df[df["Model Type"] == model_type]
+        ax.plot(model_data["Grand Prix"], model_data["Error (seconds)"],
+                marker='o', label=model_type)
+    ax.set_title('Prediction Errors Across Races', fontsize=14)
+    plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+    ax.legend()
+    ax.grid(True)
+
+def draw_heatmap(ax, pivot_df):
+    sns.heatmap(pivot_df, annot=True, cmap="YlOrRd", fmt=".2f", ax=ax)
+    ax.set_title('Error Heatmap by Race and Model Type', fontsize=14)
+
+def draw_correlation(ax, correlation):
+    sns.heatmap(correlation, annot=True, cmap="coolwarm", vmin=-1, vmax=1, ax=ax)
+    ax.set_title('Correlation Between Model Types', fontsize=14)
+
+def draw_violin(ax, df):
+    sns.violinplot(data=df, x="Model Type", y="Error (seconds)", ax=ax)
+    ax.set_title('Error Distribution by Model Type', fontsize=14)
+    ax.tick_params(axis='x', labelrotation=45)
+
+def draw_scatter(ax, df):
+    sns.scatterplot(data=df, x="Grand Prix", y="Error (seconds)",
+                   hue="Model Type", style="Model Type", ax=ax)
+    ax.set_title('Error Scatter Plot by Race', fontsize=14)
+    plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+
+# Web panels: draw function, the frame it plots ("errors", "pivot" or "correlation") and its size in inches
+PANELS = {
+    "error_box": (draw_box, "errors", (8, 5)),
+    "error_lines": (draw_lines, "errors", (10, 5)),
+    "error_heatmap": (draw_heatmap, "pivot", (8, 10)),
+    "error_correlation": (draw_correlation, "correlation", (6, 5)),
+    "error_violin": (draw_violin, "errors", (8, 5)),
+    "error_scatter": (draw_scatter, "errors", (10, 5))
+}
+
+def panel_fingerprint(name, frame):
+    """Hash of a panel's data and rendering settings."""
+    _, _, size = PANELS[name]
+    settings = json.dumps([PANEL_VERSION, name, size, PANEL_DPI, PANEL_FORMATS])
+    return hashlib.sha256((settings + frame.to_csv()).encode("utf-8")).hexdigest()
+
+def render_panel(name, frame):
+    """
+    Render one chart on its own figure and save it in every web format.
+
+    Args:
+        name (str): Key in PANELS
+        frame (pd.DataFrame): Data the panel plots
+
+    Returns:
+        str: The panel name, once its files are written
+    """
+    draw, _, size = PANELS[name]
+    plt.style.use('ggplot')
+    fig, ax = plt.subplots(figsize=size)
+    draw(ax, frame)
+    fig.tight_layout()
+    for fmt in PANEL_FORMATS:
+        fig.savefig(os.path.join(PANELS_DIR, f"{name}.{fmt}"), dpi=PANEL_DPI, format=fmt)
+    plt.close(fig)
+    return name
+
+def render_panels(frames, workers=None, force=False):
+    """
+    Render each chart as a separate web-sized image, skipping unchanged panels.
+
+    A panel is re-rendered only when the data it plots or its rendering
+    settings have changed since the last run; changed panels are rendered in
+    parallel processes.
+
+    Args:
+        frames (dict): Panel data keyed by "errors", "pivot" and "correlation"
+        workers (int, optional): Number of rendering processes, one per core if omitted
+        force (bool): Re-render every panel regardless of the manifest
+
+    Returns:
+        list: Names of the panels that were rendered
+    """
+    os.makedirs(PANELS_DIR, exist_ok=True)
+    manifest = {}
+    if not force and os.path.exists(PANELS_MANIFEST_PATH):
+        with open(PANELS_MANIFEST_PATH, "r") as f:
+            manifest = json.load(f)
+
+    fingerprints = {name: panel_fingerprint(name, frames[source]) for name, (_, source, _) in PANELS.items()}
+    stale = [
+        name for name in PANELS
+        if manifest.get(name) != fingerprints[name]
+        or not all(os.path.exists(os.path.join(PANELS_DIR, f"{name}.{fmt}")) for fmt in PANEL_FORMATS)
+    ]
+
+    if stale:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            rendered = list(executor.map(render_panel, stale, [frames[PANELS[name][1]] for name in stale]))
+    else:
+        rendered = []
+
+    with open(PANELS_MANIFEST_PATH, "w") as f:
+        json.dump(fingerprints, f, indent=2)
+
+    return rendered
+
+def create_error_figure(df, pivot_df, correlation):
+    """Create the combined, print-resolution figure of every chart"""
     # Set the style
     plt.style.use('ggplot')
-    
+
     # Create figure with subplots
     fig = plt.figure(figsize=(20, 24))
     gs = fig.add_gridspec(4, 2)
-    
+
     # Main title
     fig.suptitle('Model Error Analysis Across F1 2024 Races', fontsize=20, y=0.95)
-    
+
     # Plot 1: Box plot of errors by model type
-    ax1 = fig.add_subplot(gs[0, 0])
-    sns.boxplot(data=df, x="Model Type", y="Error (seconds)", ax=ax1)
-    ax1.set_title('Distribution of Prediction Errors by Model Type', fontsize=14)
-    ax1.set_xticklabels(ax1.get_xticklabels(), rotation=45)
-    
+    draw_box(fig.add_subplot(gs[0, 0]), df)
+
     # Plot 2: Line plot of errors across races
-    ax2 = fig.add_subplot(gs[0, 1])
-    for model_type in df["Model Type"].unique():
-        model_data = df[df["Model Type"] == model_type]
-        ax2.plot(model_data["Grand Prix"], model_data["Error (seconds)"], 
-                marker='o', label=model_type)
-    ax2.set_title('Prediction Errors Across Races', fontsize=14)
-    ax2.set_xticklabels(ax2.get_xticklabels(), rotation=45, ha='right')
-    ax2.legend()
-    ax2.grid(True)
-    
+    draw_lines(fig.add_subplot(gs[0, 1]), df)
+
     # Plot 3: Heatmap of errors by race and model type
-    ax3 = fig.add_subplot(gs[1, :])
-    pivot_df = df.pivot(index="Grand Prix", columns="Model Type", values="Error (seconds)")
-    sns.heatmap(pivot_df, annot=True, cmap="YlOrRd", fmt=".2f", ax=ax3)
-    ax3.set_title('Error Heatmap by Race and Model Type', fontsize=14)
-    
+    draw_heatmap(fig.add_subplot(gs[1, :]), pivot_df)
+
     # Plot 4: Correlation plot between model types
-    ax4 = fig.add_subplot(gs[2, :])
-    correlation = pivot_df.corr()
-    sns.heatmap(correlation, annot=True, cmap="coolwarm", vmin=-1, vmax=1, ax=ax4)
-    ax4.set_title('Correlation Between Model Types', fontsize=14)
-    
+    draw_correlation(fig.add_subplot(gs[2, :]), correlation)
+
     # Plot 5: Violin plot of error distributions
-    ax5 = fig.add_subplot(gs[3, 0])
-    sns.violinplot(data=df, x="Model Type", y="Error (seconds)", ax=ax5)
-    ax5.set_title('Error Distribution by Model Type', fontsize=14)
-    ax5.set_xticklabels(ax5.get_xticklabels(), rotation=45)
-    
+    draw_violin(fig.add_subplot(gs[3, 0]), df)
+
     # Plot 6: Scatter plot matrix
-    ax6 = fig.add_subplot(gs[3, 1])
-    sns.scatterplot(data=df, x="Grand Prix", y="Error (seconds)", 
-                   hue="Model Type", style="Model Type", ax=ax6)
-    ax6.set_title('Error Scatter Plot by Race', fontsize=14)
-    ax6.set_xticklabels(ax6.get_xticklabels(), rotation=45, ha='right')
-    
+    draw_scatter(fig.add_subplot(gs[3, 1]), df)
+
     # Adjust layout
     plt.tight_layout()
-    
+
     # Save the figure
     plt.savefig("../public/predictions/model_errors.png", dpi=300, bbox_inches='tight')
+    plt.close(fig)
     print("Error visualisation saved to public/predictions/model_errors.png")
-    
+
+def create_error_visualisations(panels=False, workers=None, force=False, backtest=False):
+    """
+    Create visualisations of model errors across races
+
+    Args:
+        panels (bool): Render separate web-sized panels instead of the combined figure
+        workers (int, optional): Number of processes used to render panels
+        force (bool): Re-render every panel even if its data is unchanged
+        backtest (bool): Chart the walk-forward backtest errors from backtest_models.py
+    """
+    df, pivot_df, correlation = build_error_frames(backtest=backtest)
+
+    if panels:
+        rendered = render_panels({"errors": df, "pivot": pivot_df, "correlation": correlation}, workers, force)
+        print(f"Rendered {len(rendered)} of {len(PANELS)} panels to public/predictions/panels/"
+              f"{': ' + ', '.join(rendered) if rendered else ' (all up to date)'}")
+    else:
+        create_error_figure(df, pivot_df, correlation)
+
     # Create summary statistics
     summary = df.groupby("Model Type")["Error (seconds)"].agg([
         "mean",
@@ -100,25 +255,35 @@ def create_error_visualisations():
         "max": "Max Error",
         "median": "Median Error"
     })
-    
+
     # Save summary to CSV
     summary.to_csv("../public/predictions/error_summary.csv")
     print("Error summary saved to public/predictions/error_summary.csv")
-    
+
     # Save the processed data for the web component
     df.to_csv("../public/predictions/error_data.csv", index=False)
     pivot_df.to_csv("../public/predictions/error_pivot.csv")
     correlation.to_csv("../public/predictions/error_correlation.csv")
-    
+
     return summary
 
 def main():
+    parser = argparse.ArgumentParser(description="Visualise model errors across races.")
+    parser.add_argument("--panels", action="store_true",
+                        help="render each chart as a separate web-sized PNG/WebP, skipping unchanged ones")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of processes used to render panels (default: one per core)")
+    parser.add_argument("--force", action="store_true", help="re-render every panel")
+    parser.add_argument("--backtest", action="store_true",
+                        help="chart the walk-forward errors in backtest.csv instead of the held-out split errors")
+    args = parser.parse_args()
+
     try:
-        summary = create_error_visualisations()
+        summary = create_error_visualisations(args.panels, args.workers, args.force, args.backtest)
         print("\nError Summary by Model Type:")
         print(summary)
     except Exception as e:
         print(f"Error creating visualisations: {str(e)}")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
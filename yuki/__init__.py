@@ -0,0 +1,12 @@
+"""
+Shared building blocks for the Yuki ML prediction scripts.
+
+    >>> from yuki import predict
+    >>> predict(2025, "China", model="advanced")
+
+Importing the package is side-effect free; FastF1, pandas and scikit-learn are
+only loaded when a prediction runs.
+"""
+from yuki.prediction import MODEL_TYPES, predict
+
+__all__ = ["MODEL_TYPES", "predict"]
@@ -0,0 +1,199 @@
+"""
+Walk-forward backtesting of the model types across past seasons.
+
+Races are replayed in calendar order: the fold for race N trains on every
+event before it and is scored on race N's actual mean race lap times, so no
+fold ever sees its own result. Each event's per-driver rows are derived once
+from the columnar feature cache and kept there, folds run across worker
+processes, and fitted fold models go to the model store keyed by their
+training data, so rerunning a backtest only fits folds whose inputs changed.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from yuki.features import DEFAULT_FEATURE_DIR, _feature_path, _read_table, _write_table
+from yuki.prediction import FEATURE_COLUMNS, MODEL_PARAMS, MODEL_TYPES, SECTOR_FEATURES
+
+TARGET = "LapTime (s)"
+
+
+def event_rows(year, gp_name, feature_dir=DEFAULT_FEATURE_DIR):
+    """
+    Per-driver backtest rows for one event, derived on first use and cached.
+
+    Features mirror the predictors: the driver's best qualifying lap at the
+    event and their mean sector times in the previous season's race at the same
+    Grand Prix (0 when that race is missing). The target is the driver's actual
+    mean race lap time.
+
+    Args:
+        year (int): Season of the event
+        gp_name (str): Name of the Grand Prix
+        feature_dir (str): Root directory of the feature cache
+
+    Returns:
+        pd.DataFrame: Driver, SECTOR_FEATURES and LapTime (s) columns
+    """
+    from yuki.features import load_driver_aggregates, load_laps
+    from yuki.season import held_races
+
+    path = _feature_path(year, gp_name, "R", "backtest", feature_dir)
+    if os.path.exists(path):
+        return _read_table(path, None)
+
+    qualifying = load_laps(year, gp_name, "Q", ["Driver", "LapTime (s)"], feature_dir)
+    qualifying = qualifying.groupby("Driver", observed=True)["LapTime (s)"].min().rename("QualifyingTime (s)").reset_index()
+    race = load_driver_aggregates(year, gp_name, "R", ["Driver", TARGET], feature_dir)
+    rows = qualifying.merge(race, on="Driver", how="inner")
+
+    try:
+        if gp_name not in held_races(year - 1):
+            raise LookupError(f"{gp_name} was not held in {year - 1}")
+        sectors = load_driver_aggregates(year - 1, gp_name, "R", ["Driver"] + SECTOR_FEATURES[1:], feature_dir)
+        rows = rows.merge(sectors, on="Driver", how="left")
+    except Exception as e:
+        print(f"No {year - 1} {gp_name} race for sector times: {str(e)}")
+        for column in SECTOR_FEATURES[1:]:
+            rows[column] = np.nan
+
+    rows = rows[["Driver"] + SECTOR_FEATURES + [TARGET]].astype({"Driver": str})
+    _write_table(rows, path)
+    return rows
+
+
+def _load_event(year, gp_name, feature_dir):
+    try:
+        return year, gp_name, event_rows(year, gp_name, feature_dir), None
+    except Exception as e:
+        return year, gp_name, None, str(e)
+
+
+def feature_groups(model_types):
+    """Model types grouped by identical feature columns, so each group is fitted once per fold."""
+    groups = {}
+    for model_type in model_types:
+        groups.setdefault(tuple(FEATURE_COLUMNS[model_type]), []).append(model_type)
+    return groups
+
+
+def run_fold(year, gp_name, train, test, model_types=MODEL_TYPES, store_root=None):
+    """
+    Fit every model type on the events before a race and score them on the race.
+
+    Args:
+        year (int): Season of the held-out race
+        gp_name (str): Name of the held-out race
+        train (pd.DataFrame): Rows of every earlier event
+        test (pd.DataFrame): Rows of the held-out race
+        model_types (list): Model types to score
+        store_root (str, optional): Model store directory, the default store if omitted
+
+    Returns:
+        list: Season, Grand Prix, Model Type, Error (seconds), Drivers and Training Rows records
+    """
+    from sklearn.ensemble import GradientBoostingRegressor
+    from sklearn.metrics import mean_absolute_error
+
+    from yuki.instrument import stage
+    from yuki.model_store import DEFAULT_STORE_DIR, ModelStore, data_fingerprint
+
+    store = ModelStore(store_root or DEFAULT_STORE_DIR)
+    records = []
+    for columns, group in feature_groups(model_types).items():
+        X_train = train[list(columns)].fillna(0)
+        y_train = train[TARGET]
+        key = store.key(f"backtest/{year}/{gp_name}", "+".join(group), columns, MODEL_PARAMS,
+                        data_fingerprint(X_train, y_train))
+        with stage("backtest_fit", year=year, gp=gp_name, model_type="+".join(group), rows=len(X_train)) as record:
+            model = store.load(key)
+            record["model_store_hit"] = model is not None
+            if model is None:
+                model = GradientBoostingRegressor(**MODEL_PARAMS).fit(X_train, y_train)
+                store.save(key, model, {"gp_name": gp_name, "model_type": "+".join(group), "backtest_year": year})
+
+        error = mean_absolute_error(test[TARGET], model.predict(test[list(columns)].fillna(0)))
+        for model_type in group:
+            records.append({
+                "Season": year,
+                "Grand Prix": gp_name,
+                "Model Type": model_type,
+                "Error (seconds)": error,
+                "Drivers": len(test),
+                "Training Rows": len(train)
+            })
+    return records
+
+
+def _init_worker(cache_dir, offline):
+    from yuki import f1cache
+
+    f1cache.enable(cache_dir, offline)
+
+
+def run_backtest(years, races=None, model_types=MODEL_TYPES, workers=1, min_train_events=3,
+                 feature_dir=DEFAULT_FEATURE_DIR, store_root=None):
+    """
+    Replay the listed seasons race by race and score every model type on each race.
+
+    Events are ordered by season, then by their order in `races`. Grands Prix
+    not on a season's real calendar (from the season store, else FastF1's
+    schedule) are skipped, as are events that fail to load.
+
+    Args:
+        years (list): Seasons to replay, oldest first
+        races (list, optional): Names of the Grands Prix, looked up in each season; each season's calendar if omitted
+        model_types (list): Model types to compare
+        workers (int): Number of worker processes for loading events and fitting folds
+        min_train_events (int): Earlier events a fold needs before it is scored
+        feature_dir (str): Root directory of the feature cache
+        store_root (str, optional): Model store directory, the default store if omitted
+
+    Returns:
+        pd.DataFrame: One row per scored race and model type, in replay order
+
+    Raises:
+        ValueError: If there are no events, or no more loaded events than min_train_events
+    """
+    from yuki import f1cache
+    from yuki.season import held_races
+
+    events = []
+    for year in sorted(years):
+        calendar = held_races(year)
+        for gp_name in races or calendar:
+            if gp_name in calendar:
+                events.append((year, gp_name))
+            else:
+                print(f"Skipping {year} {gp_name}: not held that season")
+    if not events:
+        raise ValueError("No events to backtest; pass at least one season and Grand Prix")
+
+    # Workers are spawned so none inherits the parent's open cache connections
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                             initargs=(f1cache._config["cache_dir"] or f1cache.DEFAULT_CACHE_DIR, f1cache.is_offline())) as executor:
+        loaded = []
+        for year, gp_name, rows, error in executor.map(_load_event, *zip(*events), [feature_dir] * len(events)):
+            if error:
+                print(f"Skipping {year} {gp_name}: {error}")
+            elif len(rows):
+                loaded.append((year, gp_name, rows))
+
+        if len(loaded) <= min_train_events:
+            raise ValueError(f"Only {len(loaded)} of {len(events)} events loaded; a backtest needs more than "
+                             f"min_train_events ({min_train_events}) to score any race")
+
+        futures = []
+        for i in range(min_train_events, len(loaded)):
+            year, gp_name, test = loaded[i]
+            train = pd.concat([rows for _, _, rows in loaded[:i]], ignore_index=True)
+            futures.append(executor.submit(run_fold, year, gp_name, train, test, model_types, store_root))
+
+        records = [record for future in futures for record in future.result()]
+
+    return pd.DataFrame(records, columns=["Season", "Grand Prix", "Model Type", "Error (seconds)", "Drivers", "Training Rows"])
+
@@ -0,0 +1,135 @@
+"""
+Batched training of every race and model type in one pass.
+
+All races' feature matrices are stacked into a single NumPy array with a race
+key, so the sweep never goes back through pandas. Model types that share a
+feature set and hyperparameters are fitted once, and the remaining fits are
+spread across processes with joblib.
+"""
+from datetime import datetime
+
+import numpy as np
+
+from yuki.prediction import FEATURE_COLUMNS, MODEL_PARAMS, MODEL_TYPES, SECTOR_FEATURES, load_race_features
+
+
+def build_batch(year, races):
+    """
+    Load every race's features and stack them into flat arrays.
+    
+    Args:
+        year (int): Season being predicted
+        races (list): Names of the Grands Prix
+    
+    Returns:
+        dict: Stacked features "X" (columns in SECTOR_FEATURES order), targets "y",
+            per-race row "offsets" into X and y, driver names, loaded "features"
+            and any load "errors", all keyed by Grand Prix where per-race
+    """
+    X_parts, y_parts = [], []
+    offsets, drivers, features, errors = {}, {}, {}, {}
+    x_start = y_start = 0
+    
+    for gp_name in races:
+        try:
+            race_features = load_race_features(year, gp_name)
+        except Exception as e:
+            errors[gp_name] = e
+            continue
+        
+        X_race = race_features["merged_data"][SECTOR_FEATURES].fillna(0).to_numpy(dtype=np.float64)
+        y_race = race_features["lap_times"].to_numpy(dtype=np.float64)
+        X_parts.append(X_race)
+        y_parts.append(y_race)
+        offsets[gp_name] = (x_start, x_start + len(X_race), y_start, y_start + len(y_race))
+        x_start += len(X_race)
+        y_start += len(y_race)
+        drivers[gp_name] = race_features["qualifying"]["Driver"].to_numpy()
+        features[gp_name] = race_features
+    
+    return {
+        "races": [gp_name for gp_name in races if gp_name in features],
+        "X": np.concatenate(X_parts) if X_parts else np.empty((0, len(SECTOR_FEATURES))),
+        "y": np.concatenate(y_parts) if y_parts else np.empty(0),
+        "offsets": offsets,
+        "drivers": drivers,
+        "features": features,
+        "errors": errors
+    }
+
+
+def _fit_slice(X, y, train_idx, test_idx, params):
+    """Fit one model on pre-sliced arrays and return its predictions and test MAE."""
+    from sklearn.ensemble import GradientBoostingRegressor
+    
+    model = GradientBoostingRegressor(**params).fit(X[train_idx], y[train_idx])
+    mae = float(np.mean(np.abs(y[test_idx] - model.predict(X[test_idx]))))
+    return model.predict(X), mae
+
+
+def fit_batch(batch, model_types=MODEL_TYPES, n_jobs=1):
+    """
+    Fit every race and model type in the batch.
+    
+    Args:
+        batch (dict): Output of build_batch
+        model_types (list): Model types to fit
+        n_jobs (int): Number of joblib worker processes, -1 for all cores
+    
+    Returns:
+        dict: Prediction results in the all_predictions.json layout, keyed by Grand Prix then model type
+    """
+    from joblib import Parallel, delayed
+    from sklearn.model_selection import train_test_split
+    
+    # Model types with the same features and hyperparameters give the same fit
+    feature_sets = {}
+    for model_type in model_types:
+        feature_sets.setdefault(tuple(FEATURE_COLUMNS[model_type]), []).append(model_type)
+    
+    tasks, task_keys, results = [], [], {}
+    for gp_name in batch["races"]:
+        x_start, x_end, y_start, y_end = batch["offsets"][gp_name]
+        results[gp_name] = {}
+        if x_end - x_start != y_end - y_start:
+            error = ValueError(f"{x_end - x_start} qualifying rows but {y_end - y_start} race lap times")
+            for model_type in model_types:
+                results[gp_name][model_type] = {
+                    "gp_name": gp_name,
+                    "model_type": model_type,
+                    "error": str(error),
+                    "timestamp": datetime.now().isoformat()
+                }
+            continue
+        
+        # Same rows as train_test_split(X, y, test_size=0.2, random_state=38) in run_prediction
+        train_idx, test_idx = train_test_split(np.arange(x_end - x_start), test_size=0.2, random_state=38)
+        y_race = batch["y"][y_start:y_end]
+        for columns in feature_sets:
+            column_idx = [SECTOR_FEATURES.index(column) for column in columns]
+            X_race = batch["X"][x_start:x_end, column_idx]
+            tasks.append(delayed(_fit_slice)(X_race, y_race, train_idx, test_idx, MODEL_PARAMS))
+            task_keys.append((gp_name, columns))
+    
+    fitted = Parallel(n_jobs=n_jobs)(tasks)
+    
+    timestamp = datetime.now().isoformat()
+    for (gp_name, columns), (predicted_times, mae) in zip(task_keys, fitted):
+        drivers = batch["drivers"][gp_name]
+        order = np.argsort(predicted_times, kind="stable")
+        # Dense ranks: tied times share a position, as in run_prediction
+        positions = np.unique(predicted_times, return_inverse=True)[1] + 1
+        predictions = [
+            {"Driver": driver, "PredictedRaceTime (s)": float(time), "PredictedPosition": int(position)}
+            for driver, time, position in zip(drivers[order], predicted_times[order], positions[order])
+        ]
+        for model_type in feature_sets[columns]:
+            results[gp_name][model_type] = {
+                "gp_name": gp_name,
+                "model_type": model_type,
+                "predictions": predictions,
+                "model_error": mae,
+                "timestamp": timestamp
+            }
+    
+    return results
@@ -0,0 +1,212 @@
+"""Command line interface: python -m yuki <command> ..."""
+import argparse
+
+from yuki import f1cache
+from yuki.data import race_calendar
+from yuki.prediction import MODEL_TYPES
+
+
+def enable_fastf1_cache(cache_dir=f1cache.DEFAULT_CACHE_DIR, offline=f1cache.OFFLINE):
+    """Enable the shared FastF1 cache, creating its directory if needed."""
+    f1cache.enable(cache_dir, offline)
+
+
+def print_prediction(year, gp_name, model="advanced", title=None, cache_dir=f1cache.DEFAULT_CACHE_DIR, offline=f1cache.OFFLINE):
+    """
+    Run a prediction and print the predicted order and model error.
+    
+    Args:
+        year (int): Season being predicted
+        gp_name (str): Name of the Grand Prix
+        model (str): Type of model to use
+        title (str, optional): Race name used in the heading, "<gp_name> GP" if omitted
+        cache_dir (str): FastF1 cache directory
+        offline (bool): Only use sessions already in the FastF1 cache
+    """
+    import pandas as pd
+    
+    from yuki.prediction import predict
+    
+    enable_fastf1_cache(cache_dir, offline)
+    result = predict(year, gp_name, model)
+    
+    # Print final predictions
+    print(f"\n🏁 Predicted {year} {title or gp_name + ' GP'} Winner with New Drivers and Sector Times 🏁\n")
+    print(pd.DataFrame(result["predictions"]))
+    
+    # Evaluate Model
+    print(f"\n🔍 Model Error (MAE): {result['model_error']:.2f} seconds")
+
+
+def print_radio_search(terms, phrase=None, driver=None, year=None, gp_name=None, start=None, end=None, limit=50):
+    """Refresh the radio index from the store and print matching messages."""
+    from yuki.radio_index import search, update_index
+    
+    update_index()
+    for message in search(terms, phrase, driver, year, gp_name, start, end, limit):
+        emoji = "😡" if message["angry"] else "🏎️"
+        print(f"{emoji} {message['year']} {message['gp']} {message['driver']} {message['timestamp']} - {message['message']}")
+
+
+def run_cache_command(args):
+    """Run one of the "cache" subcommands and print its outcome."""
+    enable_fastf1_cache(args.cache_dir, offline=False)
+    
+    if args.action == "prefetch":
+        races = args.races or race_calendar(args.year)
+        failures = f1cache.prefetch(args.year, races, args.sessions)
+        print(f"Cached {len(races) * len(args.sessions) - len(failures)} of {len(races) * len(args.sessions)} sessions in {args.cache_dir}")
+    elif args.action == "verify":
+        corrupted = f1cache.verify(args.cache_dir, delete=args.delete)
+        for key in corrupted:
+            print(f"{'Deleted' if args.delete else 'Corrupted'}: {key}")
+        print(f"{len(corrupted)} corrupted sessions")
+    elif args.action == "evict":
+        evicted = f1cache.evict(int(args.max_size * 1e9), args.cache_dir)
+        print(f"Evicted {len(evicted)} sessions{': ' + ', '.join(evicted) if evicted else ''}")
+    else:
+        sessions = f1cache.cached_sessions(args.cache_dir)
+        for key in sorted(sessions):
+            print(key)
+        print(f"{len(sessions)} sessions in {args.cache_dir}")
+
+
+def run_corpus_command(args):
+    """Build the lap corpus or train the lap model on it."""
+    import pandas as pd
+    
+    from yuki import corpus
+    
+    enable_fastf1_cache(args.cache_dir, args.offline)
+    if args.action == "build":
+        written = corpus.build_corpus(args.years, args.races, args.sessions, force=args.force)
+        print(f"Added {sum(written.values())} laps from {sum(bool(laps) for laps in written.values())} events")
+    else:
+        data = corpus.load_corpus(corpus.LAP_FEATURES + [corpus.TARGET])
+        print(f"Training on {len(data)} laps ({data.memory_usage(deep=True).sum() / 1e6:.1f} MB)")
+        model, mae = corpus.train_lap_model(data)
+        print(f"\n🔍 Lap Model Error (MAE) on held-out events: {mae:.2f} seconds")
+        if args.gp:
+            print(f"\n🏁 Predicted {args.year} {args.gp} GP Race Pace 🏁\n")
+            print(pd.DataFrame(corpus.predict_race_pace(model, args.year, args.gp)))
+
+
+def run_telemetry_command(args):
+    """Extract per-lap telemetry features for a session and print the per-driver summary."""
+    from yuki.telemetry import build_telemetry_features, driver_telemetry
+    
+    enable_fastf1_cache(args.cache_dir, args.offline)
+    lap_table = build_telemetry_features(args.year, args.gp, args.session, args.memory_budget)
+    print(f"\n🏎️ {args.year} {args.gp} {args.session} Telemetry ({len(lap_table)} laps) 🏎️\n")
+    print(driver_telemetry(lap_table).to_string(index=False))
+
+
+def run_season_command(args):
+    """Ingest season calendars and qualifying, or print a stored season."""
+    from yuki import season
+    
+    if args.action == "ingest":
+        enable_fastf1_cache(args.cache_dir, args.offline)
+        for year in args.years:
+            stored = season.ingest_season(year, force=args.force)
+            print(f"{year}: stored qualifying for {sum(bool(drivers) for drivers in stored.values())} of {len(stored)} rounds")
+    elif args.gp:
+        for year in args.years:
+            table = season.load_qualifying(year, args.gp)
+            print(f"\n🏁 {year} {args.gp} GP Qualifying 🏁\n")
+            print("Not ingested" if table is None else table.to_string(index=False))
+    else:
+        for year in args.years:
+            races = season.season_races(year)
+            print(f"{year}: {', '.join(races) if races else 'not ingested'}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="yuki", description="Yuki ML race predictions.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    predict_parser = subparsers.add_parser("predict", help="predict race times for one Grand Prix")
+    predict_parser.add_argument("year", type=int, help="season being predicted")
+    predict_parser.add_argument("gp", help='name of the Grand Prix, e.g. "Emilia Romagna"')
+    predict_parser.add_argument("--model", default="advanced", choices=MODEL_TYPES)
+    predict_parser.add_argument("--cache-dir", default=f1cache.DEFAULT_CACHE_DIR, help="FastF1 cache directory")
+    predict_parser.add_argument("--offline", action="store_true", default=f1cache.OFFLINE,
+                                help="only use sessions already in the FastF1 cache (default: $YUKI_OFFLINE)")
+    
+    cache_parser = subparsers.add_parser("cache", help="manage the shared FastF1 cache")
+    cache_parser.add_argument("action", choices=["prefetch", "verify", "evict", "list"])
+    cache_parser.add_argument("--cache-dir", default=f1cache.DEFAULT_CACHE_DIR, help="FastF1 cache directory")
+    cache_parser.add_argument("--year", type=int, default=2024, help="season to prefetch (default: 2024)")
+    cache_parser.add_argument("--races", nargs="+", metavar="GP",
+                              help="Grands Prix to prefetch (default: the season's calendar)")
+    cache_parser.add_argument("--sessions", nargs="+", default=["Q", "R"], help="sessions to prefetch (default: Q R)")
+    cache_parser.add_argument("--delete", action="store_true", help="verify: delete corrupted sessions so they are refetched")
+    cache_parser.add_argument("--max-size", type=float, default=5.0, help="evict: size budget in GB (default: 5)")
+    
+    radio_parser = subparsers.add_parser("radio", help="search indexed team-radio transcripts")
+    radio_parser.add_argument("terms", nargs="*", help="words that must all appear in the message")
+    radio_parser.add_argument("--phrase", help="exact phrase that must appear in the message")
+    radio_parser.add_argument("--driver", help="driver code, e.g. TSU")
+    radio_parser.add_argument("--year", type=int, help="season")
+    radio_parser.add_argument("--gp", help="name of the Grand Prix")
+    radio_parser.add_argument("--start", type=float, help="earliest session time in seconds")
+    radio_parser.add_argument("--end", type=float, help="latest session time in seconds")
+    radio_parser.add_argument("--limit", type=int, default=50)
+    
+    corpus_parser = subparsers.add_parser("corpus", help="build the multi-season lap corpus or train the lap model")
+    corpus_parser.add_argument("action", choices=["build", "train"])
+    corpus_parser.add_argument("--years", type=int, nargs="+", default=[2022, 2023, 2024], help="build: seasons to add")
+    corpus_parser.add_argument("--races", nargs="+", metavar="GP", help="build: Grands Prix to add (default: each season's calendar)")
+    corpus_parser.add_argument("--sessions", nargs="+", default=["FP1", "FP2", "FP3", "Q", "R"], help="build: sessions to add")
+    corpus_parser.add_argument("--force", action="store_true", help="build: rebuild events already in the corpus")
+    corpus_parser.add_argument("--year", type=int, default=2025, help="train: season to predict race pace for")
+    corpus_parser.add_argument("--gp", help="train: also predict race pace for this Grand Prix")
+    corpus_parser.add_argument("--cache-dir", default=f1cache.DEFAULT_CACHE_DIR, help="FastF1 cache directory")
+    corpus_parser.add_argument("--offline", action="store_true", default=f1cache.OFFLINE,
+                               help="only use sessions already in the FastF1 cache (default: $YUKI_OFFLINE)")
+    
+    telemetry_parser = subparsers.add_parser("telemetry", help="extract per-lap car telemetry features for a session")
+    telemetry_parser.add_argument("year", type=int, help="season")
+    telemetry_parser.add_argument("gp", help='name of the Grand Prix, e.g. "Emilia Romagna"')
+    telemetry_parser.add_argument("--session", default="R", help="FastF1 session identifier (default: R)")
+    telemetry_parser.add_argument("--memory-budget", type=float, default=256, help="MB for the chunk working arrays, on top of the loaded car data (default: 256)")
+    telemetry_parser.add_argument("--cache-dir", default=f1cache.DEFAULT_CACHE_DIR, help="FastF1 cache directory")
+    telemetry_parser.add_argument("--offline", action="store_true", default=f1cache.OFFLINE,
+                                  help="only use sessions already in the FastF1 cache (default: $YUKI_OFFLINE)")
+    
+    season_parser = subparsers.add_parser("season", help="ingest or show season calendars and qualifying results")
+    season_parser.add_argument("action", choices=["ingest", "show"])
+    season_parser.add_argument("--years", type=int, nargs="+", default=[2025], help="seasons (default: 2025)")
+    season_parser.add_argument("--gp", help="show: qualifying results of this Grand Prix instead of the calendar")
+    season_parser.add_argument("--force", action="store_true", help="ingest: reload rounds already stored")
+    season_parser.add_argument("--cache-dir", default=f1cache.DEFAULT_CACHE_DIR, help="FastF1 cache directory")
+    season_parser.add_argument("--offline", action="store_true", default=f1cache.OFFLINE,
+                               help="only use sessions already in the FastF1 cache (default: $YUKI_OFFLINE)")
+    
+    serve_parser = subparsers.add_parser("serve", help="serve predictions and what-if scenarios over HTTP")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8000)
+    serve_parser.add_argument("--preload", action="store_true", help="load every race and model before serving")
+    serve_parser.add_argument("--cache-dir", default=f1cache.DEFAULT_CACHE_DIR, help="FastF1 cache directory")
+    serve_parser.add_argument("--offline", action="store_true", default=f1cache.OFFLINE,
+                              help="only use sessions already in the FastF1 cache (default: $YUKI_OFFLINE)")
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == "predict":
+        print_prediction(args.year, args.gp, args.model, cache_dir=args.cache_dir, offline=args.offline)
+    elif args.command == "cache":
+        run_cache_command(args)
+    elif args.command == "corpus":
+        run_corpus_command(args)
+    elif args.command == "season":
+        run_season_command(args)
+    elif args.command == "telemetry":
+        run_telemetry_command(args)
+    elif args.command == "serve":
+        from yuki.service import serve
+        
+        enable_fastf1_cache(args.cache_dir, args.offline)
+        serve(args.host, args.port, args.preload)
+    elif args.command == "radio":
+        print_radio_search(args.terms, args.phrase, args.driver, args.year, args.gp, args.start, args.end, args.limit)
@@ -0,0 +1,279 @@
+"""
+Lap-level training corpus across seasons and sessions.
+
+Every (year, Grand Prix) becomes one Parquet part holding the clean laps of
+all its practice, qualifying and race sessions, with float32 numbers and
+dictionary-encoded categories. Parts are built one event at a time, so memory
+stays bounded by a single weekend, and already-built events are skipped. The
+whole corpus then reads back as one compact DataFrame for a histogram-based
+gradient booster that trains on all cores.
+"""
+import glob
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from yuki.season import held_races
+
+# Bump when the part layout changes so stale parts are rebuilt; version 2 drops
+# parts written for Grands Prix that were not held, which held another race's laps
+CORPUS_VERSION = 2
+
+SESSIONS = ["FP1", "FP2", "FP3", "Q", "R"]
+
+CATEGORY_COLUMNS = ["GP", "Session", "Driver", "Team", "Compound"]
+FLOAT_COLUMNS = ["LapNumber", "Stint", "TyreLife", "FreshTyre", "QualifyingTime (s)", "LapTime (s)"]
+
+# Model inputs and target; sector times are left out since they add up to the lap time
+LAP_FEATURES = ["Year", "GP", "Session", "Driver", "Team", "Compound",
+                "LapNumber", "Stint", "TyreLife", "FreshTyre", "QualifyingTime (s)"]
+TARGET = "LapTime (s)"
+
+# Histogram gradient boosting hyperparameters for the lap model
+LAP_MODEL_PARAMS = {"max_iter": 300, "learning_rate": 0.1, "random_state": 38}
+
+DEFAULT_CORPUS_DIR = os.environ.get(
+    "YUKI_CORPUS",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "corpus")
+)
+
+
+def _part_path(year, gp_name, corpus_dir):
+    slug = gp_name.lower().replace(" ", "_")
+    return os.path.join(corpus_dir, f"v{CORPUS_VERSION}", f"{year}_{slug}.parquet")
+
+
+def session_laps(laps, year, gp_name, session_name):
+    """
+    Clean a FastF1 laps frame into compact lap-level rows.
+
+    In- and out-laps and laps without a time are dropped.
+
+    Args:
+        laps (pd.DataFrame): FastF1 session.laps
+        year (int): Season
+        gp_name (str): Name of the Grand Prix
+        session_name (str): FastF1 session identifier
+
+    Returns:
+        pd.DataFrame: One row per lap, without QualifyingTime (s) yet
+    """
+    laps = laps[laps["LapTime"].notna() & laps["PitInTime"].isna() & laps["PitOutTime"].isna()]
+    return pd.DataFrame({
+        "Year": np.full(len(laps), year, dtype=np.int16),
+        "GP": gp_name,
+        "Session": session_name,
+        "Driver": laps["Driver"].to_numpy(),
+        "Team": laps["Team"].to_numpy(),
+        "Compound": laps["Compound"].to_numpy(),
+        "LapNumber": laps["LapNumber"].to_numpy(dtype=np.float32),
+        "Stint": laps["Stint"].to_numpy(dtype=np.float32),
+        "TyreLife": laps["TyreLife"].to_numpy(dtype=np.float32),
+        "FreshTyre": laps["FreshTyre"].astype("float32").to_numpy(),
+        "LapTime (s)": laps["LapTime"].dt.total_seconds().to_numpy(dtype=np.float32)
+    })
+
+
+def event_table(session_frames):
+    """
+    Combine an event's session rows and attach each driver's best qualifying lap.
+
+    Args:
+        session_frames (list): Outputs of session_laps for one event
+
+    Returns:
+        pd.DataFrame: Corpus rows with category and float32 dtypes
+    """
+    table = pd.concat(session_frames, ignore_index=True)
+    best_qualifying = table[table["Session"] == "Q"].groupby("Driver")["LapTime (s)"].min()
+    table["QualifyingTime (s)"] = table["Driver"].map(best_qualifying).astype(np.float32)
+    return table.astype({column: "category" for column in CATEGORY_COLUMNS})
+
+
+def build_event(year, gp_name, sessions=SESSIONS, corpus_dir=DEFAULT_CORPUS_DIR):
+    """
+    Load an event's sessions and write them as one corpus part.
+
+    Sessions that fail to load (e.g. FP2/FP3 on sprint weekends) are skipped.
+
+    Returns:
+        int: Number of laps written, 0 if no session loaded
+    """
+    from yuki.f1cache import load_session
+
+    frames = []
+    for session_name in sessions:
+        try:
+            session = load_session(year, gp_name, session_name)
+        except Exception as e:
+            print(f"Skipping {year} {gp_name} {session_name}: {str(e)}")
+            continue
+        frames.append(session_laps(session.laps, year, gp_name, session_name))
+    if not frames:
+        return 0
+
+    table = event_table(frames)
+    path = _part_path(year, gp_name, corpus_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write to a temporary file first so concurrent readers never see a partial part
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    pq.write_table(pa.Table.from_pandas(table, preserve_index=False), tmp_path)
+    os.replace(tmp_path, path)
+    return len(table)
+
+
+def build_corpus(years, races=None, sessions=SESSIONS, corpus_dir=DEFAULT_CORPUS_DIR, force=False):
+    """
+    Build the corpus for every listed season and Grand Prix, one event at a time.
+
+    Args:
+        years (list): Seasons
+        races (list, optional): Names of the Grands Prix, looked up in each season; each season's calendar if omitted.
+            Grands Prix not on a season's real calendar are skipped
+        sessions (list): FastF1 session identifiers to include
+        corpus_dir (str): Root directory of the corpus
+        force (bool): Rebuild events that already have a part
+
+    Returns:
+        dict: Laps written keyed by (year, Grand Prix), 0 for skipped or failed events
+    """
+    written = {}
+    for year in years:
+        calendar = held_races(year)
+        for gp_name in races or calendar:
+            if gp_name not in calendar:
+                print(f"Skipping {year} {gp_name}: not held that season")
+                written[(year, gp_name)] = 0
+                continue
+            if not force and os.path.exists(_part_path(year, gp_name, corpus_dir)):
+                written[(year, gp_name)] = 0
+                continue
+            written[(year, gp_name)] = build_event(year, gp_name, sessions, corpus_dir)
+            print(f"Added {written[(year, gp_name)]} laps from {year} {gp_name}")
+    return written
+
+
+def corpus_fingerprint(corpus_dir=DEFAULT_CORPUS_DIR):
+    """Hash of the corpus parts' names, sizes and modification times."""
+    digest = hashlib.sha256()
+    for path in sorted(glob.glob(os.path.join(corpus_dir, f"v{CORPUS_VERSION}", "*.parquet"))):
+        stat = os.stat(path)
+        digest.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load_corpus(columns=None, years=None, corpus_dir=DEFAULT_CORPUS_DIR):
+    """
+    Read the corpus as one DataFrame, keeping its compact dtypes.
+
+    Args:
+        columns (list, optional): Columns to read, all of them if omitted
+        years (list, optional): Only these seasons
+        corpus_dir (str): Root directory of the corpus
+
+    Returns:
+        pd.DataFrame: Lap rows with category and float32 columns
+    """
+    dataset = ds.dataset(os.path.join(corpus_dir, f"v{CORPUS_VERSION}"), format="parquet")
+    expression = ds.field("Year").isin(years) if years else None
+    table = dataset.to_table(columns=columns, filter=expression)
+    # Each part has its own dictionaries; unify them so categories line up across events
+    return table.unify_dictionaries().to_pandas()
+
+
+def train_lap_model(corpus=None, params=LAP_MODEL_PARAMS, store=None, test_size=0.2, corpus_dir=DEFAULT_CORPUS_DIR):
+    """
+    Fit a histogram gradient booster on the lap corpus, holding out whole events.
+
+    Args:
+        corpus (pd.DataFrame, optional): Output of load_corpus, read from disk if omitted
+        params (dict): HistGradientBoostingRegressor hyperparameters
+        store (ModelStore, optional): Store of fitted models, the default store if omitted
+        test_size (float): Share of events held out to measure the error
+        corpus_dir (str): Root directory of the corpus, read when corpus is omitted
+
+    Returns:
+        tuple: (fitted model, mean absolute error in seconds on the held-out events)
+    """
+    from sklearn.ensemble import HistGradientBoostingRegressor
+    from sklearn.metrics import mean_absolute_error
+    from sklearn.model_selection import GroupShuffleSplit
+
+    from yuki.model_store import ModelStore
+
+    if store is None:
+        store = ModelStore()
+    if corpus is None:
+        data_hash = corpus_fingerprint(corpus_dir)
+        corpus = load_corpus(LAP_FEATURES + [TARGET], corpus_dir=corpus_dir)
+    else:
+        data_hash = hashlib.sha256(pd.util.hash_pandas_object(corpus, index=False).values.tobytes()).hexdigest()
+
+    X = corpus[LAP_FEATURES]
+    y = corpus[TARGET]
+
+    # Hold out whole events so laps from one weekend never end up on both sides
+    events = corpus["Year"].astype(str) + "/" + corpus["GP"].astype(str)
+    train_idx, test_idx = next(GroupShuffleSplit(n_splits=1, test_size=test_size, random_state=38).split(X, y, events))
+
+    def fit():
+        model = HistGradientBoostingRegressor(**params).fit(X.iloc[train_idx], y.iloc[train_idx])
+        # Category sets travel with the pickled model, so predictions encode categories the same way
+        model.category_sets_ = {column: list(X[column].cat.categories) for column in CATEGORY_COLUMNS}
+        return model
+
+    key = store.key("corpus", "lap_hgb", LAP_FEATURES, params, data_hash)
+    metadata = {"gp_name": "corpus", "model_type": "lap_hgb", "rows": len(corpus)}
+    model = store.load(key)
+    # Models stored before the category sets were kept are refitted
+    if model is None or not hasattr(model, "category_sets_"):
+        model = fit()
+        store.save(key, model, metadata)
+    return model, mean_absolute_error(y.iloc[test_idx], model.predict(X.iloc[test_idx]))
+
+
+def predict_race_pace(model, year, gp_name):
+    """
+    Predict each driver's race lap time for a Grand Prix from their qualifying time.
+
+    Args:
+        model: Fitted model from train_lap_model, carrying the category sets it was trained on
+        year (int): Season being predicted
+        gp_name (str): Name of the Grand Prix
+
+    Returns:
+        list: Driver, PredictedLapTime (s) and PredictedPosition records, sorted by predicted time
+    """
+    from yuki.data import qualifying_table
+
+    category_sets = getattr(model, "category_sets_", None)
+    if category_sets is None:
+        raise ValueError("Model has no training category sets; fit it with train_lap_model")
+
+    qualifying = qualifying_table(year, gp_name)
+    rows = pd.DataFrame({
+        "Year": np.full(len(qualifying), year, dtype=np.int16),
+        "GP": gp_name,
+        "Session": "R",
+        "Driver": qualifying["DriverCode"].to_numpy(),
+        "Team": None,
+        "Compound": None,
+        "LapNumber": np.nan,
+        "Stint": np.nan,
+        "TyreLife": np.nan,
+        "FreshTyre": np.nan,
+        "QualifyingTime (s)": qualifying["QualifyingTime (s)"].to_numpy(dtype=np.float32)
+    })
+    for column in CATEGORY_COLUMNS:
+        rows[column] = pd.Categorical(rows[column], categories=category_sets[column])
+    rows = rows.astype({column: np.float32 for column in FLOAT_COLUMNS if column in rows})
+
+    qualifying["PredictedLapTime (s)"] = model.predict(rows[LAP_FEATURES])
+    qualifying["PredictedPosition"] = qualifying["PredictedLapTime (s)"].rank(method="dense").astype(int)
+    qualifying = qualifying.sort_values(by="PredictedLapTime (s)", kind="stable")
+    return qualifying[["Driver", "PredictedLapTime (s)", "PredictedPosition"]].to_dict('records')
@@ -0,0 +1,94 @@
+"""
+Driver and qualifying tables used by the predictors.
+
+Seasons ingested into the season store (python -m yuki season ingest) are read
+from there; the static tables below are the fallback for anything not ingested.
+"""
+
+# Every Grand Prix of the 2024 season, in calendar order
+RACES_2024 = [
+    "Bahrain", "Saudi Arabia", "Australia", "Japan", "China", "Miami",
+    "Emilia Romagna", "Monaco", "Canada", "Spain", "Austria", "Great Britain",
+    "Hungary", "Belgium", "Netherlands", "Italy", "Azerbaijan", "Singapore",
+    "United States", "Mexico", "Brazil", "Las Vegas", "Qatar", "Abu Dhabi"
+]
+
+# Map full names to FastF1 3-letter codes
+DRIVER_MAPPING = {
+    "Oscar Piastri": "PIA", "George Russell": "RUS", "Lando Norris": "NOR", "Max Verstappen": "VER",
+    "Lewis Hamilton": "HAM", "Charles Leclerc": "LEC", "Isack Hadjar": "HAD", "Andrea Kimi Antonelli": "ANT",
+    "Yuki Tsunoda": "TSU", "Alexander Albon": "ALB", "Esteban Ocon": "OCO", "Nico Hülkenberg": "HUL",
+    "Fernando Alonso": "ALO", "Lance Stroll": "STR", "Carlos Sainz Jr.": "SAI", "Pierre Gasly": "GAS",
+    "Oliver Bearman": "BEA", "Jack Doohan": "DOO", "Gabriel Bortoleto": "BOR", "Liam Lawson": "LAW"
+}
+
+QUALIFYING_ORDER = [
+    "Oscar Piastri", "George Russell", "Lando Norris", "Max Verstappen", "Lewis Hamilton",
+    "Charles Leclerc", "Isack Hadjar", "Andrea Kimi Antonelli", "Yuki Tsunoda", "Alexander Albon",
+    "Esteban Ocon", "Nico Hülkenberg", "Fernando Alonso", "Lance Stroll", "Carlos Sainz Jr.",
+    "Pierre Gasly", "Oliver Bearman", "Jack Doohan", "Gabriel Bortoleto", "Liam Lawson"
+]
+
+# 2025 qualifying times, used for any Grand Prix without its own table
+DEFAULT_QUALIFYING_TIMES = [
+    75.641, 75.723, 75.793, 75.817, 75.927,
+    76.021, 76.079, 76.103, 76.638, 76.706,
+    76.625, 76.632, 76.688, 76.773, 76.840,
+    76.992, 77.018, 77.092, 77.141, 77.174
+]
+
+# Qualifying times keyed by (year, Grand Prix), in QUALIFYING_ORDER
+QUALIFYING_TIMES = {
+    (2025, "Emilia Romagna"): DEFAULT_QUALIFYING_TIMES,
+    (2025, "China"): [
+        90.641, 90.723, 90.793, 90.817, 90.927,
+        91.021, 91.079, 91.103, 91.638, 91.706,
+        91.625, 91.632, 91.688, 91.773, 91.840,
+        91.992, 92.018, 92.092, 92.141, 92.174
+    ]
+}
+
+
+def race_calendar(year):
+    """
+    Grands Prix of a season in round order, from the season store or else RACES_2024.
+    
+    Args:
+        year (int): Season
+    
+    Returns:
+        list: Names of the Grands Prix
+    """
+    from yuki.season import season_races
+    
+    return season_races(year) or list(RACES_2024)
+
+
+def qualifying_table(year, gp_name):
+    """
+    Qualifying times for a Grand Prix with FastF1 driver codes attached.
+    
+    Each driver's best Q1/Q2/Q3 time comes from the season store when the
+    weekend has been ingested, otherwise from the static tables.
+    
+    Args:
+        year (int): Season of the qualifying session
+        gp_name (str): Name of the Grand Prix
+    
+    Returns:
+        pd.DataFrame: Driver, QualifyingTime (s) and DriverCode columns
+    """
+    import pandas as pd
+    
+    from yuki.season import load_qualifying
+    
+    stored = load_qualifying(year, gp_name)
+    if stored is not None:
+        return stored[["Driver", "QualifyingTime (s)", "DriverCode"]]
+    
+    table = pd.DataFrame({
+        "Driver": QUALIFYING_ORDER,
+        "QualifyingTime (s)": QUALIFYING_TIMES.get((year, gp_name), DEFAULT_QUALIFYING_TIMES)
+    })
+    table["DriverCode"] = table["Driver"].map(DRIVER_MAPPING)
+    return table
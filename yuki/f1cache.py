@@ -0,0 +1,228 @@
+"""
+Shared FastF1 cache at one absolute location.
+
+Every script and worker process enables the same cache directory, so a
+session fetched once is warm everywhere. Sessions loaded through
+load_session get a sidecar file in their cache folder with the checksums of
+its files; the sidecar's modification time is the session's last-used time,
+which drives size-based eviction the same way as the model store. In strict
+offline mode FastF1 never touches the network and a session without a
+sidecar fails immediately.
+"""
+import glob
+import hashlib
+import json
+import os
+import shutil
+import time
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_DIR = os.path.abspath(os.environ.get("YUKI_F1_CACHE", os.path.join(_REPO_ROOT, "f1_cache")))
+
+# Set YUKI_OFFLINE=1 on build machines that must only use the warm cache
+OFFLINE = os.environ.get("YUKI_OFFLINE", "").lower() in ("1", "true", "yes")
+
+# Options every session is loaded with, so prefetched sessions satisfy later loads
+LOAD_OPTIONS = {"telemetry": False, "weather": False, "messages": False}
+
+SIDECAR_NAME = "yuki_session.json"
+
+# Bump when the sidecar layout changes
+SIDECAR_VERSION = 1
+
+_config = {"cache_dir": None, "offline": False}
+
+
+class OfflineCacheMiss(RuntimeError):
+    """A session was requested in offline mode but is not in the cache."""
+
+
+def enable(cache_dir=DEFAULT_CACHE_DIR, offline=OFFLINE):
+    """
+    Enable the shared FastF1 cache in this process.
+
+    Args:
+        cache_dir (str): Cache directory, made absolute
+        offline (bool): Serve only cached data and fail fast on anything missing
+    """
+    import fastf1
+
+    cache_dir = os.path.abspath(cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+    fastf1.Cache.enable_cache(cache_dir)
+    fastf1.Cache.offline_mode(offline)
+    _config.update(cache_dir=cache_dir, offline=offline)
+
+
+def is_offline():
+    """Whether this process was enabled in strict offline mode."""
+    return _config["offline"]
+
+
+def _ensure_enabled():
+    if _config["cache_dir"] is None:
+        enable()
+    return _config["cache_dir"]
+
+
+def session_key(year, gp_name, session_name):
+    return f"{year}/{gp_name}/{session_name}"
+
+
+def _checksums(session_dir):
+    checksums = {}
+    for path in sorted(glob.glob(os.path.join(session_dir, "*.ff1pkl"))):
+        with open(path, "rb") as f:
+            checksums[os.path.basename(path)] = hashlib.sha256(f.read()).hexdigest()
+    return checksums
+
+
+def _dir_size(path):
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(path) for name in names
+    )
+
+
+def cached_sessions(cache_dir=None):
+    """
+    Sessions recorded in the cache.
+
+    Returns:
+        dict: Sidecar contents plus "dir" and "last_used", keyed by "year/GP/session"
+    """
+    cache_dir = cache_dir or _config["cache_dir"] or DEFAULT_CACHE_DIR
+    sessions = {}
+    for sidecar in glob.glob(os.path.join(cache_dir, "*", "*", "*", SIDECAR_NAME)):
+        try:
+            with open(sidecar, "r") as f:
+                entry = json.load(f)
+            last_used = os.path.getmtime(sidecar)
+        except (OSError, ValueError):
+            continue
+        if entry.get("version") == SIDECAR_VERSION:
+            sessions[entry["key"]] = {**entry, "dir": os.path.dirname(sidecar), "last_used": last_used}
+    return sessions
+
+
+def load_session(year, gp_name, session_name="R", telemetry=False):
+    """
+    Load a FastF1 session through the shared cache and record it.
+
+    Args:
+        year (int): Season
+        gp_name (str): Name of the Grand Prix
+        session_name (str): FastF1 session identifier ("FP1", "Q", "R", ...)
+        telemetry (bool): Also load car and position data into session.car_data and session.pos_data
+
+    Returns:
+        fastf1.core.Session: The loaded session
+
+    Raises:
+        OfflineCacheMiss: In offline mode, when the session was never cached
+    """
+    import fastf1
+
+    cache_dir = _ensure_enabled()
+    key = session_key(year, gp_name, session_name)
+    if _config["offline"] and key not in cached_sessions(cache_dir):
+        raise OfflineCacheMiss(f"{key} is not in the FastF1 cache at {cache_dir}; run 'python -m yuki cache prefetch' online first")
+
+    session = fastf1.get_session(year, gp_name, session_name)
+    session.load(**{**LOAD_OPTIONS, "telemetry": telemetry})
+
+    session_dir = os.path.join(cache_dir, session.api_path[len("/static/"):])
+    if os.path.isdir(session_dir):
+        _record_session(key, session_dir)
+    return session
+
+
+def _record_session(key, session_dir):
+    """Write the session's sidecar when its file set changed, otherwise just mark it as used."""
+    sidecar = os.path.join(session_dir, SIDECAR_NAME)
+    names = sorted(os.path.basename(path) for path in glob.glob(os.path.join(session_dir, "*.ff1pkl")))
+    try:
+        with open(sidecar, "r") as f:
+            entry = json.load(f)
+        if entry.get("version") == SIDECAR_VERSION and sorted(entry["files"]) == names:
+            os.utime(sidecar)
+            return
+    except (OSError, ValueError, KeyError):
+        pass
+
+    # Write to a temporary file first so concurrent readers never see a partial sidecar
+    tmp_path = f"{sidecar}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"version": SIDECAR_VERSION, "key": key, "files": _checksums(session_dir), "created": time.time()}, f, indent=2)
+    os.replace(tmp_path, sidecar)
+
+
+def prefetch(year, races, session_names=("Q", "R")):
+    """
+    Warm the cache with every session of every listed Grand Prix.
+
+    Args:
+        year (int): Season
+        races (list): Names of the Grands Prix
+        session_names (tuple): FastF1 session identifiers to fetch for each race
+
+    Returns:
+        dict: Error message keyed by "year/GP/session" for the sessions that failed
+    """
+    failures = {}
+    for gp_name in races:
+        for session_name in session_names:
+            key = session_key(year, gp_name, session_name)
+            try:
+                load_session(year, gp_name, session_name)
+                print(f"Cached {key}")
+            except Exception as e:
+                failures[key] = str(e)
+                print(f"Error caching {key}: {str(e)}")
+    return failures
+
+
+def verify(cache_dir=None, delete=False):
+    """
+    Check every recorded session's files against their checksums.
+
+    Args:
+        cache_dir (str, optional): Cache directory, the enabled or default one if omitted
+        delete (bool): Delete the folders of sessions that fail, so the next load refetches them
+
+    Returns:
+        list: Keys of the sessions with missing or modified files
+    """
+    corrupted = []
+    for key, entry in sorted(cached_sessions(cache_dir).items()):
+        if _checksums(entry["dir"]) != entry["files"]:
+            corrupted.append(key)
+            if delete:
+                shutil.rmtree(entry["dir"], ignore_errors=True)
+    return corrupted
+
+
+def evict(max_bytes, cache_dir=None):
+    """
+    Delete the least recently used sessions until the recorded sessions fit in max_bytes.
+
+    FastF1's request cache in the cache root is left alone.
+
+    Args:
+        max_bytes (int): Size budget for the recorded sessions
+        cache_dir (str, optional): Cache directory, the enabled or default one if omitted
+
+    Returns:
+        list: Keys of the evicted sessions
+    """
+    sessions = sorted(cached_sessions(cache_dir).items(), key=lambda item: item[1]["last_used"], reverse=True)
+    sizes = [_dir_size(entry["dir"]) for _, entry in sessions]
+
+    evicted = []
+    total = sum(sizes)
+    while sessions and total > max_bytes:
+        key, entry = sessions.pop()
+        total -= sizes.pop()
+        shutil.rmtree(entry["dir"], ignore_errors=True)
+        evicted.append(key)
+    return evicted
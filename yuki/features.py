@@ -0,0 +1,148 @@
+"""
+Columnar cache of lap and sector-time features derived from FastF1 sessions.
+
+The first request for a (year, GP, session) loads the FastF1 session, cleans
+its laps and writes two Parquet files: the per-lap table and the per-driver
+means. Later requests memory-map those files and read only the columns they
+ask for, without importing or loading FastF1 at all.
+"""
+import os
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from yuki.instrument import stage
+
+# Bump when the derived tables change shape so stale files are rebuilt
+FEATURE_VERSION = 1
+
+TIME_COLUMNS = ["LapTime", "Sector1Time", "Sector2Time", "Sector3Time"]
+SECONDS_COLUMNS = [f"{col} (s)" for col in TIME_COLUMNS]
+
+DEFAULT_FEATURE_DIR = os.environ.get(
+    "YUKI_FEATURE_CACHE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "feature_cache")
+)
+
+
+def _feature_path(year, gp_name, session_name, table, feature_dir):
+    slug = gp_name.lower().replace(" ", "_")
+    return os.path.join(feature_dir, f"v{FEATURE_VERSION}", str(year), f"{slug}_{session_name}_{table}.parquet")
+
+
+def _write_table(frame, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write to a temporary file first so concurrent readers never see a partial file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _read_table(path, columns):
+    return pq.read_table(path, columns=columns, memory_map=True).to_pandas()
+
+
+def build_lap_table(laps):
+    """
+    Clean a FastF1 laps frame into float lap and sector times in seconds.
+    
+    Args:
+        laps (pd.DataFrame): FastF1 session.laps
+    
+    Returns:
+        pd.DataFrame: Driver plus one float column per time column, laps with missing times dropped
+    """
+    laps = laps[["Driver"] + TIME_COLUMNS].dropna()
+    table = laps[["Driver"]].astype({"Driver": "category"})
+    for col in TIME_COLUMNS:
+        table[f"{col} (s)"] = laps[col].dt.total_seconds()
+    return table.reset_index(drop=True)
+
+
+def driver_aggregates(lap_table):
+    """
+    Average lap and sector times per driver.
+    
+    Args:
+        lap_table (pd.DataFrame): Output of build_lap_table
+    
+    Returns:
+        pd.DataFrame: One row per driver, sorted by driver code
+    """
+    aggregates = lap_table.groupby("Driver", observed=True)[SECONDS_COLUMNS].mean().reset_index()
+    return aggregates.astype({"Driver": str})
+
+
+def build_session_features(year, gp_name, session_name="R", feature_dir=DEFAULT_FEATURE_DIR):
+    """
+    Load a FastF1 session and write its lap table and driver aggregates to the feature cache.
+    
+    The session is loaded through the shared FastF1 cache, see yuki.f1cache.
+    
+    Args:
+        year (int): Season
+        gp_name (str): Name of the Grand Prix
+        session_name (str): FastF1 session identifier ("FP1", "Q", "R", ...)
+        feature_dir (str): Root directory of the feature cache
+    """
+    import fastf1
+    
+    from yuki.f1cache import load_session
+    
+    with stage("session_load", year=year, gp=gp_name, session=session_name) as record:
+        # FastF1 only writes to its cache when it has to fetch, so a growing cache means a miss
+        _, cache_size = fastf1.Cache.get_cache_info()
+        session = load_session(year, gp_name, session_name)
+        record["fastf1_cache_hit"] = fastf1.Cache.get_cache_info()[1] == cache_size
+        record["rows"] = len(session.laps)
+    
+    with stage("feature_build", year=year, gp=gp_name, session=session_name) as record:
+        lap_table = build_lap_table(session.laps)
+        _write_table(lap_table, _feature_path(year, gp_name, session_name, "laps", feature_dir))
+        _write_table(driver_aggregates(lap_table), _feature_path(year, gp_name, session_name, "drivers", feature_dir))
+        record["rows"] = len(lap_table)
+
+
+def _load(year, gp_name, session_name, table, columns, feature_dir):
+    path = _feature_path(year, gp_name, session_name, table, feature_dir)
+    with stage("feature_cache", year=year, gp=gp_name, session=session_name, table=table) as record:
+        record["hit"] = os.path.exists(path)
+        if not record["hit"]:
+            build_session_features(year, gp_name, session_name, feature_dir)
+        frame = _read_table(path, columns)
+        record["rows"] = len(frame)
+    return frame
+
+
+def load_laps(year, gp_name, session_name="R", columns=None, feature_dir=DEFAULT_FEATURE_DIR):
+    """
+    Per-lap table for a session, built on first use.
+    
+    Args:
+        year (int): Season
+        gp_name (str): Name of the Grand Prix
+        session_name (str): FastF1 session identifier
+        columns (list, optional): Columns to read, all of them if omitted
+        feature_dir (str): Root directory of the feature cache
+    
+    Returns:
+        pd.DataFrame: Driver and lap/sector times in seconds
+    """
+    return _load(year, gp_name, session_name, "laps", columns, feature_dir)
+
+
+def load_driver_aggregates(year, gp_name, session_name="R", columns=None, feature_dir=DEFAULT_FEATURE_DIR):
+    """
+    Per-driver mean lap and sector times for a session, built on first use.
+    
+    Args:
+        year (int): Season
+        gp_name (str): Name of the Grand Prix
+        session_name (str): FastF1 session identifier
+        columns (list, optional): Columns to read, all of them if omitted
+        feature_dir (str): Root directory of the feature cache
+    
+    Returns:
+        pd.DataFrame: One row per driver, sorted by driver code
+    """
+    return _load(year, gp_name, session_name, "drivers", columns, feature_dir)
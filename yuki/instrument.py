@@ -0,0 +1,139 @@
+"""
+Per-stage timing and memory instrumentation.
+
+Pipeline code wraps its stages in `with stage("fit", gp=..., rows=...)`, which
+costs nothing unless a StageLog has been activated in the process. An active
+log times each stage, records how far traced memory rose above its level at
+the start of the stage, and appends one JSON line per stage. Worker processes
+activate their own log on the same file, so one run's records end up in one
+place.
+"""
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+_active_log = None
+
+
+class StageLog:
+    """Appends a JSON line per completed stage to a log file."""
+
+    def __init__(self, path, trace_memory=True, run_id=None):
+        """
+        Args:
+            path (str): JSON-lines file, appended to
+            trace_memory (bool): Record tracemalloc peaks, at some cost in speed
+            run_id (str, optional): Identifier stamped on every record, the current time if omitted
+        """
+        self.path = path
+        self.trace_memory = trace_memory
+        self.run_id = run_id or datetime.now().isoformat()
+        # Peak traced memory seen so far by each open stage, innermost last
+        self._peaks = []
+
+    def write(self, record):
+        """Append one record as a single write, so lines from several processes do not interleave."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(json.dumps(record, default=str) + "\n")
+
+    @contextmanager
+    def stage(self, name, **fields):
+        """
+        Time a stage and log it when it ends, whether or not it succeeds.
+
+        Args:
+            name (str): Stage name, e.g. "session_load" or "fit"
+            **fields: Extra details logged with the stage, such as gp or rows
+
+        Yields:
+            dict: The record, so the stage can add details it only learns while running
+        """
+        record = {"run": self.run_id, "stage": name, **fields}
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            start_memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            self._peaks.append(start_memory)
+
+        start = time.perf_counter()
+        record["status"] = "ok"
+        try:
+            yield record
+        except BaseException as e:
+            record["status"] = "error"
+            record["error"] = str(e)
+            raise
+        finally:
+            record["duration_s"] = time.perf_counter() - start
+            if self.trace_memory:
+                peak = max(self._peaks.pop(), tracemalloc.get_traced_memory()[1])
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak)
+                tracemalloc.reset_peak()
+                record["peak_mb"] = (peak - start_memory) / 1e6
+            record["pid"] = os.getpid()
+            record["time"] = datetime.now().isoformat()
+            self.write(record)
+
+
+def activate(log):
+    """Route stage() calls in this process to a StageLog, or switch them off with None."""
+    global _active_log
+    _active_log = log
+
+
+def active_log():
+    return _active_log
+
+
+@contextmanager
+def stage(name, **fields):
+    """
+    Instrument a stage on the active log, or just run it if none is active.
+
+    Yields:
+        dict: Record the stage can add details to, discarded when no log is active
+    """
+    if _active_log is None:
+        yield dict(fields)
+        return
+    with _active_log.stage(name, **fields) as record:
+        yield record
+
+
+def summarise(path, run_id=None):
+    """
+    Aggregate a stage log into one row per stage.
+
+    Args:
+        path (str): JSON-lines file written by StageLog
+        run_id (str, optional): Only this run's records, every record if omitted
+
+    Returns:
+        pd.DataFrame: Count, total/mean/max duration, largest peak and errors per stage, slowest total first
+    """
+    import pandas as pd
+
+    records = pd.read_json(path, lines=True)
+    if run_id is not None:
+        records = records[records["run"] == run_id]
+    if "peak_mb" not in records:
+        records["peak_mb"] = float("nan")
+
+    summary = records.groupby("stage").agg(
+        count=("duration_s", "size"),
+        total_s=("duration_s", "sum"),
+        mean_s=("duration_s", "mean"),
+        max_s=("duration_s", "max"),
+        peak_mb=("peak_mb", "max"),
+        errors=("status", lambda status: int((status == "error").sum()))
+    )
+    for column in ("hit", "fastf1_cache_hit", "model_store_hit"):
+        if column in records:
+            summary[f"{column}s"] = records[column].eq(True).groupby(records["stage"]).sum()
+    return summary.sort_values("total_s", ascending=False)
@@ -0,0 +1,233 @@
+"""
+Live race mode: re-score the predicted finishing order as laps come in.
+
+Lap records are replayed from a cached FastF1 session in the order they were
+completed, standing in for a live timing feed. Each record updates its
+driver's running sums in place, the same means build_lap_table and
+driver_aggregates would give but without regrouping the whole race, and once
+per leader lap the fitted model re-scores the field. The projected finishing
+order is each driver's elapsed time plus their remaining laps at the predicted
+pace, and only the positions that moved are reported as changes. As in the
+precomputed shards, PredictedRaceTime (s) is the predicted mean lap time.
+"""
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from yuki.features import SECONDS_COLUMNS, TIME_COLUMNS
+from yuki.prediction import FEATURE_COLUMNS
+
+# Lap, Sector1, Sector2 and Sector3 positions in the running sums
+SECTOR_SLICE = slice(1, 4)
+
+# Leader laps without a completed lap before a driver counts as retired
+RETIRED_AFTER = 3
+
+
+def lap_records(laps):
+    """
+    Lap records in the order they were completed.
+
+    Args:
+        laps (pd.DataFrame): FastF1 session.laps
+
+    Returns:
+        list: Driver, LapNumber, Time (s) (session time at the end of the lap) and
+            lap/sector time records in seconds (NaN when missing)
+    """
+    laps = laps[laps["Time"].notna()].sort_values(["Time", "Driver"], kind="stable")
+    table = pd.DataFrame({
+        "Driver": laps["Driver"].astype(str).to_numpy(),
+        "LapNumber": laps["LapNumber"].to_numpy(dtype=np.int64),
+        "Time (s)": laps["Time"].dt.total_seconds().to_numpy()
+    })
+    for col, seconds_col in zip(TIME_COLUMNS, SECONDS_COLUMNS):
+        table[seconds_col] = laps[col].dt.total_seconds().to_numpy()
+    return table.to_dict("records")
+
+
+def leader_laps(records):
+    """
+    Group lap records by leader lap.
+
+    A group starts with the record that takes the race to a new lap number and
+    holds every lap completed before the leader's next lap.
+
+    Yields:
+        tuple: (leader lap number, list of records)
+    """
+    batch = []
+    leader_lap = 0
+    for record in records:
+        if record["LapNumber"] > leader_lap and batch:
+            yield leader_lap, batch
+            batch = []
+        leader_lap = max(leader_lap, record["LapNumber"])
+        batch.append(record)
+    if batch:
+        yield leader_lap, batch
+
+
+class RunningAggregates:
+    """Per-driver lap counts, elapsed time and running lap/sector sums, updated one lap at a time."""
+
+    def __init__(self, drivers=()):
+        self.index = {}
+        self.sums = np.zeros((0, len(SECONDS_COLUMNS)))
+        self.clean_laps = np.zeros(0)
+        self.laps = np.zeros(0)
+        self.elapsed = np.zeros(0)
+        for driver in drivers:
+            self.add_driver(driver)
+
+    def add_driver(self, driver):
+        """Row of a driver, added with empty totals the first time it is seen."""
+        if driver not in self.index:
+            self.index[driver] = len(self.index)
+            self.sums = np.vstack([self.sums, np.zeros(len(SECONDS_COLUMNS))])
+            self.clean_laps = np.append(self.clean_laps, 0)
+            self.laps = np.append(self.laps, 0)
+            self.elapsed = np.append(self.elapsed, 0)
+        return self.index[driver]
+
+    def update(self, record):
+        """
+        Add one completed lap.
+
+        Laps missing a lap or sector time still count towards laps and elapsed
+        time but, as in build_lap_table, not towards the means.
+        """
+        row = self.add_driver(record["Driver"])
+        times = np.array([record[col] for col in SECONDS_COLUMNS], dtype=np.float64)
+        self.laps[row] = max(self.laps[row], record["LapNumber"])
+        self.elapsed[row] = max(self.elapsed[row], record["Time (s)"])
+        if not np.isnan(times).any():
+            self.sums[row] += times
+            self.clean_laps[row] += 1
+
+    def means(self):
+        """Mean lap and sector times per driver row, NaN before a driver's first clean lap."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.sums / self.clean_laps[:, None]
+
+
+class LiveRace:
+    """Projected finishing order of a race in progress, re-scored with a fitted model."""
+
+    def __init__(self, gp_name, model_type, model, features, total_laps, min_clean_laps=3):
+        """
+        Args:
+            gp_name (str): Name of the Grand Prix
+            model_type (str): Type of model the model was fitted as
+            model: Fitted model from fit_race_model
+            features (dict): Output of load_race_features the model was fitted on
+            total_laps (int): Race distance in laps
+            min_clean_laps (int): Clean laps before a driver's own sector times replace last season's
+        """
+        self.gp_name = gp_name
+        self.model_type = model_type
+        self.model = model
+        self.total_laps = total_laps
+        self.min_clean_laps = min_clean_laps
+        self.columns = FEATURE_COLUMNS[model_type]
+
+        merged = features["merged_data"]
+        self.aggregates = RunningAggregates(merged["DriverCode"])
+        self.X = merged[self.columns].fillna(0).to_numpy(dtype=np.float64)
+        self.names = merged["Driver"].tolist()
+        self.sector_columns = [i for i, column in enumerate(self.columns) if column in SECONDS_COLUMNS[SECTOR_SLICE]]
+        self.positions = {}
+        self.leader_lap = 0
+        self.last_seen = {}
+
+    def _features(self):
+        """Model inputs with each driver's live sector means once they have enough clean laps."""
+        n = len(self.X)
+        means = self.aggregates.means()[:n]
+        live = self.aggregates.clean_laps[:n] >= self.min_clean_laps
+        X = self.X.copy()
+        if self.sector_columns:
+            X[np.ix_(live, self.sector_columns)] = means[live][:, SECTOR_SLICE]
+        return pd.DataFrame(X, columns=self.columns)
+
+    def update(self, leader_lap, records):
+        """
+        Apply a leader lap's records and re-score the field.
+
+        Args:
+            leader_lap (int): Lap the leader is on
+            records (list): Lap records from lap_records completed since the last update
+
+        Returns:
+            dict: Live result in the shard format, with the position changes since the last update
+        """
+        for record in records:
+            self.aggregates.update(record)
+            self.last_seen[record["Driver"]] = leader_lap
+        self.leader_lap = leader_lap
+
+        # Drivers without qualifying features (e.g. in a replay of another season) keep their own pace
+        pace = self.aggregates.means()[:, 0]
+        pace[:len(self.X)] = self.model.predict(self._features())
+        pace = np.where(np.isnan(pace), np.nanmean(pace), pace)
+        remaining = np.clip(self.total_laps - self.aggregates.laps, 0, None)
+        projected = self.aggregates.elapsed + remaining * pace
+
+        # Drivers without a lap for RETIRED_AFTER leader laps are out, ordered behind the field by laps completed
+        codes = list(self.aggregates.index)
+        names = self.names + codes[len(self.names):]
+        last_seen = np.array([self.last_seen.get(code, 0) for code in codes])
+        retired = leader_lap - last_seen > RETIRED_AFTER
+        order = np.lexsort((np.where(retired, -self.aggregates.laps, projected), retired))
+        predictions = [
+            {
+                "Driver": names[i],
+                "DriverCode": codes[i],
+                "PredictedRaceTime (s)": float(pace[i]),
+                "ProjectedFinish (s)": float(projected[i]),
+                "PredictedPosition": position,
+                "LapsCompleted": int(self.aggregates.laps[i]),
+                "Retired": bool(retired[i])
+            }
+            for position, i in enumerate(order, start=1)
+        ]
+
+        changes = [
+            {"Driver": prediction["Driver"], "From": self.positions.get(prediction["Driver"]), "To": prediction["PredictedPosition"]}
+            for prediction in predictions
+            if self.positions.get(prediction["Driver"]) != prediction["PredictedPosition"]
+        ]
+        self.positions = {prediction["Driver"]: prediction["PredictedPosition"] for prediction in predictions}
+
+        return {
+            "gp_name": self.gp_name,
+            "model_type": self.model_type,
+            "lap": leader_lap,
+            "total_laps": self.total_laps,
+            "predictions": predictions,
+            "changes": changes,
+            "timestamp": datetime.now().isoformat()
+        }
+
+
+def replay(live_race, records, speed=0.0):
+    """
+    Feed lap records to a LiveRace one leader lap at a time.
+
+    Args:
+        live_race (LiveRace): Race to update
+        records (list): Output of lap_records
+        speed (float): Replay speed relative to real time, e.g. 10 for ten times faster; 0 replays without waiting
+
+    Yields:
+        dict: The LiveRace result after each leader lap
+    """
+    previous_time = None
+    for leader_lap, batch in leader_laps(records):
+        batch_time = batch[-1]["Time (s)"]
+        if speed > 0 and previous_time is not None:
+            time.sleep(max(batch_time - previous_time, 0) / speed)
+        previous_time = batch_time
+        yield live_race.update(leader_lap, batch)
@@ -0,0 +1,158 @@
+"""
+On-disk store of fitted models.
+
+Models are keyed by Grand Prix, model type, feature schema, hyperparameters
+and a fingerprint of the training data, so a stored model is only reused when
+refitting would produce the same thing. Each artifact is a pickle with a JSON
+sidecar; the artifact's modification time doubles as its last-used time, which
+keeps the LRU bookkeeping safe when several processes share the store.
+"""
+import hashlib
+import json
+import os
+import pickle
+import time
+
+import pandas as pd
+
+# Bump when the artifact layout changes so old artifacts are never loaded
+STORE_VERSION = 1
+
+DEFAULT_STORE_DIR = os.environ.get(
+    "YUKI_MODEL_STORE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "model_store")
+)
+
+
+def data_fingerprint(*frames):
+    """
+    Content hash of the DataFrames/Series a model is trained on.
+    
+    Args:
+        *frames: DataFrames or Series, hashed in order and independent of their index
+    
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    for frame in frames:
+        digest.update(pd.util.hash_pandas_object(frame, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+class ModelStore:
+    """Versioned, size-bounded store of fitted models on local disk."""
+    
+    def __init__(self, root=DEFAULT_STORE_DIR, max_entries=500):
+        """
+        Args:
+            root (str): Directory holding the artifacts
+            max_entries (int): Number of artifacts kept before the least recently used are evicted
+        """
+        self.root = root
+        self.max_entries = max_entries
+        os.makedirs(self.root, exist_ok=True)
+    
+    def key(self, gp_name, model_type, feature_columns, params, data_hash=""):
+        """
+        Build the store key for a model.
+        
+        Args:
+            gp_name (str): Name of the Grand Prix
+            model_type (str): Type of model ("basic", "advanced", "nochange", "olddrivers")
+            feature_columns (list): Feature columns, in training order
+            params (dict): Estimator hyperparameters
+            data_hash (str): Fingerprint of the training data, see data_fingerprint
+        
+        Returns:
+            str: Hex digest identifying the artifact
+        """
+        import sklearn
+        
+        spec = {
+            "store_version": STORE_VERSION,
+            "sklearn_version": sklearn.__version__,
+            "gp_name": gp_name,
+            "model_type": model_type,
+            "feature_columns": list(feature_columns),
+            "params": params,
+            "data_hash": data_hash
+        }
+        return hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()
+    
+    def _path(self, key):
+        return os.path.join(self.root, f"{key}.pkl")
+    
+    def load(self, key):
+        """
+        Load a fitted model and mark it as recently used.
+        
+        Returns:
+            The fitted model, or None if the key is not in the store
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                model = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+        os.utime(path)
+        return model
+    
+    def save(self, key, model, metadata=None):
+        """
+        Save a fitted model, then evict the least recently used artifacts over the limit.
+        
+        Args:
+            key (str): Store key from ModelStore.key
+            model: Fitted estimator
+            metadata (dict, optional): Extra JSON-serialisable details kept in the sidecar file
+        """
+        path = self._path(key)
+        # Write to a temporary file first so concurrent readers never see a partial pickle
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        
+        with open(os.path.join(self.root, f"{key}.json"), "w") as f:
+            json.dump({"created": time.time(), **(metadata or {})}, f, indent=2)
+        
+        self.evict()
+    
+    def get_or_fit(self, key, fit, metadata=None):
+        """
+        Load a model from the store, fitting and saving it on a miss.
+        
+        Args:
+            key (str): Store key from ModelStore.key
+            fit (callable): Returns a freshly fitted model
+            metadata (dict, optional): Sidecar details saved with a newly fitted model
+        
+        Returns:
+            The fitted model
+        """
+        model = self.load(key)
+        if model is None:
+            model = fit()
+            self.save(key, model, metadata)
+        return model
+    
+    def evict(self):
+        """Delete the least recently used artifacts beyond max_entries."""
+        artifacts = []
+        for name in os.listdir(self.root):
+            if name.endswith(".pkl"):
+                path = os.path.join(self.root, name)
+                try:
+                    artifacts.append((os.path.getmtime(path), path))
+                except FileNotFoundError:
+                    continue
+        
+        artifacts.sort(reverse=True)
+        for _, path in artifacts[self.max_entries:]:
+            for stale in (path, path[:-len(".pkl")] + ".json"):
+                try:
+                    os.remove(stale)
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,171 @@
+"""
+Race-time prediction core shared by the scripts, the precompute and the CLI.
+
+Importing this module is cheap: pandas, scikit-learn and FastF1 are only
+imported once a prediction actually runs.
+"""
+from datetime import datetime
+
+MODEL_TYPES = ["basic", "advanced", "nochange", "olddrivers"]
+
+# Feature columns used by each model type
+SECTOR_FEATURES = ["QualifyingTime (s)", "Sector1Time (s)", "Sector2Time (s)", "Sector3Time (s)"]
+FEATURE_COLUMNS = {
+    "basic": ["QualifyingTime (s)"],
+    "advanced": SECTOR_FEATURES,
+    "nochange": SECTOR_FEATURES,
+    "olddrivers": SECTOR_FEATURES
+}
+
+# Gradient boosting hyperparameters shared by every model type
+MODEL_PARAMS = {"n_estimators": 200, "learning_rate": 0.1, "random_state": 38}
+
+
+def load_race_features(year, gp_name, feature_dir=None):
+    """
+    Build the features shared by every model type for one Grand Prix.
+    
+    Race pace comes from the previous season's race at the same Grand Prix,
+    read from the columnar feature cache.
+    
+    Args:
+        year (int): Season being predicted
+        gp_name (str): Name of the Grand Prix
+        feature_dir (str, optional): Root directory of the feature cache, the default cache if omitted
+    
+    Returns:
+        dict: Qualifying table, per-driver sector times, merged features and mean lap times
+    """
+    from yuki.data import qualifying_table
+    from yuki.features import DEFAULT_FEATURE_DIR, load_driver_aggregates
+    from yuki.instrument import stage
+    
+    # Average lap and sector times per driver
+    driver_means = load_driver_aggregates(year - 1, gp_name, "R", feature_dir=feature_dir or DEFAULT_FEATURE_DIR)
+    sector_times = driver_means[["Driver", "Sector1Time (s)", "Sector2Time (s)", "Sector3Time (s)"]]
+    
+    # Merge qualifying data with sector times
+    with stage("merge", year=year, gp=gp_name) as record:
+        qualifying = qualifying_table(year, gp_name)
+        merged_data = qualifying.merge(sector_times, left_on="DriverCode", right_on="Driver", how="left")
+        record["rows"] = len(merged_data)
+    
+    return {
+        "qualifying": qualifying,
+        "sector_times": sector_times,
+        "merged_data": merged_data,
+        "lap_times": driver_means["LapTime (s)"]
+    }
+
+
+def fit_race_model(gp_name, model_type, features, store=None):
+    """
+    Fit a model type on a Grand Prix's features, reusing the stored fit when the training data is unchanged.
+    
+    Args:
+        gp_name (str): Name of the Grand Prix
+        model_type (str): Type of model to use ("basic", "advanced", "nochange", "olddrivers")
+        features (dict): Output of load_race_features
+        store (ModelStore, optional): Store of fitted models, the default store if omitted
+    
+    Returns:
+        tuple: (fitted model, mean absolute error on the held-out split)
+    """
+    from sklearn.ensemble import GradientBoostingRegressor
+    from sklearn.metrics import mean_absolute_error
+    from sklearn.model_selection import train_test_split
+    
+    from yuki.instrument import stage
+    from yuki.model_store import ModelStore, data_fingerprint
+    
+    if model_type not in FEATURE_COLUMNS:
+        raise ValueError(f"Unknown model type {model_type!r}, expected one of {MODEL_TYPES}")
+    if store is None:
+        store = ModelStore()
+    
+    X = features["merged_data"][FEATURE_COLUMNS[model_type]].fillna(0)
+    y = features["lap_times"]
+    
+    # Train model with train_test_split
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=38)
+    key = store.key(gp_name, model_type, X.columns, MODEL_PARAMS, data_fingerprint(X_train, y_train))
+    with stage("fit", gp=gp_name, model_type=model_type, rows=len(X_train)) as record:
+        model = store.load(key)
+        record["model_store_hit"] = model is not None
+        if model is None:
+            model = GradientBoostingRegressor(**MODEL_PARAMS).fit(X_train, y_train)
+            store.save(key, model, {"gp_name": gp_name, "model_type": model_type})
+    
+    # Calculate model error
+    return model, mean_absolute_error(y_test, model.predict(X_test))
+
+
+def score_race(gp_name, model_type, model, features):
+    """
+    Predict race times with a fitted model.
+    
+    Args:
+        gp_name (str): Name of the Grand Prix
+        model_type (str): Type of model the model was fitted as
+        model: Fitted model from fit_race_model
+        features (dict): Qualifying table and merged features, as from load_race_features
+    
+    Returns:
+        list: Driver, PredictedRaceTime (s) and PredictedPosition records, sorted by predicted time
+    """
+    from yuki.instrument import stage
+    
+    qualifying = features["qualifying"].copy()
+    X = features["merged_data"][FEATURE_COLUMNS[model_type]].fillna(0)
+    
+    with stage("predict", gp=gp_name, model_type=model_type, rows=len(X)):
+        # Make predictions, rank them (tied times share a position) and sort by predicted time
+        qualifying["PredictedRaceTime (s)"] = model.predict(X)
+        qualifying["PredictedPosition"] = qualifying["PredictedRaceTime (s)"].rank(method="dense").astype(int)
+        qualifying = qualifying.sort_values(by="PredictedRaceTime (s)", kind="stable")
+        return qualifying[["Driver", "PredictedRaceTime (s)", "PredictedPosition"]].to_dict('records')
+
+
+def run_prediction(year, gp_name, model_type="advanced", features=None, store=None):
+    """
+    Predict race times for a Grand Prix with one model type.
+    
+    Args:
+        year (int): Season being predicted
+        gp_name (str): Name of the Grand Prix
+        model_type (str): Type of model to use ("basic", "advanced", "nochange", "olddrivers")
+        features (dict, optional): Output of load_race_features, loaded on demand if omitted
+        store (ModelStore, optional): Store of fitted models, the default store if omitted
+    
+    Returns:
+        dict: Prediction results, ready for JSON serialisation
+    """
+    if model_type not in FEATURE_COLUMNS:
+        raise ValueError(f"Unknown model type {model_type!r}, expected one of {MODEL_TYPES}")
+    if features is None:
+        features = load_race_features(year, gp_name)
+    
+    model, mae = fit_race_model(gp_name, model_type, features, store)
+    
+    return {
+        "gp_name": gp_name,
+        "model_type": model_type,
+        "predictions": score_race(gp_name, model_type, model, features),
+        "model_error": mae,
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+def predict(year, gp_name, model="advanced"):
+    """
+    Predict race times for a Grand Prix.
+    
+    Args:
+        year (int): Season being predicted
+        gp_name (str): Name of the Grand Prix
+        model (str): Type of model to use ("basic", "advanced", "nochange", "olddrivers")
+    
+    Returns:
+        dict: Prediction results with the drivers sorted by predicted race time
+    """
+    return run_prediction(year, gp_name, model)
@@ -0,0 +1,178 @@
+"""
+Team-radio ingestion into a partitioned on-disk store.
+
+Transcripts are read from local per-session files in chunks, classified once
+with a vectorised regex, and appended to a Parquet dataset partitioned by
+Year, GP and Driver. Statistics across seasons and drivers are then a
+filtered read of one or two columns rather than a rescan of every transcript.
+
+Source files live at <source_dir>/<year>/<gp_slug>.csv with Timestamp, Driver
+(FastF1 3-letter code) and Message columns.
+"""
+import glob
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# Words that mark a message as angry, matched anywhere in the message
+ANGRY_WORDS = ["what", "hell", "fuck", "shit"]
+ANGER_PATTERN = "|".join(ANGRY_WORDS)
+
+PARTITION_COLUMNS = ["Year", "GP", "Driver"]
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SOURCE_DIR = os.environ.get("YUKI_RADIO_SOURCE", os.path.join(_REPO_ROOT, "radio_data"))
+DEFAULT_STORE_DIR = os.environ.get("YUKI_RADIO_STORE", os.path.join(_REPO_ROOT, "radio_store"))
+
+
+def gp_slug(gp_name):
+    """Partition value for a Grand Prix, e.g. "abu_dhabi"."""
+    return gp_name.lower().replace(" ", "_")
+
+
+def source_path(year, gp_name, source_dir=DEFAULT_SOURCE_DIR):
+    return os.path.join(source_dir, str(year), f"{gp_slug(gp_name)}.csv")
+
+
+def iter_radio_chunks(year, gp_name, source_dir=DEFAULT_SOURCE_DIR, chunksize=10_000):
+    """
+    Stream a session's transcripts without loading the whole file.
+
+    Args:
+        year (int): Season
+        gp_name (str): Name of the Grand Prix
+        source_dir (str): Root directory of the transcript files
+        chunksize (int): Rows per chunk
+
+    Yields:
+        pd.DataFrame: Timestamp, Driver and Message columns
+    """
+    yield from pd.read_csv(
+        source_path(year, gp_name, source_dir),
+        usecols=["Timestamp", "Driver", "Message"],
+        dtype={"Timestamp": "string", "Driver": "string", "Message": "string"},
+        chunksize=chunksize
+    )
+
+
+def classify(messages):
+    """
+    Flag angry messages in a single vectorised pass.
+
+    Args:
+        messages (pd.DataFrame): Frame with a Message column
+
+    Returns:
+        pd.DataFrame: The same frame with a boolean Angry column
+    """
+    messages["Angry"] = messages["Message"].str.contains(ANGER_PATTERN, case=False, regex=True, na=False)
+    return messages
+
+
+def _partition_dir(year, gp_name, store_dir):
+    return os.path.join(store_dir, f"Year={year}", f"GP={gp_slug(gp_name)}")
+
+
+def ingest_session(year, gp_name, source_dir=DEFAULT_SOURCE_DIR, store_dir=DEFAULT_STORE_DIR, chunksize=10_000):
+    """
+    Classify a session's transcripts and write them to the store.
+
+    Re-ingesting a session replaces its previous partition, so the store never
+    holds duplicates.
+
+    Args:
+        year (int): Season
+        gp_name (str): Name of the Grand Prix
+        source_dir (str): Root directory of the transcript files
+        store_dir (str): Root directory of the partitioned store
+        chunksize (int): Rows held in memory at a time
+
+    Returns:
+        int: Number of messages ingested
+    """
+    # Write into a hidden staging store first, so a missing or unreadable source leaves the old partition intact
+    os.makedirs(store_dir, exist_ok=True)
+    staging_dir = tempfile.mkdtemp(prefix=".ingest-", dir=store_dir)
+    try:
+        total = 0
+        for i, chunk in enumerate(iter_radio_chunks(year, gp_name, source_dir, chunksize)):
+            chunk = classify(chunk.dropna(subset=["Driver", "Message"]).copy())
+            chunk["Year"] = year
+            chunk["GP"] = gp_slug(gp_name)
+            pq.write_to_dataset(
+                pa.Table.from_pandas(chunk, preserve_index=False),
+                staging_dir,
+                partition_cols=PARTITION_COLUMNS,
+                basename_template=f"part-{i}-{{i}}.parquet"
+            )
+            total += len(chunk)
+
+        # Swap the new partition in, then drop the old one
+        partition_dir = _partition_dir(year, gp_name, store_dir)
+        previous_dir = os.path.join(staging_dir, "previous")
+        if os.path.exists(partition_dir):
+            os.replace(partition_dir, previous_dir)
+        staged_dir = _partition_dir(year, gp_name, staging_dir)
+        if os.path.exists(staged_dir):
+            os.makedirs(os.path.dirname(partition_dir), exist_ok=True)
+            os.replace(staged_dir, partition_dir)
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+    return total
+
+
+def _dataset(store_dir):
+    """Hive-partitioned dataset over the store's Parquet files only, skipping staging and foreign files."""
+    paths = sorted(glob.glob(os.path.join(store_dir, "Year=*", "**", "*.parquet"), recursive=True))
+    return ds.dataset(paths, format="parquet", partitioning="hive", partition_base_dir=store_dir)
+
+
+def _filter(year=None, gp_name=None, driver=None):
+    conditions = []
+    if year is not None:
+        conditions.append(ds.field("Year") == year)
+    if gp_name is not None:
+        conditions.append(ds.field("GP") == gp_slug(gp_name))
+    if driver is not None:
+        conditions.append(ds.field("Driver") == driver)
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def read_messages(year=None, gp_name=None, driver=None, columns=None, store_dir=DEFAULT_STORE_DIR):
+    """
+    Read stored messages, pruning partitions that do not match.
+
+    Args:
+        year (int, optional): Only this season
+        gp_name (str, optional): Only this Grand Prix
+        driver (str, optional): Only this driver code
+        columns (list, optional): Columns to read, all of them if omitted
+        store_dir (str): Root directory of the partitioned store
+
+    Returns:
+        pd.DataFrame: Matching messages
+    """
+    dataset = _dataset(store_dir)
+    return dataset.to_table(columns=columns, filter=_filter(year, gp_name, driver)).to_pandas()
+
+
+def radio_stats(year=None, gp_name=None, driver=None, store_dir=DEFAULT_STORE_DIR):
+    """
+    Message and anger counts per driver, reading only the columns they need.
+
+    Returns:
+        pd.DataFrame: Total, Angry and AngerRatio per driver
+    """
+    messages = read_messages(year, gp_name, driver, columns=["Driver", "Angry"], store_dir=store_dir)
+    stats = messages.groupby("Driver", observed=True)["Angry"].agg(Total="size", Angry="sum")
+    stats["AngerRatio"] = stats["Angry"] / stats["Total"]
+    return stats
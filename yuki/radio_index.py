@@ -0,0 +1,185 @@
+"""
+Full-text index over team-radio transcripts.
+
+Messages from the radio store are copied into a SQLite database with an FTS5
+index on the transcript text and a B-tree index on (driver, year, gp), so a
+phrase lookup across every season is an index probe rather than a pandas
+scan. Sessions are re-indexed only when their store partition changes.
+"""
+import glob
+import hashlib
+import os
+import sqlite3
+
+import pandas as pd
+
+from yuki.radio import DEFAULT_STORE_DIR, gp_slug, read_messages
+
+# Kept beside the store rather than inside it, e.g. radio_store.sqlite next to radio_store/
+DEFAULT_INDEX_PATH = os.environ.get("YUKI_RADIO_INDEX", os.path.normpath(DEFAULT_STORE_DIR) + ".sqlite")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    year INTEGER NOT NULL,
+    gp TEXT NOT NULL,
+    driver TEXT NOT NULL,
+    timestamp TEXT,
+    seconds REAL,
+    message TEXT NOT NULL,
+    angry INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_session ON messages (driver, year, gp, seconds);
+CREATE INDEX IF NOT EXISTS messages_year_gp ON messages (year, gp);
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5 (
+    message, content='messages', content_rowid='id', tokenize='unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts (rowid, message) VALUES (new.id, new.message);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, message) VALUES ('delete', old.id, old.message);
+END;
+CREATE TABLE IF NOT EXISTS sessions (
+    year INTEGER NOT NULL,
+    gp TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    PRIMARY KEY (year, gp)
+);
+"""
+
+
+def connect(index_path=DEFAULT_INDEX_PATH):
+    """Open the index, creating its tables on first use."""
+    os.makedirs(os.path.dirname(os.path.abspath(index_path)), exist_ok=True)
+    conn = sqlite3.connect(index_path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def stored_sessions(store_dir=DEFAULT_STORE_DIR):
+    """
+    Fingerprint every session partition in the radio store.
+
+    Returns:
+        dict: Fingerprint keyed by (year, gp slug), from file names, sizes and mtimes
+    """
+    sessions = {}
+    for session_dir in sorted(glob.glob(os.path.join(store_dir, "Year=*", "GP=*"))):
+        year = int(os.path.basename(os.path.dirname(session_dir)).split("=", 1)[1])
+        gp = os.path.basename(session_dir).split("=", 1)[1]
+        digest = hashlib.sha256()
+        for path in sorted(glob.glob(os.path.join(session_dir, "**", "*.parquet"), recursive=True)):
+            stat = os.stat(path)
+            digest.update(f"{os.path.relpath(path, session_dir)}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+        sessions[(year, gp)] = digest.hexdigest()
+    return sessions
+
+
+def _seconds(timestamps):
+    """Session time in seconds for "HH:MM:SS"-style timestamps, NaN where unparseable."""
+    return pd.to_timedelta(timestamps, errors="coerce").dt.total_seconds()
+
+
+def update_index(store_dir=DEFAULT_STORE_DIR, index_path=DEFAULT_INDEX_PATH):
+    """
+    Bring the index up to date with the radio store.
+
+    Only sessions that are new or whose partition changed are re-indexed;
+    sessions removed from the store are dropped.
+
+    Args:
+        store_dir (str): Root directory of the radio store
+        index_path (str): SQLite index file
+
+    Returns:
+        list: (year, gp slug) of the sessions that were re-indexed
+    """
+    sessions = stored_sessions(store_dir)
+    conn = connect(index_path)
+    try:
+        indexed = {(row["year"], row["gp"]): row["fingerprint"] for row in conn.execute("SELECT * FROM sessions")}
+        changed = [key for key, fingerprint in sessions.items() if indexed.get(key) != fingerprint]
+
+        with conn:
+            for year, gp in set(indexed) - set(sessions):
+                conn.execute("DELETE FROM messages WHERE year = ? AND gp = ?", (year, gp))
+                conn.execute("DELETE FROM sessions WHERE year = ? AND gp = ?", (year, gp))
+
+            for year, gp in changed:
+                messages = read_messages(year, gp, columns=["Driver", "Timestamp", "Message", "Angry"], store_dir=store_dir)
+                rows = zip(
+                    [year] * len(messages),
+                    [gp] * len(messages),
+                    messages["Driver"].astype(str),
+                    messages["Timestamp"].astype(object).where(messages["Timestamp"].notna(), None),
+                    _seconds(messages["Timestamp"]).astype(object).where(messages["Timestamp"].notna(), None),
+                    messages["Message"].astype(str),
+                    messages["Angry"].astype(int)
+                )
+                conn.execute("DELETE FROM messages WHERE year = ? AND gp = ?", (year, gp))
+                conn.executemany(
+                    "INSERT INTO messages (year, gp, driver, timestamp, seconds, message, angry) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                conn.execute("INSERT OR REPLACE INTO sessions VALUES (?, ?, ?)", (year, gp, sessions[(year, gp)]))
+        return changed
+    finally:
+        conn.close()
+
+
+def _quote(text):
+    """FTS5 string literal, so user input is never parsed as query syntax."""
+    return '"' + text.replace('"', '""') + '"'
+
+
+def search(terms=None, phrase=None, driver=None, year=None, gp_name=None, start=None, end=None,
+           limit=50, index_path=DEFAULT_INDEX_PATH):
+    """
+    Look up radio messages.
+
+    Args:
+        terms (list, optional): Words that must all appear in the message
+        phrase (str, optional): Exact phrase that must appear in the message
+        driver (str, optional): Only this driver code
+        year (int, optional): Only this season
+        gp_name (str, optional): Only this Grand Prix
+        start (float, optional): Earliest session time in seconds
+        end (float, optional): Latest session time in seconds
+        limit (int): Maximum number of messages returned
+        index_path (str): SQLite index file
+
+    Returns:
+        list: Matching messages as dicts, in season and session-time order
+    """
+    match = [_quote(term) for term in terms or []]
+    if phrase:
+        match.append(_quote(phrase))
+
+    conditions, params = [], []
+    if match:
+        conditions.append("messages.id IN (SELECT rowid FROM messages_fts WHERE messages_fts MATCH ?)")
+        params.append(" AND ".join(match))
+    for column, value in (("driver", driver), ("year", year), ("gp", gp_slug(gp_name) if gp_name else None)):
+        if value is not None:
+            conditions.append(f"{column} = ?")
+            params.append(value)
+    if start is not None:
+        conditions.append("seconds >= ?")
+        params.append(start)
+    if end is not None:
+        conditions.append("seconds <= ?")
+        params.append(end)
+
+    query = "SELECT year, gp, driver, timestamp, seconds, message, angry FROM messages"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY year, gp, seconds LIMIT ?"
+    params.append(limit)
+
+    conn = connect(index_path)
+    try:
+        return [dict(row, angry=bool(row["angry"])) for row in conn.execute(query, params)]
+    finally:
+        conn.close()
@@ -0,0 +1,270 @@
+"""
+Season calendar and qualifying results ingested from FastF1 into SQLite.
+
+One ingestion per season reads the event schedule and every held
+qualifying session's Q1/Q2/Q3 times through the shared FastF1 cache and
+stores them in an indexed table keyed by (year, round, driver code). The
+predictors then read a weekend's qualifying with one index lookup instead of
+relying on hand-typed tables, and seasons already ingested are only topped up
+with the rounds that were missing.
+"""
+import os
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# FastF1 event names (without "Grand Prix") of the 2018-2025 seasons whose Grand Prix
+# goes by another name in the repository; names like "Monaco" or "Miami" already match
+EVENT_ALIASES = {
+    "Australian": "Australia",
+    "Austrian": "Austria",
+    "Belgian": "Belgium",
+    "Brazilian": "Brazil",
+    "British": "Great Britain",
+    "Canadian": "Canada",
+    "Chinese": "China",
+    "Dutch": "Netherlands",
+    "French": "France",
+    "German": "Germany",
+    "Hungarian": "Hungary",
+    "Italian": "Italy",
+    "Japanese": "Japan",
+    "Mexican": "Mexico",
+    "Mexico City": "Mexico",
+    "Portuguese": "Portugal",
+    "Russian": "Russia",
+    "Saudi Arabian": "Saudi Arabia",
+    "Spanish": "Spain",
+    "São Paulo": "Brazil",
+    "Turkish": "Turkey",
+}
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SEASON_DB = os.environ.get("YUKI_SEASON_DB", os.path.join(_REPO_ROOT, "season_store", "season.sqlite"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    year INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    gp TEXT NOT NULL,
+    event_name TEXT NOT NULL,
+    country TEXT,
+    location TEXT,
+    event_date TEXT,
+    PRIMARY KEY (year, round)
+);
+CREATE INDEX IF NOT EXISTS events_gp ON events (year, gp);
+CREATE TABLE IF NOT EXISTS qualifying (
+    year INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    driver_code TEXT NOT NULL,
+    driver_name TEXT,
+    team TEXT,
+    position INTEGER,
+    q1 REAL,
+    q2 REAL,
+    q3 REAL,
+    best REAL,
+    PRIMARY KEY (year, round, driver_code)
+) WITHOUT ROWID;
+"""
+
+
+def connect(db_path=DEFAULT_SEASON_DB):
+    """Open the season store, creating its tables on first use."""
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def gp_name(event_name):
+    """
+    Grand Prix name used across the repository for a schedule entry.
+
+    The event name without "Grand Prix", mapped through EVENT_ALIASES when
+    FastF1 names the event differently (e.g. "British" is "Great Britain").
+    One-off events such as "Styrian" or "Sakhir" keep their own name, so they
+    never merge with the regular race at the same circuit.
+    """
+    short_name = event_name.replace("Grand Prix", "").strip()
+    return EVENT_ALIASES.get(short_name, short_name)
+
+
+def _seconds(values):
+    return pd.to_timedelta(values).dt.total_seconds().to_numpy()
+
+
+def qualifying_rows(year, round_number, results):
+    """
+    Rows of the qualifying table for one session's results.
+
+    Args:
+        year (int): Season
+        round_number (int): Round of the event
+        results (pd.DataFrame): FastF1 session.results of a qualifying session
+
+    Returns:
+        list: Tuples in the qualifying table's column order
+    """
+    q_times = np.column_stack([_seconds(results[column]) for column in ("Q1", "Q2", "Q3")])
+    # Fastest of the driver's Q1/Q2/Q3 times, NaN only when they set none
+    best = np.fmin.reduce(q_times, axis=1)
+
+    def value(x):
+        return None if pd.isna(x) else float(x)
+
+    return [
+        (year, round_number, code, name, team, None if pd.isna(position) else int(position),
+         value(q1), value(q2), value(q3), value(best_time))
+        for code, name, team, position, (q1, q2, q3), best_time in zip(
+            results["Abbreviation"], results["FullName"], results["TeamName"], results["Position"], q_times, best
+        )
+    ]
+
+
+def ingest_season(year, db_path=DEFAULT_SEASON_DB, force=False):
+    """
+    Store a season's schedule and the qualifying results of every event held so far.
+
+    Rounds that already have qualifying rows are skipped unless force is set;
+    rounds whose qualifying fails to load are reported and left for the next run.
+
+    Args:
+        year (int): Season
+        db_path (str): Path of the season store
+        force (bool): Reload qualifying for rounds already stored
+
+    Returns:
+        dict: Drivers stored keyed by Grand Prix, 0 for skipped rounds
+    """
+    import fastf1
+
+    from yuki.f1cache import _ensure_enabled, load_session
+
+    _ensure_enabled()
+    schedule = fastf1.get_event_schedule(year, include_testing=False)
+    events = [
+        (year, int(event["RoundNumber"]),
+         gp_name(event["EventName"]),
+         event["EventName"], event["Country"], event["Location"],
+         None if pd.isna(event["EventDate"]) else event["EventDate"].date().isoformat())
+        for _, event in schedule.iterrows()
+    ]
+
+    stored = {}
+    conn = connect(db_path)
+    try:
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?, ?)", events)
+        done = {row["round"] for row in conn.execute("SELECT DISTINCT round FROM qualifying WHERE year = ?", (year,))}
+        today = datetime.now().date().isoformat()
+
+        for _, round_number, name, _, _, _, event_date in events:
+            if (round_number in done and not force) or (event_date and event_date > today):
+                stored[name] = 0
+                continue
+            try:
+                results = load_session(year, name, "Q").results
+            except Exception as e:
+                print(f"Skipping {year} {name} qualifying: {str(e)}")
+                stored[name] = 0
+                continue
+
+            # One transaction per round, so an interrupted ingestion keeps what it already loaded
+            rows = qualifying_rows(year, round_number, results)
+            with conn:
+                conn.execute("DELETE FROM qualifying WHERE year = ? AND round = ?", (year, round_number))
+                conn.executemany("INSERT INTO qualifying VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            stored[name] = len(rows)
+            print(f"Stored {len(rows)} qualifying results for {year} {name}")
+    finally:
+        conn.close()
+    return stored
+
+
+def season_races(year, db_path=DEFAULT_SEASON_DB):
+    """
+    Grands Prix of an ingested season, in round order.
+
+    Returns:
+        list: Grand Prix names, or None if the season has not been ingested
+    """
+    if not os.path.exists(db_path):
+        return None
+    conn = connect(db_path)
+    try:
+        rows = conn.execute("SELECT gp FROM events WHERE year = ? ORDER BY round", (year,)).fetchall()
+    finally:
+        conn.close()
+    return [row["gp"] for row in rows] or None
+
+
+def held_races(year, db_path=DEFAULT_SEASON_DB):
+    """
+    Grands Prix actually on a season's calendar, in round order.
+
+    Unlike race_calendar this never falls back to RACES_2024: a season that
+    has not been ingested is read from FastF1's event schedule. FastF1 matches
+    event names fuzzily, so loading a Grand Prix that was not held that season
+    would silently load a different race; check membership here first.
+
+    Args:
+        year (int): Season
+        db_path (str): Path of the season store
+
+    Returns:
+        list: Grand Prix names
+    """
+    races = season_races(year, db_path)
+    if races is not None:
+        return races
+
+    import fastf1
+
+    from yuki.f1cache import _ensure_enabled
+
+    _ensure_enabled()
+    schedule = fastf1.get_event_schedule(year, include_testing=False)
+    return [gp_name(event_name) for event_name in schedule["EventName"]]
+
+
+def load_qualifying(year, gp, db_path=DEFAULT_SEASON_DB):
+    """
+    Stored qualifying results of a Grand Prix.
+
+    Drivers without a time in any part of qualifying get the session's slowest
+    time, so they start from the back rather than with a missing feature.
+
+    Args:
+        year (int): Season
+        gp (str): Name of the Grand Prix
+        db_path (str): Path of the season store
+
+    Returns:
+        pd.DataFrame: Driver, QualifyingTime (s), DriverCode, Team and Q1/Q2/Q3 (s) columns in
+            qualifying order, or None if the weekend has not been ingested
+    """
+    if not os.path.exists(db_path):
+        return None
+    conn = connect(db_path)
+    try:
+        table = pd.read_sql_query(
+            """
+            SELECT q.driver_name AS "Driver", q.best AS "QualifyingTime (s)", q.driver_code AS "DriverCode",
+                   q.team AS "Team", q.q1 AS "Q1 (s)", q.q2 AS "Q2 (s)", q.q3 AS "Q3 (s)"
+            FROM events e JOIN qualifying q ON q.year = e.year AND q.round = e.round
+            WHERE e.year = ? AND e.gp = ?
+            ORDER BY q.position IS NULL, q.position
+            """,
+            conn, params=(year, gp)
+        )
+    finally:
+        conn.close()
+    if table.empty:
+        return None
+    table["QualifyingTime (s)"] = table["QualifyingTime (s)"].fillna(table["QualifyingTime (s)"].max())
+    return table
@@ -0,0 +1,331 @@
+"""
+Local HTTP prediction service.
+
+    GET  /predict/{gp}/{model}    predictions for a Grand Prix, e.g. /predict/emilia-romagna/advanced
+    POST /predict/{gp}/{model}    what-if predictions, body {"qualifying": {"TSU": 75.4, ...}}
+    GET  /health                  cache statistics
+
+Race features and fitted models are loaded once and kept in memory, so a
+what-if scenario only re-scores the fitted model on the edited qualifying
+times. Results are held in an LRU cache, and identical requests that arrive
+while one is being computed wait for that computation instead of repeating
+it.
+"""
+import json
+import math
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+from yuki.data import DRIVER_MAPPING, race_calendar
+from yuki.prediction import MODEL_TYPES, fit_race_model, load_race_features, score_race
+
+# Predictions are for the 2025 season, trained on the 2024 race at each Grand Prix
+PREDICTION_YEAR = 2025
+
+
+class Coalescer:
+    """Runs each distinct key once at a time; concurrent callers with the same key share the result."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight = {}
+
+    def run(self, key, compute):
+        """
+        Compute a value, or wait for the identical computation already in progress.
+
+        Args:
+            key: Hashable identity of the computation
+            compute (callable): Produces the value
+
+        Returns:
+            The computed value; exceptions are raised in every waiting caller
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+
+        if not owner:
+            return future.result()
+
+        try:
+            future.set_result(compute())
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+        return future.result()
+
+
+class LRUCache:
+    """Thread-safe mapping that drops the least recently used entry beyond max_entries."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def normalise_qualifying(times):
+    """
+    Validate what-if qualifying times and key them by driver code.
+
+    Args:
+        times (dict): Qualifying times in seconds, keyed by driver code or full name
+
+    Returns:
+        dict: Times as floats keyed by driver code
+
+    Raises:
+        ValueError: For times that are not positive, finite numbers
+    """
+    normalised = {}
+    for driver, time in times.items():
+        if isinstance(time, bool) or not isinstance(time, (int, float)) or not math.isfinite(time) or time <= 0:
+            raise ValueError(f"Qualifying time for {driver!r} must be a positive, finite number of seconds")
+        normalised[DRIVER_MAPPING.get(driver, driver)] = float(time)
+    return normalised
+
+
+def apply_qualifying(features, times):
+    """
+    Replace qualifying times in a race's features.
+
+    Args:
+        features (dict): Output of load_race_features, left unchanged
+        times (dict): New qualifying times in seconds, keyed by driver code
+
+    Returns:
+        dict: Copy of the features with the new times in the qualifying table and merged features
+
+    Raises:
+        ValueError: For drivers not in the qualifying table
+    """
+    qualifying = features["qualifying"].copy()
+    merged_data = features["merged_data"].copy()
+
+    for code, time in times.items():
+        rows = (qualifying["DriverCode"] == code).to_numpy()
+        if not rows.any():
+            raise ValueError(f"Unknown driver {code!r}")
+        qualifying.loc[rows, "QualifyingTime (s)"] = time
+        merged_data.loc[rows, "QualifyingTime (s)"] = time
+
+    return {**features, "qualifying": qualifying, "merged_data": merged_data}
+
+
+class PredictionService:
+    """Prediction core with in-memory features, models and results."""
+
+    def __init__(self, year=PREDICTION_YEAR, races=None, max_results=1024, store=None):
+        """
+        Args:
+            year (int): Season being predicted
+            races (list, optional): Grands Prix the service answers for, the previous season's calendar if omitted
+            max_results (int): Number of results kept in the LRU cache
+            store (ModelStore, optional): Store of fitted models, the default store if omitted
+        """
+        self.year = year
+        self.races = list(races or race_calendar(year - 1))
+        self.store = store
+        self.results = LRUCache(max_results)
+        self._features = {}
+        self._models = {}
+        self._coalescer = Coalescer()
+
+    def resolve_race(self, name):
+        """Grand Prix for a URL segment: its name or its slug, e.g. "emilia-romagna"."""
+        name = unquote(name)
+        for gp_name in self.races:
+            if name.lower() in (gp_name.lower(), gp_name.lower().replace(" ", "-")):
+                return gp_name
+        return None
+
+    def features(self, gp_name):
+        """Race features, loaded once per Grand Prix."""
+        if gp_name not in self._features:
+            self._features[gp_name] = self._coalescer.run(
+                ("features", gp_name), lambda: load_race_features(self.year, gp_name)
+            )
+        return self._features[gp_name]
+
+    def model(self, gp_name, model_type):
+        """Fitted model and its error, loaded or fitted once per Grand Prix and model type."""
+        key = (gp_name, model_type)
+        if key not in self._models:
+            self._models[key] = self._coalescer.run(
+                ("model",) + key, lambda: fit_race_model(gp_name, model_type, self.features(gp_name), self.store)
+            )
+        return self._models[key]
+
+    def predict(self, gp_name, model_type, qualifying=None):
+        """
+        Predict a Grand Prix, optionally with edited qualifying times.
+
+        Args:
+            gp_name (str): Name of the Grand Prix
+            model_type (str): Type of model to use
+            qualifying (dict, optional): What-if qualifying times in seconds, keyed by driver code or name
+
+        Returns:
+            dict: Prediction results in the precompute format, plus the scenario's qualifying times
+        """
+        qualifying = normalise_qualifying(qualifying or {})
+        scenario = tuple(sorted(qualifying.items()))
+        key = (gp_name, model_type, scenario)
+        result = self.results.get(key)
+        if result is None:
+            result = self._coalescer.run(key, lambda: self._compute(gp_name, model_type, qualifying))
+            self.results.put(key, result)
+        return result
+
+    def _compute(self, gp_name, model_type, qualifying):
+        model, mae = self.model(gp_name, model_type)
+        features = self.features(gp_name)
+        if qualifying:
+            features = apply_qualifying(features, qualifying)
+        return {
+            "gp_name": gp_name,
+            "model_type": model_type,
+            "predictions": score_race(gp_name, model_type, model, features),
+            "model_error": mae,
+            "qualifying": qualifying,
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def preload(self, model_types=MODEL_TYPES):
+        """Load every race's features and models up front, so the first requests are fast too."""
+        for gp_name in self.races:
+            for model_type in model_types:
+                try:
+                    self.model(gp_name, model_type)
+                except Exception as e:
+                    print(f"Error preloading {gp_name} {model_type}: {str(e)}")
+
+
+def make_handler(service):
+    """Request handler class bound to a PredictionService."""
+
+    class PredictionHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status, body):
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            # The dashboard runs on its own dev server port
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _route(self):
+            """(Grand Prix, model type) for a /predict/{gp}/{model} path, after sending a 404 otherwise."""
+            parts = self.path.split("?", 1)[0].strip("/").split("/")
+            if len(parts) != 3 or parts[0] != "predict":
+                self._send_json(404, {"error": "Expected /predict/{gp}/{model}"})
+                return None
+            gp_name = service.resolve_race(parts[1])
+            if gp_name is None:
+                self._send_json(404, {"error": f"Unknown Grand Prix {unquote(parts[1])!r}"})
+                return None
+            if parts[2] not in MODEL_TYPES:
+                self._send_json(404, {"error": f"Unknown model type {parts[2]!r}, expected one of {MODEL_TYPES}"})
+                return None
+            return gp_name, parts[2]
+
+        def _respond(self, gp_name, model_type, qualifying=None):
+            try:
+                self._send_json(200, service.predict(gp_name, model_type, qualifying))
+            except ValueError as e:
+                self._send_json(400, {"error": str(e)})
+            except Exception as e:
+                self._send_json(500, {"error": str(e)})
+
+        def do_GET(self):
+            if self.path.split("?", 1)[0].rstrip("/") == "/health":
+                self._send_json(200, {
+                    "races": len(service._features),
+                    "models": len(service._models),
+                    "results": len(service.results),
+                    "result_hits": service.results.hits,
+                    "result_misses": service.results.misses
+                })
+                return
+            route = self._route()
+            if route:
+                self._respond(*route)
+
+        def do_POST(self):
+            route = self._route()
+            if not route:
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                qualifying = body.get("qualifying", {})
+                if not isinstance(qualifying, dict):
+                    raise ValueError('"qualifying" must map drivers to times in seconds')
+            except (ValueError, AttributeError) as e:
+                self._send_json(400, {"error": f"Invalid request body: {str(e)}"})
+                return
+            self._respond(*route, qualifying)
+
+        def do_OPTIONS(self):
+            self.send_response(204)
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
+            self.send_header("Access-Control-Allow-Headers", "Content-Type")
+            self.end_headers()
+
+    return PredictionHandler
+
+
+def serve(host="127.0.0.1", port=8000, preload=False, service=None):
+    """
+    Serve predictions over HTTP until interrupted.
+
+    Args:
+        host (str): Interface to listen on
+        port (int): Port to listen on
+        preload (bool): Load every race's features and models before accepting requests
+        service (PredictionService, optional): Service to expose, a default one if omitted
+    """
+    service = service or PredictionService()
+    if preload:
+        service.preload()
+
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    print(f"Serving predictions on http://{host}:{port}/predict/{{gp}}/{{model}}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
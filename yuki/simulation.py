@@ -0,0 +1,123 @@
+"""
+Monte Carlo race simulation around the point predictions.
+
+Each simulated race perturbs every driver's predicted race time with noise
+and ranks the result. The noise is a normal approximation of the model's
+residuals, with the spread implied by its mean absolute error, or is
+bootstrapped from empirical residuals when a caller has them. Races are
+drawn in batches of NumPy arrays, one row per simulated race, so 100k
+simulations are a handful of vectorised sorts rather than a Python loop.
+"""
+import numpy as np
+
+# Points for P1 to P10
+POINTS = np.array([25, 18, 15, 12, 10, 8, 6, 4, 2, 1], dtype=np.float64)
+
+
+def residual_scale(model_error):
+    """
+    Standard deviation of normally distributed residuals with the given mean absolute error.
+
+    The mean absolute value of N(0, sigma) is sigma * sqrt(2 / pi).
+    """
+    return model_error * np.sqrt(np.pi / 2)
+
+
+def iter_simulations(predicted_times, n_simulations=100_000, scale=None, residuals=None, seed=None, batch_size=20_000):
+    """
+    Simulate a race in batches, yielding the running probabilities after each batch.
+
+    Noise is resampled from `residuals` when given, otherwise drawn from
+    N(0, scale).
+
+    Args:
+        predicted_times (array-like): Predicted race time per driver
+        n_simulations (int): Total number of simulated races
+        scale (float, optional): Standard deviation of the normal noise
+        residuals (array-like, optional): Empirical residuals to bootstrap the noise from
+        seed (int or np.random.SeedSequence, optional): Seed for reproducible draws
+        batch_size (int): Simulated races per batch
+
+    Yields:
+        dict: Simulations so far and per-driver win, podium and points probabilities,
+        expected points and mean finishing position, in the order of predicted_times
+    """
+    if scale is None and residuals is None:
+        raise ValueError("Either scale or residuals is required")
+    if n_simulations < 1:
+        raise ValueError(f"n_simulations must be positive, got {n_simulations}")
+
+    times = np.asarray(predicted_times, dtype=np.float64)
+    n_drivers = len(times)
+    rng = np.random.default_rng(seed)
+    residuals = None if residuals is None else np.asarray(residuals, dtype=np.float64)
+
+    points = POINTS[:n_drivers]
+    wins = np.zeros(n_drivers)
+    podiums = np.zeros(n_drivers)
+    in_points = np.zeros(n_drivers)
+    total_points = np.zeros(n_drivers)
+    total_positions = np.zeros(n_drivers)
+
+    done = 0
+    while done < n_simulations:
+        size = min(batch_size, n_simulations - done)
+        if residuals is None:
+            noise = rng.standard_normal((size, n_drivers)) * scale
+        else:
+            noise = rng.choice(residuals, size=(size, n_drivers))
+
+        # Driver index at each finishing position, one row per simulated race
+        order = np.argsort(times + noise, axis=1)
+
+        wins += np.bincount(order[:, 0], minlength=n_drivers)
+        podiums += np.bincount(order[:, :3].ravel(), minlength=n_drivers)
+        in_points += np.bincount(order[:, :len(points)].ravel(), minlength=n_drivers)
+        total_points += np.bincount(order[:, :len(points)].ravel(), weights=np.tile(points, size), minlength=n_drivers)
+        total_positions += np.bincount(order.ravel(), weights=np.tile(np.arange(1, n_drivers + 1), size), minlength=n_drivers)
+        done += size
+
+        yield {
+            "simulations": done,
+            "win": wins / done,
+            "podium": podiums / done,
+            "points": in_points / done,
+            "expected_points": total_points / done,
+            "mean_position": total_positions / done
+        }
+
+
+def simulate_race(predicted_times, n_simulations=100_000, scale=None, residuals=None, seed=None, batch_size=20_000):
+    """
+    Simulate a race and return the final probabilities.
+
+    Takes the same arguments as iter_simulations.
+
+    Returns:
+        dict: The last result of iter_simulations
+    """
+    result = None
+    for result in iter_simulations(predicted_times, n_simulations, scale, residuals, seed, batch_size):
+        pass
+    return result
+
+
+def probability_table(drivers, result, decimals=4):
+    """
+    Per-driver records of a simulation result, most likely winner first.
+
+    Args:
+        drivers (list): Driver names, in the order of the simulated times
+        result (dict): Output of simulate_race or one step of iter_simulations
+        decimals (int): Rounding of the probabilities
+
+    Returns:
+        list: Driver, Win, Podium, Points, ExpectedPoints and MeanPosition records
+    """
+    columns = [("Win", "win"), ("Podium", "podium"), ("Points", "points"),
+               ("ExpectedPoints", "expected_points"), ("MeanPosition", "mean_position")]
+    records = [
+        {"Driver": driver, **{name: round(float(result[key][i]), decimals) for name, key in columns}}
+        for i, driver in enumerate(drivers)
+    ]
+    return sorted(records, key=lambda record: (-record["Win"], record["MeanPosition"]))
@@ -0,0 +1,215 @@
+"""
+Per-lap car telemetry features: speed, throttle, brake and gear aggregates.
+
+Car data comes from FastF1's session telemetry, whose SessionTime is on the
+same clock as the lap timing, without the per-lap telemetry merges. FastF1
+loads a session's car and position streams whole, so peak memory still grows
+with the session: the loaded streams are the floor. The unused position data
+is dropped as soon as it is loaded, and each driver's samples are taken out of
+session.car_data and released once reduced. The memory budget bounds only the
+working arrays of the reduction, which are built in fixed-size chunks on top
+of the loaded data. The per-lap and per-driver results go to the columnar
+feature cache next to the lap tables.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from yuki.features import DEFAULT_FEATURE_DIR, _feature_path, _read_table, _write_table
+from yuki.instrument import stage
+
+# Throttle at or above this percentage counts as full throttle
+FULL_THROTTLE = 98
+
+# Working bytes per sample across the chunk's arrays and temporaries
+BYTES_PER_SAMPLE = 96
+
+TELEMETRY_COLUMNS = ["TopSpeed", "MinSpeed", "MeanSpeed", "FullThrottleRatio", "BrakeRatio", "BrakeZones", "GearChanges"]
+
+
+def chunk_rows(memory_budget_mb):
+    """Samples per chunk that keep the working arrays within the memory budget."""
+    return max(1024, int(memory_budget_mb * 1e6) // BYTES_PER_SAMPLE)
+
+
+def lap_aggregates(times, speed, throttle, brake, gear, lap_starts, lap_ends, rows_per_chunk):
+    """
+    Reduce one driver's telemetry samples to per-lap aggregates in a single chunked pass.
+
+    Args:
+        times (np.ndarray): Sample session times in seconds, ascending
+        speed (np.ndarray): Speed in km/h
+        throttle (np.ndarray): Throttle in percent
+        brake (np.ndarray): Brake pressed, as booleans
+        gear (np.ndarray): Gear number
+        lap_starts (np.ndarray): Session time each lap starts, ascending
+        lap_ends (np.ndarray): Session time each lap ends
+        rows_per_chunk (int): Samples reduced at a time
+
+    Returns:
+        dict: One array per TELEMETRY_COLUMNS entry plus "Samples", indexed like lap_starts
+    """
+    n_laps = len(lap_starts)
+    samples = np.zeros(n_laps)
+    top_speed = np.full(n_laps, np.nan)
+    min_speed = np.full(n_laps, np.nan)
+    speed_sum = np.zeros(n_laps)
+    full_throttle = np.zeros(n_laps)
+    braking = np.zeros(n_laps)
+    brake_zones = np.zeros(n_laps)
+    gear_changes = np.zeros(n_laps)
+
+    # State carried across chunk boundaries so edges are counted exactly once
+    previous_brake = False
+    previous_gear = None
+
+    for start in range(0, len(times), rows_per_chunk):
+        stop = start + rows_per_chunk
+        t, v, thr, brk, gr = times[start:stop], speed[start:stop], throttle[start:stop], brake[start:stop], gear[start:stop]
+
+        brake_starts = brk & ~np.concatenate(([previous_brake], brk[:-1]))
+        shifts = gr != np.concatenate(([gr[0] if previous_gear is None else previous_gear], gr[:-1]))
+        previous_brake, previous_gear = bool(brk[-1]), gr[-1]
+
+        # Lap of each sample; samples before the first lap or between laps are dropped
+        lap = np.searchsorted(lap_starts, t, side="right") - 1
+        in_lap = lap >= 0
+        in_lap[in_lap] = t[in_lap] <= lap_ends[lap[in_lap]]
+        if not in_lap.any():
+            continue
+        lap, v, thr, brk, brake_starts, shifts = lap[in_lap], v[in_lap], thr[in_lap], brk[in_lap], brake_starts[in_lap], shifts[in_lap]
+
+        samples += np.bincount(lap, minlength=n_laps)
+        speed_sum += np.bincount(lap, weights=v, minlength=n_laps)
+        full_throttle += np.bincount(lap, weights=thr >= FULL_THROTTLE, minlength=n_laps)
+        braking += np.bincount(lap, weights=brk, minlength=n_laps)
+        brake_zones += np.bincount(lap, weights=brake_starts, minlength=n_laps)
+        gear_changes += np.bincount(lap, weights=shifts, minlength=n_laps)
+
+        # Samples are in time order, so each lap is one contiguous run within the chunk
+        run_starts = np.flatnonzero(np.concatenate(([True], lap[1:] != lap[:-1])))
+        run_laps = lap[run_starts]
+        top_speed[run_laps] = np.fmax(top_speed[run_laps], np.maximum.reduceat(v, run_starts))
+        min_speed[run_laps] = np.fmin(min_speed[run_laps], np.minimum.reduceat(v, run_starts))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return {
+            "Samples": samples,
+            "TopSpeed": top_speed,
+            "MinSpeed": min_speed,
+            "MeanSpeed": speed_sum / samples,
+            "FullThrottleRatio": full_throttle / samples,
+            "BrakeRatio": braking / samples,
+            "BrakeZones": brake_zones,
+            "GearChanges": gear_changes
+        }
+
+
+def _seconds(values):
+    return pd.to_timedelta(values).dt.total_seconds().to_numpy()
+
+
+def build_telemetry_features(year, gp_name, session_name="R", memory_budget_mb=256, feature_dir=DEFAULT_FEATURE_DIR):
+    """
+    Extract per-lap telemetry features for a session and write them to the feature cache.
+
+    Args:
+        year (int): Season
+        gp_name (str): Name of the Grand Prix
+        session_name (str): FastF1 session identifier
+        memory_budget_mb (float): Budget for the chunk working arrays, on top of the loaded car data
+        feature_dir (str): Root directory of the feature cache
+
+    Returns:
+        pd.DataFrame: Per-lap telemetry features
+    """
+    from yuki.f1cache import load_session
+
+    session = load_session(year, gp_name, session_name, telemetry=True)
+    # Position data comes with the car data but is never used, so free it before reducing
+    session.pos_data.clear()
+    laps = session.laps[["Driver", "DriverNumber", "LapNumber", "LapStartTime", "Time"]].dropna()
+    rows = chunk_rows(memory_budget_mb)
+
+    with stage("telemetry", year=year, gp=gp_name, session=session_name) as record:
+        # Per-driver car telemetry, with SessionTime (Date - session.t0_date) on the same clock as the lap times
+        car_data = session.car_data
+        tables = []
+        samples = 0
+        for number in list(car_data):
+            # Take this driver's samples out of the stream so they are freed once reduced
+            frame = car_data.pop(number)
+            driver_laps = laps[laps["DriverNumber"] == number].sort_values("LapStartTime")
+            if driver_laps.empty or frame.empty:
+                continue
+
+            frame = frame.sort_values("SessionTime", kind="stable")
+            aggregates = lap_aggregates(
+                _seconds(frame["SessionTime"]),
+                frame["Speed"].to_numpy(dtype=np.float32),
+                frame["Throttle"].to_numpy(dtype=np.float32),
+                frame["Brake"].to_numpy(dtype=bool),
+                frame["nGear"].to_numpy(dtype=np.int8),
+                _seconds(driver_laps["LapStartTime"]),
+                _seconds(driver_laps["Time"]),
+                rows
+            )
+            samples += len(frame)
+            del frame
+
+            table = pd.DataFrame({column: values.astype(np.float32) for column, values in aggregates.items()})
+            table.insert(0, "LapNumber", driver_laps["LapNumber"].to_numpy(dtype=np.float32))
+            table.insert(0, "Driver", driver_laps["Driver"].iloc[0])
+            tables.append(table[table["Samples"] > 0])
+
+        lap_table = pd.concat(tables, ignore_index=True) if tables else pd.DataFrame(columns=["Driver", "LapNumber", "Samples"] + TELEMETRY_COLUMNS)
+        record["rows"] = samples
+
+    _write_table(lap_table, _feature_path(year, gp_name, session_name, "telemetry", feature_dir))
+    _write_table(driver_telemetry(lap_table), _feature_path(year, gp_name, session_name, "telemetry_drivers", feature_dir))
+    return lap_table
+
+
+def driver_telemetry(lap_table):
+    """
+    Per-driver telemetry features: the best top speed and the mean of every other per-lap aggregate.
+
+    Args:
+        lap_table (pd.DataFrame): Per-lap features from build_telemetry_features
+
+    Returns:
+        pd.DataFrame: One row per driver, sorted by driver code
+    """
+    grouped = lap_table.groupby("Driver")
+    aggregates = grouped[[column for column in TELEMETRY_COLUMNS if column != "TopSpeed"]].mean()
+    aggregates.insert(0, "TopSpeed", grouped["TopSpeed"].max())
+    return aggregates.reset_index()
+
+
+def load_telemetry(year, gp_name, session_name="R", per_driver=False, columns=None, feature_dir=DEFAULT_FEATURE_DIR,
+                   memory_budget_mb=256):
+    """
+    Telemetry features for a session, extracted on first use.
+
+    Args:
+        year (int): Season
+        gp_name (str): Name of the Grand Prix
+        session_name (str): FastF1 session identifier
+        per_driver (bool): Per-driver aggregates instead of per-lap rows
+        columns (list, optional): Columns to read, all of them if omitted
+        feature_dir (str): Root directory of the feature cache
+        memory_budget_mb (float): Budget for the chunk working arrays when extracting, on top of the loaded car data
+
+    Returns:
+        pd.DataFrame: Telemetry features
+    """
+    table = "telemetry_drivers" if per_driver else "telemetry"
+    path = _feature_path(year, gp_name, session_name, table, feature_dir)
+    with stage("feature_cache", year=year, gp=gp_name, session=session_name, table=table) as record:
+        record["hit"] = os.path.exists(path)
+        if not record["hit"]:
+            build_telemetry_features(year, gp_name, session_name, memory_budget_mb, feature_dir)
+        frame = _read_table(path, columns)
+        record["rows"] = len(frame)
+    return frame